@@ -0,0 +1,74 @@
+"""Benchmark: rows/s and peak memory of streaming ingest over a large CSV.
+
+Usage: python scripts/bench_ingest.py [--rows 1000000] [--chunk-size 1000]
+
+Writes a synthetic CSV (every 1000th row invalid, every 500th a duplicate),
+then validates it in a fresh interpreter and reports throughput and peak
+resident set size. Peak memory should track the chunk size and the number of
+distinct slugs, not the file size.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+WORKER = """
+import json, resource, sys, time
+from pathlib import Path
+sys.path.insert(0, sys.argv[3])
+from thenine.core.ingest import ingest
+
+rejected = 0
+def count(error):
+    global rejected
+    rejected += 1
+
+start = time.perf_counter()
+valid = sum(1 for _ in ingest(Path(sys.argv[1]), count, chunk_size=int(sys.argv[2])))
+elapsed = time.perf_counter() - start
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"valid": valid, "rejected": rejected, "seconds": elapsed, "peak_kb": peak_kb}))
+"""
+
+
+def _write_csv(path: Path, rows: int) -> None:
+    with path.open("w", encoding="utf-8") as fh:
+        fh.write("name,industry,mood,domain,contact_email\n")
+        for i in range(rows):
+            name = f"Brand {i - 1}" if i % 500 == 499 else f"Brand {i}"
+            email = "not-an-email" if i % 1000 == 999 else f"hello@brand{i}.com"
+            fh.write(f"{name},technology,modern,brand{i}.com,{email}\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "brands.csv"
+        _write_csv(path, args.rows)
+        size_mib = path.stat().st_size / 2**20
+        out = subprocess.run(
+            [sys.executable, "-c", WORKER, str(path), str(args.chunk_size), str(SRC_DIR)],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout
+    r = json.loads(out)
+    print(f"{args.rows} rows ({size_mib:.0f} MiB CSV), chunk size {args.chunk_size}")
+    print(f"  valid {r['valid']}, rejected {r['rejected']}")
+    print(f"  {args.rows / r['seconds']:,.0f} rows/s ({r['seconds']:.1f} s)")
+    print(f"  peak RSS {r['peak_kb'] / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
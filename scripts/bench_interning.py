@@ -0,0 +1,90 @@
+"""Benchmark: memory held by 100k brands' palettes and typography, with and without interning.
+
+Usage: python scripts/bench_interning.py [--brands 100000]
+
+Each mode runs in a fresh interpreter, generates deterministic palettes and
+typography for every brand, keeps them all in a list and reports resident
+set growth, plus how many distinct model instances are alive.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+WORKER = """
+import gc, json, resource, sys
+sys.path.insert(0, sys.argv[3])
+from thenine.core import palette as palette_mod, typography as typography_mod
+from thenine.core.brand import BrandColor, BrandPalette, BrandTypography, FontSpec
+from thenine.core.palette import INDUSTRY_HUES, MOOD_ADJUSTMENTS, PaletteGenerator
+from thenine.core.typography import TypographySelector
+
+if sys.argv[2] == "off":
+    palette_mod.intern_palette = lambda p: p
+    typography_mod.intern_typography = lambda t: t
+
+industries, moods = sorted(INDUSTRY_HUES), sorted(MOOD_ADJUSTMENTS)
+palettes, selector = PaletteGenerator(api_key=""), TypographySelector()
+palettes.generate("technology", "modern", "warmup", use_ai=False)
+selector.select("technology", "modern", "warmup")
+
+def rss_kb():
+    try:
+        with open("/proc/self/status") as fh:
+            return int(next(l for l in fh if l.startswith("VmRSS")).split()[1])
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+gc.collect()
+rss_before = rss_kb()
+brands = []
+for i in range(int(sys.argv[1])):
+    industry, mood, name = industries[i % len(industries)], moods[i % len(moods)], f"Brand {i}"
+    brands.append(
+        (palettes.generate(industry, mood, name, use_ai=False), selector.select(industry, mood, name))
+    )
+palette_mod._oklch_to_hex.cache_clear()
+gc.collect()
+rss_delta_kb = rss_kb() - rss_before
+
+objects = [o for o in gc.get_objects() if type(o) in (BrandColor, FontSpec, BrandPalette, BrandTypography)]
+counts = {}
+for o in objects:
+    counts[type(o).__name__] = counts.get(type(o).__name__, 0) + 1
+print(json.dumps({"rss_kb": rss_delta_kb, "instances": counts}))
+"""
+
+
+def _run(brands: int, mode: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", WORKER, str(brands), mode, str(SRC_DIR)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--brands", type=int, default=100_000)
+    args = parser.parse_args()
+
+    results = {mode: _run(args.brands, mode) for mode in ("off", "on")}
+    print(f"{args.brands} brands held in memory (palette + typography)")
+    for mode, label in (("off", "no interning"), ("on", "interned")):
+        r = results[mode]
+        instances = ", ".join(f"{k} {v}" for k, v in sorted(r["instances"].items()))
+        print(f"  {label:13} {r['rss_kb'] / 1024:8.1f} MiB   {instances}")
+    saved = 1 - results["on"]["rss_kb"] / results["off"]["rss_kb"]
+    print(f"  saved {saved * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
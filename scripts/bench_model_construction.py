@@ -0,0 +1,112 @@
+"""Benchmark: where per-brand model construction time goes at batch scale.
+
+Usage: python scripts/bench_model_construction.py [--brands 10000]
+
+"validated" rebuilds the five BrandColors, BrandPalette, three FontSpecs,
+BrandTypography and BrandTokens of each brand from precomputed values with
+full validation; "model_construct" does the same without validation.
+"pipeline" runs the deterministic palette, typography and token steps end to
+end, with the OKLCH -> hex conversion cache cleared before every brand (cold)
+and kept across the batch (warm).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from thenine.core.brand import (
+    BrandColor,
+    BrandPalette,
+    BrandTokens,
+    BrandTypography,
+    FontSpec,
+)
+from thenine.core.palette import (
+    INDUSTRY_HUES,
+    MOOD_ADJUSTMENTS,
+    PaletteGenerator,
+    _oklch_to_hex,
+)
+from thenine.core.tokens import create_tokens
+from thenine.core.typography import TypographySelector
+
+ROLES = ("primary", "secondary", "accent", "neutral_light", "neutral_dark")
+
+
+def _brands(count: int) -> list[tuple[str, str, str]]:
+    industries, moods = sorted(INDUSTRY_HUES), sorted(MOOD_ADJUSTMENTS)
+    return [
+        (industries[i % len(industries)], moods[i % len(moods)], f"Brand {i}")
+        for i in range(count)
+    ]
+
+
+def _build(dumps: list[dict[str, Any]], make: Callable[..., Any]) -> None:
+    for data in dumps:
+        colors = {role: make(BrandColor, data["palette"][role]) for role in ROLES}
+        make(BrandPalette, colors)
+        fonts = {role: make(FontSpec, spec) for role, spec in data["typography"].items()}
+        make(BrandTypography, fonts)
+        make(BrandTokens, {"colors": data["tokens"]["colors"], "fonts": data["tokens"]["fonts"]})
+
+
+def _pipeline(brands: list[tuple[str, str, str]], cold: bool) -> None:
+    palettes, selector = PaletteGenerator(api_key=""), TypographySelector()
+    for industry, mood, name in brands:
+        if cold:
+            _oklch_to_hex.cache_clear()
+        palette = palettes.generate(industry, mood, name, use_ai=False)
+        create_tokens(palette, selector.select(industry, mood, name))
+
+
+def _timed(fn: Callable[[], None]) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--brands", type=int, default=10_000)
+    args = parser.parse_args()
+
+    brands = _brands(args.brands)
+    palettes, selector = PaletteGenerator(api_key=""), TypographySelector()
+    dumps = []
+    for industry, mood, name in brands[:1000]:
+        palette = palettes.generate(industry, mood, name, use_ai=False)
+        typography = selector.select(industry, mood, name)
+        dumps.append(
+            {
+                "palette": palette.model_dump(),
+                "typography": typography.model_dump(),
+                "tokens": create_tokens(palette, typography).model_dump(),
+            }
+        )
+    dumps = (dumps * (args.brands // len(dumps) + 1))[: args.brands]
+
+    n = args.brands
+    rows = [
+        ("validated", _timed(lambda: _build(dumps, lambda cls, kw: cls(**kw)))),
+        ("model_construct", _timed(lambda: _build(dumps, lambda cls, kw: cls.model_construct(**kw)))),
+        ("pipeline, cold", _timed(lambda: _pipeline(brands, cold=True))),
+    ]
+    _oklch_to_hex.cache_clear()
+    rows.append(("pipeline, warm", _timed(lambda: _pipeline(brands, cold=False))))
+
+    print(f"{n} brands")
+    for label, seconds in rows:
+        print(f"  {label:16} {seconds / n * 1e6:8.1f} us/brand")
+    info = _oklch_to_hex.cache_info()
+    print(f"  conversion cache: {info.hits} hits, {info.misses} misses")
+
+
+if __name__ == "__main__":
+    main()
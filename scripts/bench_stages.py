@@ -0,0 +1,238 @@
+"""Benchmark: per-brand time of every generate stage at batch sizes 1, 100 and 10k.
+
+Usage: python scripts/bench_stages.py [--sizes 1,100,10000] [--stages palette,tokens]
+                                      [--repeat 3] [--threshold 25] [--save]
+
+Runs the pipeline's own stage functions on deterministic inputs (no AI, no
+network), one stage at a time over the whole batch, so each stage is timed
+with warm imports and caches in their steady state. PDF, 3D and website
+stages stop at batch size 100; stages whose renderer is not installed are
+skipped. The best of --repeat runs is kept (batches of 1 get ten times as
+many runs), each with fresh brand names and output directories. Outputs go
+to /dev/shm where it exists, so token export and the website copy measure
+our code rather than the disk; --tmp picks another directory.
+
+Results are compared with the baseline file: a stage more than --threshold
+percent slower per brand than its baseline fails the run (exit status 1).
+--save writes this run as the new baseline. Baselines are only comparable on
+the machine that recorded them, which is noted in the file. A fixed pure-Python
+loop is timed just before every batch and the comparison is made on stage time
+divided by loop time, so a busy or throttled host does not read as a regression.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, NamedTuple
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+DEFAULT_BASELINE = Path(__file__).with_name("bench_stages_baseline.json")
+DEFAULT_TMP = "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+INDUSTRIES = ["technology", "finance", "health", "creative", "food", "travel"]
+MOODS = ["modern", "classic", "bold", "minimal", "warm", "playful"]
+
+
+class Case(NamedTuple):
+    stage: str
+    max_batch: int
+    requires: str = ""
+
+
+CASES = [
+    Case("palette", 10_000),
+    Case("typography", 10_000),
+    Case("tokens", 10_000),
+    Case("card_pdf", 100, "weasyprint"),
+    Case("card_3d", 100, "build123d"),
+    Case("website", 100),
+]
+
+
+def _contexts(size: int, run: int, root: Path) -> list[Any]:
+    from thenine.core.brand import BrandContact, BrandInput
+    from thenine.core.pipeline import PipelineOptions, StageContext
+
+    options = PipelineOptions(use_ai=False)
+    contexts = []
+    for i in range(size):
+        name = f"Bench {run}-{i}"
+        brand = BrandInput(
+            name=name,
+            industry=INDUSTRIES[i % len(INDUSTRIES)],
+            mood=MOODS[i % len(MOODS)],
+            domain=f"bench{i}.example",
+            contact=BrandContact(name=name, email=f"hello@bench{i}.example", phone="+1 555 0100"),
+        )
+        contexts.append(StageContext(input=brand, output_dir=root / brand.slug, options=options))
+    return contexts
+
+
+def calibrate(runs: int = 3) -> float:
+    """Best time of a fixed CPU-bound loop, the yardstick for this host's current speed."""
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        total = 0
+        for i in range(100_000):
+            total += i * i % 7
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _run_batch(stages: list[Any], size: int, run: int, tmp_dir: str | None) -> dict[str, float]:
+    """Seconds each stage took over one batch of brands."""
+    timings: dict[str, float] = {}
+    with tempfile.TemporaryDirectory(prefix="thenine-bench-", dir=tmp_dir) as tmp:
+        contexts = _contexts(size, run, Path(tmp))
+        results: dict[str, list[Any]] = {}
+        for stage in stages:
+            outputs = []
+            start = time.perf_counter()
+            for i, ctx in enumerate(contexts):
+                outputs.append(stage.run(ctx, {dep: results[dep][i] for dep in stage.deps}))
+            timings[stage.name] = time.perf_counter() - start
+            results[stage.name] = outputs
+    return timings
+
+
+def _stages_for(size: int, wanted: set[str]) -> list[Any]:
+    """Stages to time at this batch size, with the dependencies they need."""
+    from thenine.core.pipeline import PipelineOptions, generate_stages
+
+    available = {case.stage for case in CASES if _installed(case.requires)}
+    timed = {c.stage for c in CASES if c.stage in wanted & available and size <= c.max_batch}
+    stages = {s.name: s for s in generate_stages(PipelineOptions(use_ai=False))}
+    needed = set(timed)
+    for name in timed:
+        needed.update(stages[name].deps)
+    return [stages[name] for name in stages if name in needed]
+
+
+def _installed(module: str) -> bool:
+    return not module or importlib.util.find_spec(module) is not None
+
+
+def run(
+    sizes: list[int], wanted: set[str], repeat: int, tmp_dir: str | None
+) -> tuple[dict[str, float], dict[str, float]]:
+    """Best per-brand seconds for each "stage/size", and the same in calibration loops."""
+    # Warm-up: imports, template loading and caches are not what we measure
+    _run_batch(_stages_for(1, wanted), 1, -1, tmp_dir)
+    best: dict[str, float] = {}
+    relative: dict[str, float] = {}
+    for size in sizes:
+        stages = _stages_for(size, wanted)
+        runs = repeat * 10 if size == 1 else repeat
+        for r in range(runs):
+            loop = calibrate()
+            for name, seconds in _run_batch(stages, size, r, tmp_dir).items():
+                if name not in wanted or size > _max_batch(name):
+                    continue
+                key = f"{name}/{size}"
+                best[key] = min(best.get(key, float("inf")), seconds / size)
+                relative[key] = min(relative.get(key, float("inf")), seconds / size / loop)
+    return best, relative
+
+
+def _max_batch(stage: str) -> int:
+    return next(c.max_batch for c in CASES if c.stage == stage)
+
+
+def _machine() -> str:
+    return (
+        f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs, "
+        f"Python {platform.python_version()}"
+    )
+
+
+def compare(
+    results: dict[str, float],
+    relative: dict[str, float],
+    baseline: dict[str, float],
+    base_relative: dict[str, float],
+) -> list[tuple[str, float, float | None, float | None]]:
+    """Rows of (case, seconds, baseline seconds, % change); None where there is no baseline.
+
+    The change is measured on the calibrated (relative) times, not on seconds.
+    """
+    rows = []
+    for key, seconds in results.items():
+        base = base_relative.get(key)
+        change = (relative[key] / base - 1) * 100 if base else None
+        rows.append((key, seconds, baseline.get(key), change))
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1,100,10000", help="Comma-separated batch sizes")
+    parser.add_argument(
+        "--stages", default=",".join(c.stage for c in CASES), help="Comma-separated stages"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per size; the best is kept")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--threshold", type=float, default=25.0, help="Allowed slowdown per brand, in percent"
+    )
+    parser.add_argument("--save", action="store_true", help="Write this run as the baseline")
+    parser.add_argument("--tmp", default=DEFAULT_TMP, help="Where to write stage outputs")
+    args = parser.parse_args()
+
+    os.environ.pop("ANTHROPIC_API_KEY", None)
+    sizes = sorted(int(s) for s in args.sizes.split(","))
+    wanted = {s.strip() for s in args.stages.split(",")}
+    unknown = wanted - {c.stage for c in CASES}
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}")
+    skipped = [c.stage for c in CASES if c.stage in wanted and not _installed(c.requires)]
+
+    results, relative = run(sizes, wanted, args.repeat, args.tmp)
+
+    saved: dict[str, Any] = {}
+    if args.baseline.exists():
+        saved = json.loads(args.baseline.read_text(encoding="utf-8"))
+    baseline = saved.get("results", {})
+    base_relative = saved.get("relative", {})
+    rows = compare(results, relative, baseline, base_relative)
+
+    print(f"{_machine()}; best of {args.repeat} (x10 for batches of 1)")
+    if saved and saved.get("machine") != _machine():
+        print(f"  note: baseline was recorded on {saved.get('machine')}")
+    print(f"{'stage/batch':22}{'ms per brand':>14}{'baseline':>12}{'change':>10}")
+    regressions = []
+    for key, seconds, base, change in rows:
+        shown = f"{base * 1000:>12.3f}" if base else f"{'-':>12}"
+        verdict = f"{change:>+9.1f}%" if change is not None else f"{'new':>10}"
+        if change is not None and change > args.threshold:
+            regressions.append(key)
+            verdict += "  REGRESSION"
+        print(f"{key:22}{seconds * 1000:>14.3f}{shown}{verdict}")
+    if skipped:
+        print(f"skipped (renderer not installed): {', '.join(skipped)}")
+
+    if args.save:
+        saved = {
+            "machine": _machine(),
+            "results": {**baseline, **results},
+            "relative": {**base_relative, **relative},
+        }
+        args.baseline.write_text(json.dumps(saved, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} case(s) over the {args.threshold:g}% threshold")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Benchmark: startup time and RSS of loading per-brand tokens.json vs one mmap'd bundle.
+
+Usage: python scripts/bench_token_bundle.py [--brands 2000] [--lookups 1000]
+
+Each loader runs in a fresh interpreter so the numbers reflect a cold service
+start: JSON parses every file up front, the bundle maps one file and decodes
+only the tokens that are looked up. RSS delta is resident set growth after imports.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+JSON_LOADER = """
+import json, resource, sys, time
+from pathlib import Path
+def rss_kb():
+    try:
+        with open("/proc/self/status") as fh:
+            return int(next(l for l in fh if l.startswith("VmRSS")).split()[1])
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+rss_before = rss_kb()
+start = time.perf_counter()
+brands = {p.parent.name: json.loads(p.read_text()) for p in Path(sys.argv[1]).glob("*/tokens.json")}
+loaded = time.perf_counter()
+slugs = sorted(brands)
+for i in range(int(sys.argv[2])):
+    brands[slugs[i % len(slugs)]]["color"]["primary"]["value"]
+done = time.perf_counter()
+print(json.dumps({"load_s": loaded - start, "lookup_s": done - loaded,
+                  "rss_kb": rss_kb() - rss_before}))
+"""
+
+BUNDLE_LOADER = """
+import json, resource, sys, time
+from pathlib import Path
+sys.path.insert(0, sys.argv[3])
+from thenine.core.bundle import TokenBundle
+def rss_kb():
+    try:
+        with open("/proc/self/status") as fh:
+            return int(next(l for l in fh if l.startswith("VmRSS")).split()[1])
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+rss_before = rss_kb()
+start = time.perf_counter()
+bundle = TokenBundle(Path(sys.argv[1]))
+loaded = time.perf_counter()
+slugs = list(bundle.brands())
+for i in range(int(sys.argv[2])):
+    bundle.get(slugs[i % len(slugs)], "colors.primary")
+done = time.perf_counter()
+print(json.dumps({"load_s": loaded - start, "lookup_s": done - loaded,
+                  "rss_kb": rss_kb() - rss_before}))
+"""
+
+
+def _run(code: str, *args: str) -> dict[str, float]:
+    out = subprocess.run(
+        [sys.executable, "-c", code, *args], capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--brands", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    from thenine.core.palette import PaletteGenerator
+    from thenine.core.tokens import create_tokens, export_bundle, export_json
+    from thenine.core.typography import TypographySelector
+
+    industries = ["technology", "finance", "health", "creative", "food"]
+    moods = ["modern", "classic", "bold", "minimal"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        brands = {}
+        for i in range(args.brands):
+            industry, mood = industries[i % len(industries)], moods[i % len(moods)]
+            slug = f"brand-{i:05d}"
+            palette = PaletteGenerator().generate(industry, mood, slug, use_ai=False)
+            typography = TypographySelector().select(industry, mood, slug)
+            tokens = create_tokens(palette, typography)
+            export_json(tokens, root / "json" / slug)
+            brands[slug] = tokens
+        bundle_path = export_bundle(brands, root)
+
+        json_bytes = sum(p.stat().st_size for p in (root / "json").glob("*/tokens.json"))
+        bundle_bytes = bundle_path.stat().st_size
+        from_json = _run(JSON_LOADER, str(root / "json"), str(args.lookups))
+        from_bundle = _run(BUNDLE_LOADER, str(bundle_path), str(args.lookups), str(SRC_DIR))
+
+    print(f"{args.brands} brands, {args.lookups} lookups")
+    print(f"{'':12}{'load ms':>10}{'lookup ms':>12}{'RSS delta KB':>15}{'size KB':>10}")
+    for label, result, size in [
+        ("tokens.json", from_json, json_bytes),
+        ("bundle", from_bundle, bundle_bytes),
+    ]:
+        print(
+            f"{label:12}{result['load_s'] * 1000:>10.2f}{result['lookup_s'] * 1000:>12.2f}"
+            f"{result['rss_kb']:>15.0f}{size / 1024:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,44 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any
 
 import typer
-from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
-from thenine.core.brand import BrandContact, BrandInput
+if TYPE_CHECKING:
+    from rich.console import Console
+
+    from thenine.core.brand import BrandPackage, BrandTokens
+
+# Keep module load to typer alone: --help and shell completion import nothing
+# else. Commands import Rich, Pydantic models and generators when they run.
 
 app = typer.Typer(
     name="thenine",
     help="Automated brand identity framework",
     no_args_is_help=True,
 )
-console = Console()
+
+
+class _LazyConsole:
+    """Stands in for the Rich console and creates it on first use."""
+
+    def __init__(self) -> None:
+        self._console: Console | None = None
+
+    @property
+    def real(self) -> Console:
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console()
+        return self._console
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.real, name)
+
+
+console = _LazyConsole()
 
 
 def _load_env() -> None:
@@ -50,10 +73,60 @@ def generate(
     output: str = typer.Option("", help="Output directory (default: output/<slug>)"),
     skip_website: bool = typer.Option(False, "--skip-website", help="Skip website generation"),
     skip_3d: bool = typer.Option(False, "--skip-3d", help="Skip 3D card generation"),
+    skip_pdf: bool = typer.Option(False, "--skip-pdf", help="Skip PDF card generation"),
     no_ai: bool = typer.Option(False, "--no-ai", help="Use deterministic generation (no API calls)"),
+    formats: str = typer.Option(
+        "json,css,tailwind",
+        "--formats",
+        help="Comma-separated token formats: json, css, tailwind, scss, js, android, ios, dtcg,"
+        " bundle (binary, for thenine.core.bundle.TokenBundle)",
+    ),
+    tonal_scales: bool = typer.Option(
+        False, "--tonal-scales", help="Add 50-950 tonal scales of the brand colors to the tokens"
+    ),
+    force: bool = typer.Option(
+        False, "--force", help="Rebuild every stage, even ones whose inputs are unchanged"
+    ),
+    explain: bool = typer.Option(
+        False, "--explain", help="Say why each stage was rebuilt or reused"
+    ),
+    resume: bool = typer.Option(
+        False, "--resume", hidden=True, help="Deprecated: unchanged stages are always reused"
+    ),
+    profile: bool = typer.Option(
+        False, "--profile", help="Time every stage and step; write <output>/profile/trace.json"
+    ),
+    cprofile: bool = typer.Option(
+        False, "--cprofile", help="With --profile, also dump cProfile stats for each stage"
+    ),
+    memory: bool = typer.Option(
+        False, "--memory", help="Report each stage's peak RSS and top allocations (slower)"
+    ),
+    events: str = typer.Option(
+        "", "--events", help="jsonl: write stage events as JSON lines instead of the Rich display"
+    ),
+    events_fd: int = typer.Option(
+        1, "--events-fd", help="With --events, the file descriptor to write to (default: stdout)"
+    ),
 ) -> None:
     """Generate a complete brand identity package."""
+    from thenine.core.brand import BrandContact, BrandInput
+
     _load_env()
+    if resume:
+        typer.echo(
+            "Warning: --resume is deprecated and does nothing; unchanged stages are always"
+            " reused (use --force to rebuild them)",
+            err=True,
+        )
+    token_formats = _parse_formats(formats)
+    if events:
+        from thenine.core.events import EVENT_FORMATS
+
+        if events not in EVENT_FORMATS:
+            raise typer.BadParameter(
+                f"must be one of: {', '.join(EVENT_FORMATS)}", param_hint="--events"
+            )
 
     contact = BrandContact(
         name=contact_name or name,
@@ -74,78 +147,132 @@ def generate(
 
     output_dir = Path(output) if output else Path("output") / brand_input.slug
     output_dir.mkdir(parents=True, exist_ok=True)
+    # Default runs share output/'s history with batch; --output keeps its own
+    history_root = output_dir if output else output_dir.parent
 
-    console.print(Panel(f"[bold]{name}[/bold]\n{tagline}", title="Generating Brand Identity"))
+    from thenine.core.snapshot import load_snapshot
 
-    # Step 1: Palette
-    with console.status("[bold blue]Generating color palette..."):
-        from thenine.core.palette import PaletteGenerator
+    snapshot = None if force else load_snapshot(output_dir)
 
-        palette = PaletteGenerator().generate(industry, mood, name, use_ai=not no_ai)
+    from thenine.core.pipeline import (
+        DEFAULT_THREADS,
+        Pipeline,
+        PipelineOptions,
+        StageContext,
+        generate_stages,
+        run_brand,
+    )
 
-    _show_palette(palette)
+    options = PipelineOptions(
+        use_ai=not no_ai,
+        skip_pdf=skip_pdf,
+        skip_3d=skip_3d,
+        skip_website=skip_website,
+        formats=tuple(token_formats),
+        tonal_scales=tonal_scales,
+    )
+    profiler = None
+    if profile or cprofile or memory:
+        from thenine.core.profiling import MEMORY_TOP, Profiler
+
+        profiler = Profiler(
+            output_dir / "profile" if cprofile else None,
+            memory_top=MEMORY_TOP if memory else None,
+        )
+    # Measuring memory runs one stage at a time, so each stage's peak is its own
+    pipeline = Pipeline(generate_stages(options), max_threads=1 if memory else DEFAULT_THREADS)
+    ctx = StageContext(input=brand_input, output_dir=output_dir, options=options)
+    if events:
+        trace = profile or cprofile
+        _generate_events(ctx, snapshot, pipeline, force, profiler, trace, events_fd, history_root)
+        return
 
-    # Step 2: Typography
-    with console.status("[bold blue]Selecting typography..."):
-        from thenine.core.typography import TypographySelector
+    from rich.panel import Panel
 
-        typography = TypographySelector().select(industry, mood, name)
+    if snapshot is not None:
+        console.print(f"[dim]Reusing unchanged stages from {output_dir}[/dim]")
+    console.print(Panel(f"[bold]{name}[/bold]\n{tagline}", title="Generating Brand Identity"))
 
-    console.print(f"  Heading: [bold]{typography.heading.family}[/bold]")
-    console.print(f"  Body:    {typography.body.family}")
+    reporter = _StageReporter(explain=explain)
+    with reporter.progress:
+        run = run_brand(
+            ctx,
+            snapshot=snapshot,
+            listener=reporter,
+            pipeline=pipeline,
+            force=force,
+            profiler=profiler,
+        )
+    error = _save_history(history_root, ctx, pipeline.order, run)
+    if error is not None:
+        console.print(f"[yellow]Run history not saved:[/yellow] {error}")
+    if reporter.fatal is not None:
+        raise reporter.fatal
+    if profiler is not None and (profile or cprofile):
+        _show_profile(profiler, output_dir / "profile")
+    if profiler is not None and memory:
+        _show_memory([(stage, m.to_dict()) for stage, m in profiler.memory.items()])
 
-    # Step 3: Tokens
-    with console.status("[bold blue]Generating design tokens..."):
-        from thenine.core.tokens import create_tokens, export_all
+    # Summary
+    console.print()
+    console.print(Panel(f"[bold green]Brand package generated![/bold green]\n{output_dir}", title="Done"))
 
-        tokens = create_tokens(palette, typography)
-        token_paths = export_all(tokens, output_dir)
 
-    console.print(f"  [green]Tokens:[/green] {', '.join(p.name for p in token_paths.values())}")
+def _generate_events(
+    ctx: Any,
+    snapshot: Any,
+    pipeline: Any,
+    force: bool,
+    profiler: Any,
+    trace: bool,
+    fd: int,
+    history_root: Path,
+) -> None:
+    """generate --events jsonl: run the pipeline writing JSON lines only, no Rich."""
+    import os
+    import sys
+
+    from thenine.core.events import JsonlEvents
+    from thenine.core.pipeline import run_brand
+    from thenine.core.profiling import TRACE_NAME
+
+    stream = sys.stdout if fd == 1 else os.fdopen(fd, "w", closefd=False)
+    writer = JsonlEvents(stream, profiler)
+    writer.start(ctx.input, ctx.output_dir)
+    run = run_brand(
+        ctx, snapshot=snapshot, listener=writer, pipeline=pipeline, force=force, profiler=profiler
+    )
+    error = _save_history(history_root, ctx, pipeline.order, run)
+    if error is not None:
+        typer.echo(f"Run history not saved: {error}", err=True)
+    extra: dict[str, Any] = {}
+    if profiler is not None and trace:
+        extra["trace"] = str(profiler.write_trace(ctx.output_dir / "profile" / TRACE_NAME))
+    writer.end(run.ok, **extra)
+    if not run.ok:
+        raise typer.Exit(1)
 
-    # Step 4: PDF Card
-    with console.status("[bold blue]Creating PDF business card..."):
-        try:
-            from thenine.generators.card_pdf import PDFCardGenerator
-
-            pdf_path = PDFCardGenerator().generate(name, contact, palette, typography, output_dir)
-            console.print(f"  [green]PDF Card:[/green] {pdf_path.name}")
-        except OSError as e:
-            if "libgobject" in str(e) or "GTK" in str(e):
-                console.print(
-                    "  [yellow]PDF Card skipped:[/yellow] GTK3 not installed. "
-                    "Install via: https://www.msys2.org/ then `pacman -S mingw-w64-x86_64-pango`"
-                )
-            else:
-                raise
-
-    # Step 5: 3D Card
-    if not skip_3d:
-        with console.status("[bold blue]Creating 3D business card..."):
-            try:
-                from thenine.generators.card_3d import ThreeDCardGenerator
-
-                card_3d_paths = ThreeDCardGenerator().generate(name, contact, output_dir)
-                console.print(
-                    f"  [green]3D Card:[/green] {', '.join(p.name for p in card_3d_paths.values())}"
-                )
-            except Exception as e:
-                console.print(f"  [yellow]3D Card skipped:[/yellow] {e}")
-
-    # Step 6: Website
-    if not skip_website:
-        with console.status("[bold blue]Generating website..."):
-            try:
-                from thenine.generators.website import WebsiteGenerator
-
-                site_dir = WebsiteGenerator().generate(brand_input, palette, typography, tokens, output_dir)
-                console.print(f"  [green]Website:[/green] {site_dir}")
-            except Exception as e:
-                console.print(f"  [yellow]Website skipped:[/yellow] {e}")
 
-    # Summary
-    console.print()
-    console.print(Panel(f"[bold green]Brand package generated![/bold green]\n{output_dir}", title="Done"))
+def _save_history(root: Path, ctx: Any, order: list[str], run: Any) -> str | None:
+    """Add a generate run to the run history under root; the error if it could not be saved.
+
+    The brand is already written by then, so a history that cannot be opened or
+    written does not fail the run.
+    """
+    import sqlite3
+
+    from thenine.core.batch import brand_record
+    from thenine.core.history import RunHistory, history_path
+
+    path = history_path(root)
+    if path is None:
+        return None
+    try:
+        with RunHistory(path, "generate") as history:
+            history.add(brand_record(ctx.input, ctx.output_dir, order, run))
+    except (sqlite3.Error, OSError) as e:
+        return f"{path}: {e}"
+    return None
 
 
 @app.command()
@@ -179,6 +306,7 @@ def card(
     _load_env()
     output_dir = Path(output)
 
+    from thenine.core.brand import BrandContact
     from thenine.core.palette import PaletteGenerator
     from thenine.core.typography import TypographySelector
     from thenine.generators.card_pdf import PDFCardGenerator
@@ -210,6 +338,8 @@ def dns(
     """Manage Cloudflare DNS records."""
     _load_env()
 
+    from rich.table import Table
+
     from thenine.infra.cloudflare_dns import DNSManager
 
     manager = DNSManager()
@@ -242,8 +372,514 @@ def dns(
         raise typer.Exit(1)
 
 
+@app.command()
+def diff(
+    old: Path = typer.Argument(..., help="Previous BrandPackage or BrandTokens JSON"),
+    new: Path = typer.Argument(..., help="New BrandPackage or BrandTokens JSON"),
+    formats: str = typer.Option(
+        "", "--formats", help="Token formats to check for affected files (default: all)"
+    ),
+    exit_code: bool = typer.Option(
+        False, "--exit-code", help="Exit with 1 when the versions differ, 0 otherwise"
+    ),
+) -> None:
+    """Print a JSON diff of two brand versions: added/removed/changed tokens and affected files."""
+    from thenine.core.brand import BrandPackage
+    from thenine.core.diff import diff_packages, diff_tokens
+
+    token_formats = _parse_formats(formats, binary=False) if formats else None
+    before, after = _load_brand_json(old), _load_brand_json(new)
+    if type(before) is not type(after):
+        raise typer.BadParameter("Both files must hold the same kind of model", param_hint="NEW")
+
+    if isinstance(before, BrandPackage):
+        result = diff_packages(before, after, token_formats)  # type: ignore[arg-type]
+    else:
+        result = diff_tokens(before, after, token_formats)  # type: ignore[arg-type]
+
+    typer.echo(result.model_dump_json(indent=2))
+    if exit_code and not result.is_empty:
+        raise typer.Exit(1)
+
+
+@app.command()
+def batch(
+    input_file: Path = typer.Argument(..., help="Brands to generate: .csv or .jsonl, one per row"),
+    output: str = typer.Option("output", help="Root directory; each brand goes to <output>/<slug>"),
+    ledger: str = typer.Option("", help="Results ledger (default: <output>/batch-ledger.jsonl)"),
+    errors: str = typer.Option(
+        "", help="Rejected input rows, .jsonl or .csv (default: <output>/batch-errors.jsonl)"
+    ),
+    workers: int | None = typer.Option(
+        None, "--workers", help="Worker processes (default: CPU count; 0 runs in-process)"
+    ),
+    skip_website: bool = typer.Option(False, "--skip-website", help="Skip website generation"),
+    skip_3d: bool = typer.Option(False, "--skip-3d", help="Skip 3D card generation"),
+    skip_pdf: bool = typer.Option(False, "--skip-pdf", help="Skip PDF card generation"),
+    no_ai: bool = typer.Option(False, "--no-ai", help="Use deterministic generation (no API calls)"),
+    formats: str = typer.Option(
+        "json,css,tailwind", "--formats", help="Comma-separated token formats"
+    ),
+    tonal_scales: bool = typer.Option(
+        False, "--tonal-scales", help="Add 50-950 tonal scales of the brand colors to the tokens"
+    ),
+    resume: bool = typer.Option(
+        True, "--resume/--no-resume", help="Skip brands the ledger already records as done"
+    ),
+    memory: bool = typer.Option(
+        False, "--memory", help="Record each stage's peak RSS and top allocations in the ledger"
+    ),
+    metrics_file: str = typer.Option(
+        "", "--metrics-file", help="Write Prometheus metrics here when done (textfile collector)"
+    ),
+) -> None:
+    """Generate brand packages for every row of a CSV or JSONL file."""
+    _load_env()
+    if not input_file.exists():
+        raise typer.BadParameter(f"No such file: {input_file}", param_hint="INPUT_FILE")
+
+    from contextlib import nullcontext
+
+    from rich.table import Table
+
+    from thenine.core.batch import ERRORS_NAME, LEDGER_NAME, run_batch
+    from thenine.core.history import RunHistory, history_path
+    from thenine.core.ingest import ErrorReport
+    from thenine.core.pipeline import PipelineOptions
+
+    options = PipelineOptions(
+        use_ai=not no_ai,
+        skip_pdf=skip_pdf,
+        skip_3d=skip_3d,
+        skip_website=skip_website,
+        formats=tuple(_parse_formats(formats)),
+        tonal_scales=tonal_scales,
+    )
+    output_root = Path(output)
+    ledger_path = Path(ledger) if ledger else output_root / LEDGER_NAME
+
+    # Per stage, the brand that raised RSS the most
+    worst: dict[str, tuple[str, dict[str, Any]]] = {}
+
+    history_file = history_path(output_root)
+    history = RunHistory(history_file, "batch") if history_file is not None else None
+
+    def report(record: dict[str, Any]) -> None:
+        if history is not None:
+            history.add(record)
+        for stage, m in record.get("memory", {}).items():
+            if stage not in worst or m["rss_delta_mb"] > worst[stage][1]["rss_delta_mb"]:
+                worst[stage] = (record["slug"], m)
+        if record["status"] == "ok":
+            console.print(f"  [green]✓[/green] {record['slug']}")
+        else:
+            errors = "; ".join(f"{k}: {v}" for k, v in record.get("errors", {}).items())
+            console.print(f"  [red]✗[/red] {record.get('slug') or 'input'} - {errors}")
+
+    with (
+        history or nullcontext(),
+        ErrorReport(Path(errors) if errors else output_root / ERRORS_NAME) as rejected,
+    ):
+        summary = run_batch(
+            _ingest_or_exit(input_file, rejected),
+            output_root,
+            ledger_path,
+            options,
+            workers=workers,
+            resume=resume,
+            on_record=report,
+            memory=memory,
+        )
+
+    table = Table(title="Batch")
+    table.add_column("Generated", style="green")
+    table.add_column("Failed", style="red")
+    table.add_column("Invalid rows", style="yellow")
+    table.add_column("Already done", style="dim")
+    table.add_row(str(summary.ok), str(summary.failed), str(rejected.count), str(summary.resumed))
+    console.print(table)
+    if worst:
+        rows = [(f"{stage} ({slug})", m) for stage, (slug, m) in worst.items()]
+        _show_memory(rows, title="Memory (largest Δ per stage)")
+    console.print(f"[dim]Ledger: {ledger_path}[/dim]")
+    if metrics_file:
+        from thenine.core.metrics import REGISTRY
+
+        console.print(f"[dim]Metrics: {REGISTRY.write_textfile(Path(metrics_file))}[/dim]")
+    if rejected.count:
+        console.print(f"[yellow]Rejected rows: {rejected.path}[/yellow]")
+    if summary.failed or rejected.count:
+        raise typer.Exit(1)
+
+
+@app.command()
+def validate(
+    input_file: Path = typer.Argument(..., help="Brands to check: .csv or .jsonl, one per row"),
+    errors: str = typer.Option("", help="Write rejected rows to this .jsonl or .csv report"),
+    chunk_size: int = typer.Option(1000, "--chunk-size", help="Rows validated per chunk"),
+) -> None:
+    """Validate a brand input file without generating anything."""
+    if not input_file.exists():
+        raise typer.BadParameter(f"No such file: {input_file}", param_hint="INPUT_FILE")
+
+    from thenine.core.ingest import ErrorReport, RowError
+
+    max_shown = 20
+    rejected = 0
+    report = ErrorReport(Path(errors)) if errors else None
+
+    def on_error(error: RowError) -> None:
+        nonlocal rejected
+        if rejected < max_shown:
+            where = f" {error.field}" if error.field else ""
+            console.print(f"  [red]line {error.line}{where}:[/red] {error.message}")
+        rejected += 1
+        if report is not None:
+            report(error)
+
+    valid = 0
+    try:
+        for _ in _ingest_or_exit(input_file, on_error, chunk_size=chunk_size):
+            valid += 1
+    finally:
+        if report is not None:
+            report.close()
+
+    if rejected > max_shown:
+        console.print(f"  [dim]... and {rejected - max_shown} more[/dim]")
+    console.print(f"{valid} valid rows, {rejected} rejected")
+    if rejected:
+        raise typer.Exit(1)
+
+
+@app.command()
+def stats(
+    output: str = typer.Option("output", help="Output root the runs wrote to"),
+    history: str = typer.Option(
+        "", help="Run history file (default: <output>/.thenine-history.sqlite)"
+    ),
+    window: str = typer.Option("7d", help="Time window, e.g. 24h, 7d, 2w"),
+    limit: int = typer.Option(10, help="Slowest brands to list"),
+    threshold: float = typer.Option(
+        20.0, help="Flag stages whose median slowed by more than this percent"
+    ),
+) -> None:
+    """Stage percentiles, slowest brands and regressions from the run history."""
+    import sqlite3
+    import time
+    from datetime import datetime
+
+    from rich.table import Table
+
+    from thenine.core.history import (
+        ai_fallback_rate,
+        history_path,
+        parse_window,
+        regressions,
+        runs_between,
+        slowest_brands,
+        stage_stats,
+    )
+
+    try:
+        seconds = parse_window(window)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--window") from e
+    path = Path(history) if history else history_path(Path(output))
+    if path is None or not path.exists():
+        console.print(f"[yellow]No run history{f' at {path}' if path else ''}[/yellow]")
+        raise typer.Exit(1)
+
+    now = time.time()
+    since = now - seconds
+    db = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        runs = ", ".join(f"{count} {command}" for command, count in runs_between(db, since, now))
+        table = Table(title=f"Stages, last {window} ({runs or 'no runs'})")
+        table.add_column("Stage")
+        table.add_column("Runs", justify="right")
+        for column in ("p50 ms", "p90 ms", "p99 ms", "Max ms"):
+            table.add_column(column, justify="right")
+        table.add_column("Reused", justify="right", style="dim")
+        table.add_column("Failed", justify="right")
+        for row in stage_stats(db, since, now):
+            table.add_row(
+                row.stage,
+                str(row.runs),
+                *(_ms(v) for v in (row.p50, row.p90, row.p99, row.max)),
+                f"{row.reused:.0%}",
+                f"[red]{row.failed:.0%}[/red]" if row.failed else "0%",
+            )
+        console.print(table)
+
+        slow = Table(title="Slowest brands")
+        slow.add_column("Brand")
+        slow.add_column("Total ms", justify="right")
+        slow.add_column("Slowest stage")
+        slow.add_column("When", style="dim")
+        for brand in slowest_brands(db, since, now, limit):
+            when = datetime.fromtimestamp(brand.at).strftime("%Y-%m-%d %H:%M")
+            slow.add_row(brand.slug, _ms(brand.seconds), brand.slowest_stage, when)
+        console.print(slow)
+
+        trend = Table(title=f"Median vs the {window} before")
+        trend.add_column("Stage")
+        trend.add_column("Before ms", justify="right")
+        trend.add_column("Now ms", justify="right")
+        trend.add_column("Change", justify="right")
+        for reg in regressions(db, seconds, now):
+            change = f"{reg.change:+.1f}%"
+            if reg.change > threshold:
+                change = f"[red]{change} regression[/red]"
+            trend.add_row(reg.stage, _ms(reg.before), _ms(reg.now), change)
+        if trend.row_count:
+            console.print(trend)
+        else:
+            console.print(f"[dim]No runs in the {window} before to compare with[/dim]")
+
+        rate = ai_fallback_rate(db, since, now)
+        if rate is not None:
+            before = ai_fallback_rate(db, since - seconds, since)
+            previous = f" (before: {before:.1%})" if before is not None else ""
+            console.print(f"AI palette fallbacks: {rate:.1%}{previous}")
+    finally:
+        db.close()
+
+
+def _ms(seconds: float | None) -> str:
+    return f"{seconds * 1000:,.1f}" if seconds is not None else "-"
+
+
+@app.command()
+def serve(
+    host: str = typer.Option("127.0.0.1", help="Interface to listen on"),
+    port: int = typer.Option(8000, help="Port to listen on (0 picks a free one)"),
+    output: str = typer.Option("output", help="Root directory for /package builds"),
+    processes: int | None = typer.Option(
+        None, "--processes", help="Worker processes for cards and packages (0 uses threads)"
+    ),
+    threads: int = typer.Option(8, "--threads", help="Concurrent HTTP connections"),
+    queue_limit: int | None = typer.Option(
+        None, "--queue-limit", help="Card/package jobs queued or running before 503 (0: no limit)"
+    ),
+) -> None:
+    """Serve palettes, tokens, cards and packages over a local HTTP/JSON API."""
+    _load_env()
+    from thenine.server import ThenineServer
+
+    try:
+        server = ThenineServer(
+            host,
+            port,
+            output_root=Path(output),
+            processes=processes,
+            threads=threads,
+            queue_limit=queue_limit,
+        )
+    except OSError as e:
+        raise typer.BadParameter(
+            f"Cannot listen on {host}:{port}: {e}", param_hint="--port"
+        ) from e
+    console.print(f"[green]Serving on {server.url}[/green] [dim](Ctrl+C to stop)[/dim]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("[dim]Stopped[/dim]")
+
+
+def _ingest_or_exit(input_file: Path, on_error: Any, **kwargs: Any) -> Any:
+    """Stream ingest(), turning an unsupported file type into a usage error."""
+    from thenine.core.ingest import ingest
+
+    try:
+        yield from ingest(input_file, on_error, **kwargs)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="INPUT_FILE") from e
+
+
+def _load_brand_json(path: Path) -> BrandPackage | BrandTokens:
+    """Load a BrandPackage (has a "palette" key) or BrandTokens from a JSON file."""
+    import json
+
+    from thenine.core.brand import BrandPackage, BrandTokens
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(data, dict) and "palette" in data:
+            return BrandPackage.model_validate(data)
+        return BrandTokens.model_validate(data)
+    except (OSError, ValueError) as e:
+        raise typer.BadParameter(f"Cannot read {path}: {e}") from e
+
+
+def _parse_formats(value: str, binary: bool = True) -> list[str]:
+    """Split and validate a comma-separated list of token formats.
+
+    binary allows the bundle format, which only export_all() writes.
+    """
+    from thenine.core.exporters import available_formats
+
+    available = available_formats()
+    if binary:
+        from thenine.core.tokens import BUNDLE_FORMAT
+
+        available.append(BUNDLE_FORMAT)
+    formats = [f.strip() for f in value.split(",") if f.strip()]
+    unknown = sorted(set(formats) - set(available))
+    if unknown or not formats:
+        raise typer.BadParameter(
+            f"Unknown token format(s): {', '.join(unknown) or value!r}. "
+            f"Available: {', '.join(available)}",
+            param_hint="--formats",
+        )
+    return list(dict.fromkeys(formats))
+
+
+# Stages whose failure is reported and skipped rather than aborting the run
+_CARD_STAGES = {"card_pdf": "PDF Card", "card_3d": "3D Card", "website": "Website"}
+
+
+class _StageReporter:
+    """Pipeline listener: live progress per stage and a line per finished stage."""
+
+    def __init__(self, explain: bool = False) -> None:
+        from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+
+        self.explain = explain
+        self.fatal: BaseException | None = None
+        self.progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[bold blue]{task.description}"),
+            TimeElapsedColumn(),
+            console=console.real,
+            transient=True,
+        )
+        self._tasks: dict[str, Any] = {}
+
+    def __call__(self, event: Any) -> None:
+        if self.explain and event.status in ("started", "unchanged"):
+            action = "reuse" if event.status == "unchanged" else "build"
+            console.print(f"  [dim]{event.stage}: {action} - {event.reason}[/dim]")
+        if event.status == "started":
+            from thenine.core.pipeline import STAGE_LABELS
+
+            label = STAGE_LABELS.get(event.stage, event.stage)
+            self._tasks[event.stage] = self.progress.add_task(f"{label}...", total=None)
+            return
+        if event.stage in self._tasks:
+            self.progress.remove_task(self._tasks.pop(event.stage))
+
+        if event.status == "unchanged":
+            self._unchanged(event.stage, event.result)
+        elif event.status == "done":
+            self._done(event.stage, event.result)
+        elif event.status == "failed":
+            self._failed(event.stage, event.error)
+        elif event.status == "skipped":
+            label = _CARD_STAGES.get(event.stage, event.stage)
+            console.print(f"  [yellow]{label} skipped:[/yellow] a stage it needs failed")
+
+    def _unchanged(self, stage: str, result: Any) -> None:
+        if stage in _CARD_STAGES:
+            console.print(f"  [dim]{_CARD_STAGES[stage]}: unchanged[/dim]")
+        else:
+            self._done(stage, result)
+
+    def _done(self, stage: str, result: Any) -> None:
+        if stage == "palette":
+            _show_palette(result)
+        elif stage == "typography":
+            _show_typography(result)
+        elif stage == "tokens":
+            _, token_paths = result
+            names = ", ".join(p.name for p in token_paths.values())
+            console.print(f"  [green]Tokens:[/green] {names}")
+            if token_paths.skipped:
+                unchanged = ", ".join(token_paths[fmt].name for fmt in token_paths.skipped)
+                console.print(f"  [dim]Unchanged:[/dim] {unchanged}")
+        elif stage == "card_pdf":
+            console.print(f"  [green]PDF Card:[/green] {result.name}")
+        elif stage == "card_3d":
+            console.print(f"  [green]3D Card:[/green] {', '.join(p.name for p in result.values())}")
+        elif stage == "website":
+            console.print(f"  [green]Website:[/green] {result}")
+
+    def _failed(self, stage: str, error: BaseException) -> None:
+        from thenine.core.pipeline import is_fatal, missing_gtk
+
+        if missing_gtk(stage, error):
+            console.print(
+                "  [yellow]PDF Card skipped:[/yellow] GTK3 not installed. "
+                "Install via: https://www.msys2.org/ then `pacman -S mingw-w64-x86_64-pango`"
+            )
+            return
+        if not is_fatal(stage, error):
+            console.print(f"  [yellow]{_CARD_STAGES[stage]} skipped:[/yellow] {error}")
+            return
+        console.print(f"  [red]{_CARD_STAGES.get(stage, stage)} failed:[/red] {error}")
+        self.fatal = self.fatal or error
+
+
+def _show_profile(profiler: Any, profile_dir: Path) -> None:
+    from rich.table import Table
+
+    from thenine.core.profiling import TRACE_NAME
+
+    table = Table(title="Profile")
+    table.add_column("Step")
+    table.add_column("Wall ms", justify="right")
+    table.add_column("CPU ms", justify="right")
+    table.add_column("Waiting ms", justify="right", style="dim")
+    for step in profiler.summary():
+        name = step.name if step.depth == 0 else "  " * step.depth + step.name
+        wait = max(step.wall - step.cpu, 0.0)
+        table.add_row(
+            name if step.depth else f"[bold]{name}[/bold]",
+            f"{step.wall * 1000:.1f}",
+            f"{step.cpu * 1000:.1f}",
+            f"{wait * 1000:.1f}",
+        )
+    console.print(table)
+    trace = profiler.write_trace(profile_dir / TRACE_NAME)
+    console.print(f"[dim]Trace: {trace} (open in ui.perfetto.dev or chrome://tracing)[/dim]")
+    if profiler.cprofile_dir is not None:
+        console.print(f"[dim]cProfile stats: {profiler.cprofile_dir}/<stage>.prof[/dim]")
+
+
+def _show_memory(rows: list[tuple[str, dict[str, Any]]], title: str = "Memory") -> None:
+    """Table of StageMemory.to_dict() rows, labelled by stage."""
+    from rich.table import Table
+
+    table = Table(title=title)
+    table.add_column("Stage")
+    table.add_column("RSS MiB", justify="right")
+    table.add_column("Peak MiB", justify="right")
+    table.add_column("Δ MiB", justify="right", style="bold")
+    table.add_column("Py peak", justify="right")
+    table.add_column("Top allocation", style="dim")
+    for label, m in rows:
+        top = m["top"][0] if m["top"] else None
+        site = f"{Path(top['site']).name} ({top['size_kib']:,.0f} KiB)" if top else ""
+        table.add_row(
+            label,
+            f"{m['rss_before_mb']:.1f}",
+            f"{m['rss_peak_mb']:.1f}",
+            f"{m['rss_delta_mb']:.1f}",
+            f"{m['python_peak_mb']:.1f}",
+            site,
+        )
+    console.print(table)
+
+
+def _show_typography(typography: Any) -> None:
+    console.print(f"  Heading: [bold]{typography.heading.family}[/bold]")
+    console.print(f"  Body:    {typography.body.family}")
+
+
 def _show_palette(palette: object) -> None:
     """Display palette colors in the console."""
+    from rich.table import Table
+
     from thenine.core.brand import BrandPalette
 
     if not isinstance(palette, BrandPalette):
@@ -0,0 +1,211 @@
+"""Batch generation - stream brand inputs through warm worker processes into a JSONL ledger."""
+
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from thenine.core.brand import BrandInput
+from thenine.core.pipeline import DEFAULT_THREADS, BrandRun, PipelineOptions, StageContext
+from thenine.core.workers import WorkerPool, warm_worker
+
+LEDGER_NAME = "batch-ledger.jsonl"
+ERRORS_NAME = "batch-errors.jsonl"
+
+
+class BatchSummary(NamedTuple):
+    ok: int
+    failed: int
+    resumed: int
+
+
+def read_ledger(path: Path) -> dict[str, dict[str, Any]]:
+    """Latest ledger record per slug; a torn last line from a crash is ignored."""
+    records: dict[str, dict[str, Any]] = {}
+    if not path.exists():
+        return records
+    with path.open(encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("slug"):
+                records[record["slug"]] = record
+    return records
+
+
+def _error_text(error: BaseException) -> str:
+    return f"{type(error).__name__}: {error}"
+
+
+def generate_brand(
+    brand_input: BrandInput,
+    output_root: Path,
+    options: PipelineOptions,
+    resume: bool,
+    memory: bool = False,
+) -> dict[str, Any]:
+    """Run one brand through the pipeline and return its ledger record.
+
+    With memory, stages run one at a time so each one's peak RSS is its own,
+    and the record gains each stage's StageMemory under "memory".
+    """
+    from thenine.core.pipeline import Pipeline, generate_stages, run_brand
+    from thenine.core.profiling import MEMORY_TOP, Profiler
+    from thenine.core.snapshot import load_snapshot
+
+    output_dir = output_root / brand_input.slug
+    output_dir.mkdir(parents=True, exist_ok=True)
+    snapshot = load_snapshot(output_dir) if resume else None
+
+    # Already inside a worker process: run card stages on this worker's threads
+    threads = 1 if memory else DEFAULT_THREADS
+    pipeline = Pipeline(generate_stages(options), max_threads=threads, max_processes=0)
+    profiler = Profiler(memory_top=MEMORY_TOP) if memory else None
+    run = run_brand(
+        StageContext(input=brand_input, output_dir=output_dir, options=options),
+        snapshot=snapshot,
+        pipeline=pipeline,
+        force=not resume,
+        profiler=profiler,
+    )
+    record = brand_record(brand_input, output_dir, pipeline.order, run)
+    if profiler is not None:
+        record["memory"] = {name: m.to_dict() for name, m in profiler.memory.items()}
+    return record
+
+
+def brand_record(
+    brand_input: BrandInput, output_dir: Path, order: Iterable[str], run: BrandRun
+) -> dict[str, Any]:
+    """The ledger record of one brand's pipeline run; stages are listed in order."""
+    result = run.result
+
+    def status(name: str) -> str:
+        if name in result.errors:
+            return "failed"
+        if name in result.skipped:
+            return "skipped"
+        if name in result.results:
+            # Reused stages never reach the pool, so they have no timing
+            return "done" if name in result.timings else "unchanged"
+        return "pending"
+
+    return {
+        "slug": brand_input.slug,
+        "name": brand_input.name,
+        "status": "ok" if run.ok else "failed",
+        "output_dir": str(output_dir),
+        "stages": {name: status(name) for name in order},
+        "errors": {name: _error_text(e) for name, e in result.errors.items()},
+        "timings": {name: round(t, 4) for name, t in result.timings.items()},
+        "artifacts": run.snapshot.artifacts,
+    }
+
+
+def run_batch(
+    inputs: Iterable[BrandInput],
+    output_root: Path,
+    ledger_path: Path,
+    options: PipelineOptions,
+    workers: int | None = None,
+    resume: bool = True,
+    on_record: Callable[[dict[str, Any]], None] | None = None,
+    memory: bool = False,
+) -> BatchSummary:
+    """Generate every brand, appending one JSONL record per brand to the ledger.
+
+    With resume, brands whose latest ledger record is "ok" are skipped, and
+    other brands reuse every stage whose inputs are unchanged; without it
+    everything is rebuilt. Inputs are
+    consumed lazily with at most two brands per worker in flight. workers=0
+    runs brands in this process. memory records per-stage memory use in the
+    ledger (see generate_brand).
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    finished = (
+        {slug for slug, r in read_ledger(ledger_path).items() if r.get("status") == "ok"}
+        if resume
+        else set()
+    )
+    ledger_path.parent.mkdir(parents=True, exist_ok=True)
+    counts = {"ok": 0, "failed": 0, "resumed": 0}
+
+    with ledger_path.open("a", encoding="utf-8") as ledger:
+
+        def record(entry: dict[str, Any]) -> None:
+            entry["finished_at"] = datetime.now(UTC).isoformat(timespec="seconds")
+            ledger.write(json.dumps(entry) + "\n")
+            ledger.flush()
+            counts["ok" if entry["status"] == "ok" else "failed"] += 1
+            if on_record is not None:
+                on_record(entry)
+
+        def todo() -> Iterator[BrandInput]:
+            for brand_input in inputs:
+                if brand_input.slug in finished:
+                    counts["resumed"] += 1
+                else:
+                    yield brand_input
+
+        if workers == 0:
+            for brand_input in todo():
+                record(_safe_generate(brand_input, output_root, options, resume, memory))
+            return BatchSummary(counts["ok"], counts["failed"], counts["resumed"])
+
+        with WorkerPool(workers, initializer=warm_worker) as pool:
+            running: dict[Future[dict[str, Any]], BrandInput] = {}
+            pending = todo()
+            exhausted = False
+            while running or not exhausted:
+                while not exhausted and len(running) < 2 * workers:
+                    queued = next(pending, None)
+                    if queued is None:
+                        exhausted = True
+                        break
+                    future = pool.submit(_safe_generate, queued, output_root, options, resume, memory)
+                    running[future] = queued
+                if not running:
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    brand_input = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        record(future.result())
+                    else:
+                        record(_failed_record(brand_input, output_root, error))
+
+    return BatchSummary(counts["ok"], counts["failed"], counts["resumed"])
+
+
+def _failed_record(
+    brand_input: BrandInput, output_root: Path, error: BaseException
+) -> dict[str, Any]:
+    return {
+        "slug": brand_input.slug,
+        "name": brand_input.name,
+        "status": "failed",
+        "output_dir": str(output_root / brand_input.slug),
+        "errors": {"pipeline": _error_text(error)},
+    }
+
+
+def _safe_generate(
+    brand_input: BrandInput,
+    output_root: Path,
+    options: PipelineOptions,
+    resume: bool,
+    memory: bool = False,
+) -> dict[str, Any]:
+    try:
+        return generate_brand(brand_input, output_root, options, resume, memory)
+    except Exception as e:
+        return _failed_record(brand_input, output_root, e)
@@ -2,11 +2,22 @@
 
 from __future__ import annotations
 
+import re
+import unicodedata
 from enum import Enum
 from pathlib import Path
 
 from pydantic import BaseModel, EmailStr, Field, HttpUrl, field_validator
 
+_NON_SLUG = re.compile(r"[^a-z0-9]+")
+_ASCII_DOMAIN = re.compile(r"[A-Za-z0-9.\-]*")
+
+
+def slugify(name: str) -> str:
+    """Lowercase ASCII slug: accents dropped, runs of other characters become one '-'."""
+    ascii_name = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    return _NON_SLUG.sub("-", ascii_name.lower()).strip("-")
+
 
 class Industry(str, Enum):
     TECHNOLOGY = "technology"
@@ -66,13 +77,17 @@ class BrandInput(BaseModel, frozen=True):
     @field_validator("domain")
     @classmethod
     def validate_domain(cls, v: str) -> str:
-        if v and not all(c.isalnum() or c in ".-" for c in v):
+        if v.isascii():
+            valid = _ASCII_DOMAIN.fullmatch(v) is not None
+        else:
+            valid = all(c.isalnum() or c in ".-" for c in v)
+        if not valid:
             raise ValueError("Domain contains invalid characters")
         return v.lower()
 
     @property
     def slug(self) -> str:
-        return self.name.lower().replace(" ", "-").replace("_", "-")
+        return slugify(self.name) or "brand"
 
 
 class BrandColor(BaseModel, frozen=True):
@@ -162,6 +177,10 @@ class BrandTokens(BaseModel, frozen=True):
             "full": "9999px",
         }
     )
+    modes: dict[str, dict[str, str]] = Field(
+        default_factory=dict,
+        description='Mode name (e.g. "dark") -> {"group.key": value} overrides',
+    )
 
 
 class BrandPackage(BaseModel, frozen=True):
@@ -176,3 +195,10 @@ class BrandPackage(BaseModel, frozen=True):
     @property
     def output_path(self) -> Path:
         return Path(self.output_dir) if self.output_dir else Path("output") / self.input.slug
+
+    @property
+    def fingerprints(self) -> dict[str, str]:
+        """Content fingerprints of the input and each stage (palette ... website)."""
+        from thenine.core.fingerprint import package_fingerprints
+
+        return package_fingerprints(self)
@@ -0,0 +1,215 @@
+"""Binary token bundle - many brands in one file, read via mmap without parsing.
+
+Layout (little-endian):
+
+    header        magic "T9TB", version, flags, brand count, string count,
+                  string index offset, brand index offset
+    string index  (offset, length) per string, into the string data blob
+    string data   UTF-8 bytes of every distinct brand slug, token id and value
+    brand index   (slug id, first record, record count), sorted by slug bytes
+    records       (token id, value id) per token, sorted by token id bytes per brand
+
+Strings are stored once per bundle, so token ids and shared values (spacing,
+radii, fonts) cost 4 bytes per brand instead of a copy each.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from collections.abc import Iterable, Iterator, Mapping
+from itertools import pairwise
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from thenine.core.brand import BrandTokens
+
+MAGIC = b"T9TB"
+VERSION = 1
+
+_HEADER = struct.Struct("<4sHHIIII")
+_STRING = struct.Struct("<II")
+_BRAND = struct.Struct("<III")
+_RECORD = struct.Struct("<II")
+
+
+class BundleFormatError(ValueError):
+    """The file is not a token bundle this reader understands."""
+
+
+def render_bundle(
+    brands: Mapping[str, BrandTokens] | Iterable[tuple[str, BrandTokens]],
+) -> bytes:
+    """Encode brands (slug -> tokens) as one bundle.
+
+    Token ids are "group.key" and values are resolved, matching what the
+    exporters emit.
+    """
+    from thenine.core.exporters import iter_tokens
+
+    items = brands.items() if isinstance(brands, Mapping) else brands
+
+    strings: dict[bytes, int] = {}
+
+    def intern(text: str) -> int:
+        return strings.setdefault(text.encode("utf-8"), len(strings))
+
+    brand_rows: list[tuple[bytes, int, list[tuple[bytes, int, int]]]] = []
+    for slug, tokens in items:
+        records = []
+        for entry in iter_tokens(tokens):
+            token_id = f"{entry.group}.{entry.key}"
+            records.append((token_id.encode("utf-8"), intern(token_id), intern(entry.value)))
+        records.sort()
+        brand_rows.append((slug.encode("utf-8"), intern(slug), records))
+    brand_rows.sort(key=lambda row: row[0])
+
+    for prev, row in pairwise(brand_rows):
+        if prev[0] == row[0]:
+            raise ValueError(f"Duplicate brand slug in bundle: {row[0].decode('utf-8')!r}")
+
+    string_index_off = _HEADER.size
+    data_off = string_index_off + _STRING.size * len(strings)
+    index = bytearray()
+    blob = bytearray()
+    for raw in strings:
+        index += _STRING.pack(data_off + len(blob), len(raw))
+        blob += raw
+
+    brand_index_off = data_off + len(blob)
+    brand_index = bytearray()
+    records_blob = bytearray()
+    first = 0
+    for _, slug_id, records in brand_rows:
+        brand_index += _BRAND.pack(slug_id, first, len(records))
+        for _, key_id, value_id in records:
+            records_blob += _RECORD.pack(key_id, value_id)
+        first += len(records)
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, 0, len(brand_rows), len(strings), string_index_off, brand_index_off
+    )
+    return bytes(header + index + blob + brand_index + records_blob)
+
+
+def write_bundle(
+    brands: Mapping[str, BrandTokens] | Iterable[tuple[str, BrandTokens]], path: Path
+) -> Path:
+    """Write brands (slug -> tokens) into a single bundle file."""
+    from thenine.core.manifest import write_atomic
+
+    write_atomic(path, render_bundle(brands))
+    return path
+
+
+class TokenBundle:
+    """Memory-mapped reader for bundles written by write_bundle().
+
+    Opening a bundle reads only the header; lookups binary-search the brand
+    index and that brand's records directly in the mapping.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        with open(path, "rb") as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._mm) < _HEADER.size:
+            self.close()
+            raise BundleFormatError(f"{path} is too small to be a token bundle")
+        magic, version, _, brands, strings, string_off, brand_off = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise BundleFormatError(f"{path} is not a version {VERSION} token bundle")
+
+        self._brand_count: int = brands
+        self._string_count: int = strings
+        self._string_off: int = string_off
+        self._brand_off: int = brand_off
+        self._records_off = brand_off + _BRAND.size * brands
+        # slug -> (first record, count); filled lazily as brands are looked up
+        self._brand_cache: dict[str, tuple[int, int] | None] = {}
+
+    def __enter__(self) -> TokenBundle:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __len__(self) -> int:
+        return self._brand_count
+
+    def __contains__(self, slug: object) -> bool:
+        return isinstance(slug, str) and self._find_brand(slug) is not None
+
+    def _string_bytes(self, string_id: int) -> bytes:
+        offset, length = _STRING.unpack_from(self._mm, self._string_off + _STRING.size * string_id)
+        return self._mm[offset : offset + length]
+
+    def _string(self, string_id: int) -> str:
+        return self._string_bytes(string_id).decode("utf-8")
+
+    def _find_brand(self, slug: str) -> tuple[int, int] | None:
+        if slug not in self._brand_cache:
+            self._brand_cache[slug] = self._search_brand(slug)
+        return self._brand_cache[slug]
+
+    def _search_brand(self, slug: str) -> tuple[int, int] | None:
+        target = slug.encode("utf-8")
+        lo, hi = 0, self._brand_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            slug_id, first, count = _BRAND.unpack_from(self._mm, self._brand_off + _BRAND.size * mid)
+            current = self._string_bytes(slug_id)
+            if current == target:
+                return first, count
+            if current < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def brands(self) -> Iterator[str]:
+        """Yield brand slugs in sorted order."""
+        for i in range(self._brand_count):
+            slug_id, _, _ = _BRAND.unpack_from(self._mm, self._brand_off + _BRAND.size * i)
+            yield self._string(slug_id)
+
+    def get(self, slug: str, token_id: str) -> str | None:
+        """Look up one token value, e.g. get("acme", "colors.primary")."""
+        found = self._find_brand(slug)
+        if found is None:
+            return None
+        first, count = found
+        target = token_id.encode("utf-8")
+
+        lo, hi = 0, count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            key_id, value_id = _RECORD.unpack_from(
+                self._mm, self._records_off + _RECORD.size * (first + mid)
+            )
+            current = self._string_bytes(key_id)
+            if current == target:
+                return self._string(value_id)
+            if current < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def tokens(self, slug: str) -> dict[str, str]:
+        """Decode every token of one brand."""
+        found = self._find_brand(slug)
+        if found is None:
+            raise KeyError(slug)
+        first, count = found
+        result = {}
+        for i in range(first, first + count):
+            key_id, value_id = _RECORD.unpack_from(self._mm, self._records_off + _RECORD.size * i)
+            result[self._string(key_id)] = self._string(value_id)
+        return result
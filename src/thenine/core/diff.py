@@ -0,0 +1,133 @@
+"""Structural diff between two versions of a brand - changed tokens and affected artifacts."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from thenine.core.brand import BrandPackage, BrandTokens
+from thenine.core.exporters import available_formats, iter_tokens, render_formats
+
+# Generated artifact (relative to the output directory) -> package paths it is built from
+ARTIFACT_INPUTS: dict[str, tuple[str, ...]] = {
+    "business-card.pdf": ("input.name", "input.contact", "palette", "typography"),
+    "business-card.stl": ("input.name", "input.contact"),
+    "business-card.3mf": ("input.name", "input.contact"),
+    "website/": ("input", "palette", "typography", "tokens"),
+}
+
+
+class Change(BaseModel, frozen=True):
+    """One leaf that differs; old is None when added, new is None when removed."""
+
+    path: str
+    old: Any = None
+    new: Any = None
+
+
+class BrandDiff(BaseModel, frozen=True):
+    """Added, removed and changed leaves plus the output files they invalidate."""
+
+    added: list[Change] = Field(default_factory=list)
+    removed: list[Change] = Field(default_factory=list)
+    changed: list[Change] = Field(default_factory=list)
+    artifacts: list[str] = Field(default_factory=list)
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    @property
+    def paths(self) -> list[str]:
+        return [c.path for c in (*self.added, *self.removed, *self.changed)]
+
+
+def flatten_tokens(tokens: BrandTokens, prefix: str = "") -> dict[str, str]:
+    """Flatten tokens to {"group.key": resolved value}, with modes as "modes.<mode>.group.key"."""
+    flat = {f"{prefix}{entry.group}.{entry.key}": entry.value for entry in iter_tokens(tokens)}
+    for mode, overrides in tokens.modes.items():
+        for token_id, value in overrides.items():
+            flat[f"{prefix}modes.{mode}.{token_id}"] = value
+    return flat
+
+
+def _flatten(value: Any, prefix: str, out: dict[str, Any]) -> None:
+    if isinstance(value, Mapping) and value:
+        for key, item in value.items():
+            _flatten(item, f"{prefix}.{key}" if prefix else str(key), out)
+    else:
+        out[prefix] = value
+
+
+def flatten_package(package: BrandPackage) -> dict[str, Any]:
+    """Flatten a package to dotted leaf paths; tokens use resolved values."""
+    flat: dict[str, Any] = {}
+    _flatten(package.model_dump(mode="json", exclude={"tokens", "output_dir"}), "", flat)
+    flat.update(flatten_tokens(package.tokens, "tokens."))
+    return flat
+
+
+def diff_flat(old: Mapping[str, Any], new: Mapping[str, Any]) -> BrandDiff:
+    """Compare two flattened trees in a single pass over each."""
+    added: list[Change] = []
+    removed: list[Change] = []
+    changed: list[Change] = []
+    for path, old_value in old.items():
+        if path not in new:
+            removed.append(Change(path=path, old=old_value))
+        elif new[path] != old_value:
+            changed.append(Change(path=path, old=old_value, new=new[path]))
+    for path, new_value in new.items():
+        if path not in old:
+            added.append(Change(path=path, new=new_value))
+    return BrandDiff(added=added, removed=removed, changed=changed)
+
+
+def token_artifacts(
+    old: BrandTokens, new: BrandTokens, formats: Sequence[str] | None = None
+) -> list[str]:
+    """Return the token export files whose rendered content differs."""
+    formats = list(formats) if formats is not None else available_formats()
+    old_files = _rendered_files(old, formats)
+    new_files = _rendered_files(new, formats)
+    return sorted(
+        rel
+        for rel in old_files.keys() | new_files.keys()
+        if old_files.get(rel) != new_files.get(rel)
+    )
+
+
+def _rendered_files(tokens: BrandTokens, formats: Sequence[str]) -> dict[str, str]:
+    rendered = render_formats(tokens, formats)
+    return {rel: content for files in rendered.values() for rel, content in files.items()}
+
+
+def _touches(paths: list[str], prefixes: tuple[str, ...]) -> bool:
+    return any(path == p or path.startswith(p + ".") for path in paths for p in prefixes)
+
+
+def diff_tokens(
+    old: BrandTokens, new: BrandTokens, formats: Sequence[str] | None = None
+) -> BrandDiff:
+    """Diff two token sets; artifacts lists the token files that need rewriting."""
+    result = diff_flat(flatten_tokens(old), flatten_tokens(new))
+    if result.is_empty:
+        return result
+    return result.model_copy(update={"artifacts": token_artifacts(old, new, formats)})
+
+
+def diff_packages(
+    old: BrandPackage, new: BrandPackage, formats: Sequence[str] | None = None
+) -> BrandDiff:
+    """Diff two packages; artifacts lists token files plus the cards/website they feed."""
+    result = diff_flat(flatten_package(old), flatten_package(new))
+    if result.is_empty:
+        return result
+
+    paths = result.paths
+    artifacts = [name for name, inputs in ARTIFACT_INPUTS.items() if _touches(paths, inputs)]
+    if _touches(paths, ("tokens",)):
+        artifacts = token_artifacts(old.tokens, new.tokens, formats) + artifacts
+    return result.model_copy(update={"artifacts": artifacts})
@@ -0,0 +1,74 @@
+"""Event stream - a generate run as JSON lines, for orchestrators tracking progress.
+
+`thenine generate --events jsonl` writes one JSON object per line instead of
+the Rich display:
+
+    {"event": "run_start", "ts": ..., "brand": "Acme", "slug": "acme", "output_dir": ...}
+    {"event": "stage", "ts": ..., "stage": "palette", "status": "started", "reason": ...}
+    {"event": "stage", "ts": ..., "stage": "tokens", "status": "done", "elapsed": 0.0123,
+     "artifacts": [{"path": ..., "bytes": 2048}]}
+    {"event": "run_end", "ts": ..., "status": "ok", "elapsed": 0.25, "failed": []}
+
+Stage statuses are StageEvent's: started, done, failed, skipped, unchanged.
+Failed stages carry "error"; with --memory, finished stages carry "memory".
+run_end's status is "failed" only when the run exits non-zero (an optional card
+or website that could not render does not fail it). Each line is flushed as it
+is written.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Any, TextIO
+
+from thenine.core.brand import BrandInput
+from thenine.core.pipeline import StageEvent
+from thenine.core.profiling import Profiler
+from thenine.core.snapshot import ARTIFACT_STAGES, artifact_bytes, stage_artifacts
+
+EVENT_FORMATS = ("jsonl",)
+
+
+class JsonlEvents:
+    """Pipeline listener that writes every StageEvent to stream as a JSON line."""
+
+    def __init__(self, stream: TextIO, profiler: Profiler | None = None) -> None:
+        self.stream = stream
+        self.profiler = profiler
+        self.failed: list[str] = []
+        self._started = time.perf_counter()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        line = json.dumps({"event": event, "ts": round(time.time(), 6), **fields}, default=str)
+        self.stream.write(line + "\n")
+        self.stream.flush()
+
+    def start(self, brand_input: BrandInput, output_dir: Path) -> None:
+        self._started = time.perf_counter()
+        self.emit(
+            "run_start", brand=brand_input.name, slug=brand_input.slug, output_dir=str(output_dir)
+        )
+
+    def end(self, ok: bool, **fields: Any) -> None:
+        """The last line; failed lists every failed stage, fatal to the run or not."""
+        elapsed = round(time.perf_counter() - self._started, 6)
+        status = "ok" if ok else "failed"
+        self.emit("run_end", status=status, elapsed=elapsed, failed=self.failed, **fields)
+
+    def __call__(self, event: StageEvent) -> None:
+        fields: dict[str, Any] = {"stage": event.stage, "status": event.status}
+        if event.status in ("done", "failed"):
+            fields["elapsed"] = round(event.elapsed, 6)
+        if event.reason:
+            fields["reason"] = event.reason
+        if event.status in ("done", "unchanged") and event.stage in ARTIFACT_STAGES:
+            paths = [p for p in stage_artifacts(event.stage, event.result) if p.exists()]
+            fields["artifacts"] = [{"path": str(p), "bytes": artifact_bytes(p)} for p in paths]
+        if event.error is not None:
+            fields["error"] = f"{type(event.error).__name__}: {event.error}"
+            self.failed.append(event.stage)
+        if self.profiler is not None and event.stage in self.profiler.memory:
+            fields["memory"] = self.profiler.memory[event.stage].to_dict()
+        self.emit("stage", **fields)
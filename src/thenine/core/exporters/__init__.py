@@ -0,0 +1,172 @@
+"""Token exporter registry - lazily loaded format plugins fed by a single token walk."""
+
+from __future__ import annotations
+
+import importlib
+import inspect
+import shutil
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import entry_points
+from pathlib import Path
+
+from thenine.core.brand import BrandTokens
+from thenine.core.exporters.base import TokenEntry, TokenExporter, iter_tokens
+from thenine.core.manifest import OutputManifest
+
+# Format name -> "module:Class"; modules are imported only when a format is used
+EXPORTERS: dict[str, str] = {
+    "json": "thenine.core.exporters.web:JsonExporter",
+    "css": "thenine.core.exporters.web:CssExporter",
+    "tailwind": "thenine.core.exporters.web:TailwindExporter",
+    "scss": "thenine.core.exporters.web:ScssExporter",
+    "js": "thenine.core.exporters.web:JsExporter",
+    "android": "thenine.core.exporters.native:AndroidExporter",
+    "ios": "thenine.core.exporters.native:IosExporter",
+    "dtcg": "thenine.core.exporters.dtcg:DTCGExporter",
+}
+
+DEFAULT_FORMATS = ("json", "css", "tailwind")
+
+# Third-party packages can add formats under this entry point group
+ENTRY_POINT_GROUP = "thenine.exporters"
+
+_loaded: dict[str, type[TokenExporter]] = {}
+_entry_points_scanned = False
+
+__all__ = [
+    "DEFAULT_FORMATS",
+    "EXPORTERS",
+    "ExportResult",
+    "TokenEntry",
+    "TokenExporter",
+    "available_formats",
+    "export_formats",
+    "iter_tokens",
+    "load_exporter",
+    "register_exporter",
+    "render_formats",
+]
+
+
+class ExportResult(dict[str, Path]):
+    """Exported file paths keyed by format, plus the formats left untouched."""
+
+    def __init__(self, paths: dict[str, Path], skipped: list[str]) -> None:
+        super().__init__(paths)
+        self.skipped = skipped
+
+
+def _check_exporter(name: str, cls: type[TokenExporter]) -> None:
+    if inspect.isabstract(cls):
+        missing = ", ".join(sorted(cls.__abstractmethods__))
+        raise TypeError(f"Exporter for {name!r} ({cls.__qualname__}) does not implement {missing}")
+
+
+def register_exporter(name: str, target: str | type[TokenExporter]) -> None:
+    """Register a format by "module:Class" path or by class.
+
+    A class is checked now; a path is checked when the format is first loaded.
+    """
+    if isinstance(target, str):
+        EXPORTERS[name] = target
+        _loaded.pop(name, None)
+    else:
+        _check_exporter(name, target)
+        EXPORTERS[name] = f"{target.__module__}:{target.__qualname__}"
+        _loaded[name] = target
+
+
+def _scan_entry_points() -> None:
+    global _entry_points_scanned
+    if _entry_points_scanned:
+        return
+    _entry_points_scanned = True
+    for ep in entry_points(group=ENTRY_POINT_GROUP):
+        EXPORTERS.setdefault(ep.name, ep.value)
+
+
+def available_formats() -> list[str]:
+    """List every registered format name."""
+    _scan_entry_points()
+    return sorted(EXPORTERS)
+
+
+def load_exporter(name: str) -> type[TokenExporter]:
+    """Import and return the exporter class for a format."""
+    if name in _loaded:
+        return _loaded[name]
+
+    _scan_entry_points()
+    target = EXPORTERS.get(name)
+    if target is None:
+        raise ValueError(f"Unknown token format: {name!r} (available: {', '.join(available_formats())})")
+
+    module_name, _, attr = target.partition(":")
+    cls: type[TokenExporter] = getattr(importlib.import_module(module_name), attr)
+    _check_exporter(name, cls)
+    _loaded[name] = cls
+    return cls
+
+
+def render_formats(
+    tokens: BrandTokens, formats: Sequence[str] = DEFAULT_FORMATS
+) -> dict[str, dict[str, str]]:
+    """Render the given formats in memory from a single pass over the tokens.
+
+    Returns format -> {relative path: content}.
+    """
+    exporters = [load_exporter(name)() for name in formats]
+    for exporter in exporters:
+        exporter.begin(tokens)
+    for entry in iter_tokens(tokens):
+        for exporter in exporters:
+            exporter.feed(entry)
+    return {name: exporter.files() for name, exporter in zip(formats, exporters, strict=True)}
+
+
+def export_formats(
+    tokens: BrandTokens,
+    output_path: Path,
+    formats: Sequence[str] = DEFAULT_FORMATS,
+    manifest: OutputManifest | None = None,
+    max_workers: int | None = None,
+) -> ExportResult:
+    """Render formats in one pass and write their files on a thread pool.
+
+    Unchanged files are skipped via the output manifest; a format is reported
+    as skipped when none of its files needed writing or removing.
+    """
+    rendered = render_formats(tokens, formats)
+    own_manifest = manifest is None
+    manifest = manifest or OutputManifest(output_path)
+    # A shared manifest already holds skips from earlier calls
+    skipped_before = len(manifest.skipped)
+
+    jobs = [(rel, content) for files in rendered.values() for rel, content in files.items()]
+    if len(jobs) > 1 and max_workers != 1:
+        with ThreadPoolExecutor(max_workers=max_workers or min(8, len(jobs))) as pool:
+            list(pool.map(lambda job: manifest.write(*job), jobs))
+    else:
+        for rel, content in jobs:
+            manifest.write(rel, content)
+
+    skipped_files = set(manifest.skipped[skipped_before:])
+    paths: dict[str, Path] = {}
+    skipped: list[str] = []
+    for name in formats:
+        exporter_cls = load_exporter(name)
+        paths[name] = output_path / exporter_cls.primary
+        stale = exporter_cls.stale(output_path, rendered[name])
+        for path in stale:
+            if path.is_dir():
+                shutil.rmtree(path)
+            else:
+                path.unlink(missing_ok=True)
+            manifest.discard(path.relative_to(output_path).as_posix())
+        if not stale and all(rel in skipped_files for rel in rendered[name]):
+            skipped.append(name)
+
+    if own_manifest:
+        manifest.save()
+    return ExportResult(paths, skipped)
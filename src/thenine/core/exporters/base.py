@@ -0,0 +1,72 @@
+"""Exporter plugin interface and the single-pass token walk."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from thenine.core.brand import BrandTokens
+from thenine.core.token_graph import TOKEN_GROUPS, TokenGraph, has_references
+
+
+class TokenEntry(NamedTuple):
+    """A single token as seen by exporters.
+
+    value is always resolved; ref holds the "group.key" id the token aliases, if any.
+    """
+
+    group: str
+    key: str
+    value: str
+    ref: str | None = None
+
+
+def iter_tokens(tokens: BrandTokens) -> Iterator[TokenEntry]:
+    """Walk every token once, group by group, with aliases resolved."""
+    if not has_references(tokens):
+        for group in TOKEN_GROUPS:
+            for key, value in getattr(tokens, group).items():
+                yield TokenEntry(group, key, value)
+        return
+
+    graph = TokenGraph.from_tokens(tokens)
+    resolved = graph.resolve_all()
+    for group in TOKEN_GROUPS:
+        for key in getattr(tokens, group):
+            token_id = f"{group}.{key}"
+            yield TokenEntry(group, key, resolved[token_id], graph.reference_of(token_id))
+
+
+def is_oklch(entry: TokenEntry) -> bool:
+    return entry.group == "colors" and "-oklch" in entry.key
+
+
+class TokenExporter(ABC):
+    """Base class for format plugins.
+
+    Exporters are fed each token once via feed() and return their rendered
+    files, keyed by path relative to the output directory, from files().
+    begin() sees the whole BrandTokens first, for data outside the token walk.
+    Formats that write a directory of files list what a smaller token set left
+    behind via stale(), so it can be removed.
+    """
+
+    format: str = ""
+    # Path (relative to the output directory) reported for this format
+    primary: str = ""
+
+    def begin(self, tokens: BrandTokens) -> None:
+        return
+
+    @abstractmethod
+    def feed(self, entry: TokenEntry) -> None: ...
+
+    @abstractmethod
+    def files(self) -> dict[str, str]: ...
+
+    @classmethod
+    def stale(cls, root: Path, files: dict[str, str]) -> list[Path]:
+        """Files or directories under root from an earlier export that files() no longer has."""
+        return []
@@ -0,0 +1,204 @@
+"""W3C Design Tokens (DTCG) format, written through a streaming JSON writer."""
+
+from __future__ import annotations
+
+import io
+import json
+import re
+from collections.abc import Iterable
+from pathlib import Path
+from typing import IO, Any
+
+from thenine.core.brand import BrandTokens
+from thenine.core.exporters.base import TokenEntry, TokenExporter, iter_tokens
+from thenine.core.manifest import open_atomic
+from thenine.core.token_graph import parse_reference
+
+# BrandTokens group -> (DTCG group name, $type)
+DTCG_GROUPS: dict[str, tuple[str, str]] = {
+    "colors": ("color", "color"),
+    "fonts": ("font", "fontFamily"),
+    "spacing": ("spacing", "dimension"),
+    "radii": ("radii", "dimension"),
+}
+MODES_EXTENSION = "org.thenine.modes"
+
+HEX_RE = re.compile(r"^#([0-9a-fA-F]{6})$")
+OKLCH_RE = re.compile(r"^oklch\(\s*([\d.]+)\s+([\d.]+)\s+([\d.]+)\s*\)$")
+DIMENSION_RE = re.compile(r"^(-?[\d.]+)(rem|px)$")
+
+
+class DTCGWriter:
+    """Writes a DTCG document token by token, keeping only the open group path in memory."""
+
+    def __init__(self, fh: IO[str], indent: int = 2) -> None:
+        self._fh = fh
+        self._indent = indent
+        # One entry per open object: has it received a member yet?
+        self._has_members: list[bool] = []
+
+    def _member(self, name: str) -> None:
+        if not self._has_members:
+            self._fh.write("{")
+            self._has_members.append(False)
+        self._fh.write("," if self._has_members[-1] else "")
+        self._has_members[-1] = True
+        pad = " " * (self._indent * len(self._has_members))
+        self._fh.write(f"\n{pad}{json.dumps(name)}: ")
+
+    def begin_group(self, name: str, token_type: str | None = None) -> None:
+        self._member(name)
+        self._fh.write("{")
+        self._has_members.append(False)
+        if token_type:
+            self._member("$type")
+            self._fh.write(json.dumps(token_type))
+
+    def end_group(self) -> None:
+        had_members = self._has_members.pop()
+        if had_members:
+            self._fh.write("\n" + " " * (self._indent * len(self._has_members)))
+        self._fh.write("}")
+
+    def token(
+        self,
+        name: str,
+        value: Any,
+        token_type: str | None = None,
+        extensions: dict[str, Any] | None = None,
+    ) -> None:
+        body: dict[str, Any] = {"$value": value}
+        if token_type:
+            body["$type"] = token_type
+        if extensions:
+            body["$extensions"] = extensions
+        self._member(name)
+        self._fh.write(json.dumps(body, ensure_ascii=False))
+
+    def close(self) -> None:
+        """Close every open group and the root object."""
+        if not self._has_members:
+            self._fh.write("{")
+            self._has_members.append(False)
+        while self._has_members:
+            self.end_group()
+        self._fh.write("\n")
+
+
+def dtcg_value(group: str, value: str, prefix: str = "") -> Any:
+    """Convert a token value to its DTCG $value; aliases become {group.key} paths.
+
+    prefix is the path of the group the brand is written under, if any, so
+    aliases in a multi-brand document point inside their own brand.
+    """
+    ref = parse_reference(value)
+    if ref is not None:
+        ref_group, _, ref_key = ref.partition(".")
+        return f"{{{prefix}{DTCG_GROUPS.get(ref_group, (ref_group,))[0]}.{ref_key}}}"
+
+    if group == "colors":
+        if match := HEX_RE.match(value):
+            h = match.group(1)
+            components = [round(int(h[i : i + 2], 16) / 255, 4) for i in (0, 2, 4)]
+            return {"colorSpace": "srgb", "components": components, "hex": value.lower()}
+        if match := OKLCH_RE.match(value):
+            return {"colorSpace": "oklch", "components": [float(c) for c in match.groups()]}
+    elif group == "fonts":
+        return value
+    elif match := DIMENSION_RE.match(value):
+        number = float(match.group(1))
+        return {"value": int(number) if number.is_integer() else number, "unit": match.group(2)}
+    return value
+
+
+class _BrandStream:
+    """Feeds one brand's entries to a writer, opening a DTCG group per token group."""
+
+    def __init__(
+        self, writer: DTCGWriter, modes: dict[str, dict[str, str]], prefix: str = ""
+    ) -> None:
+        self._writer = writer
+        self._modes = modes
+        self._prefix = prefix
+        self._group: str | None = None
+
+    def feed(self, entry: TokenEntry) -> None:
+        if entry.group != self._group:
+            if self._group is not None:
+                self._writer.end_group()
+            name, token_type = DTCG_GROUPS[entry.group]
+            self._writer.begin_group(name, token_type)
+            self._group = entry.group
+
+        # Keep aliases as references rather than their resolved values
+        raw = "{" + entry.ref + "}" if entry.ref is not None else entry.value
+        token_id = f"{entry.group}.{entry.key}"
+        mode_values = {
+            mode: dtcg_value(entry.group, overrides[token_id], self._prefix)
+            for mode, overrides in self._modes.items()
+            if token_id in overrides
+        }
+        extensions = {MODES_EXTENSION: mode_values} if mode_values else None
+        value = dtcg_value(entry.group, raw, self._prefix)
+        self._writer.token(entry.key, value, extensions=extensions)
+
+    def finish(self) -> None:
+        if self._group is not None:
+            self._writer.end_group()
+            self._group = None
+
+
+def write_brand(writer: DTCGWriter, tokens: BrandTokens, prefix: str = "") -> None:
+    """Stream one brand's tokens into the writer's currently open group.
+
+    prefix is that group's path ("acme." under a top-level "acme" group).
+    """
+    stream = _BrandStream(writer, tokens.modes, prefix)
+    for entry in iter_tokens(tokens):
+        stream.feed(entry)
+    stream.finish()
+
+
+def write_dtcg(
+    brands: BrandTokens | Iterable[tuple[str, BrandTokens]], path: Path
+) -> Path:
+    """Stream a DTCG document to path.
+
+    A single BrandTokens is written at the document root. An iterable of
+    (slug, tokens) pairs - which may be a generator - is written as one
+    top-level group per brand, holding only one brand in memory at a time.
+    """
+    with open_atomic(path, "w", encoding="utf-8") as fh:
+        writer = DTCGWriter(fh)
+        if isinstance(brands, BrandTokens):
+            write_brand(writer, brands)
+        else:
+            for slug, tokens in brands:
+                writer.begin_group(slug)
+                write_brand(writer, tokens, f"{slug}.")
+                writer.end_group()
+        writer.close()
+    return path
+
+
+class DTCGExporter(TokenExporter):
+    """tokens.dtcg.json in the W3C Design Tokens format, with aliases and modes preserved."""
+
+    format = "dtcg"
+    primary = "tokens.dtcg.json"
+
+    def __init__(self) -> None:
+        self._buffer = io.StringIO()
+        self._writer = DTCGWriter(self._buffer)
+        self._stream = _BrandStream(self._writer, {})
+
+    def begin(self, tokens: BrandTokens) -> None:
+        self._stream = _BrandStream(self._writer, tokens.modes)
+
+    def feed(self, entry: TokenEntry) -> None:
+        self._stream.feed(entry)
+
+    def files(self) -> dict[str, str]:
+        self._stream.finish()
+        self._writer.close()
+        return {self.primary: self._buffer.getvalue()}
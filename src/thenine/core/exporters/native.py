@@ -0,0 +1,104 @@
+"""Native token formats - Android resource XML and iOS asset catalogs."""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import ClassVar
+from xml.sax.saxutils import escape
+
+from thenine.core.exporters.base import TokenEntry, TokenExporter, is_oklch
+
+# Android has no rem; 1rem maps to the 16dp default text size
+DP_PER_REM = 16
+HEX_RE = re.compile(r"^#[0-9a-fA-F]{6}$")
+
+ANDROID_TAGS = {"colors": "color", "fonts": "string", "spacing": "dimen", "radii": "dimen"}
+ANDROID_PREFIXES = {"colors": "color", "fonts": "font", "spacing": "spacing", "radii": "radius"}
+
+
+def _resource_name(prefix: str, key: str) -> str:
+    return f"{prefix}_{re.sub(r'[^a-z0-9]+', '_', key.lower()).strip('_')}"
+
+
+def _to_dp(value: str) -> str:
+    """Convert a CSS length (rem or px) to Android dp."""
+    if value.endswith("rem"):
+        dp = float(value[:-3]) * DP_PER_REM
+    elif value.endswith("px"):
+        dp = float(value[:-2])
+    else:
+        return value
+    return f"{dp:g}dp"
+
+
+class AndroidExporter(TokenExporter):
+    """android/values/tokens.xml with color, string and dimen resources."""
+
+    format = "android"
+    primary = "android/values/tokens.xml"
+
+    def __init__(self) -> None:
+        self._lines: list[str] = []
+
+    def feed(self, entry: TokenEntry) -> None:
+        if is_oklch(entry):
+            return
+        tag = ANDROID_TAGS[entry.group]
+        name = _resource_name(ANDROID_PREFIXES[entry.group], entry.key)
+        value = _to_dp(entry.value) if tag == "dimen" else entry.value
+        self._lines.append(f'    <{tag} name="{name}">{escape(value)}</{tag}>')
+
+    def files(self) -> dict[str, str]:
+        lines = ['<?xml version="1.0" encoding="utf-8"?>', "<resources>", *self._lines, "</resources>"]
+        return {self.primary: "\n".join(lines) + "\n"}
+
+
+class IosExporter(TokenExporter):
+    """ios/Tokens.xcassets with one sRGB colorset per hex color token."""
+
+    format = "ios"
+    primary = "ios/Tokens.xcassets"
+    _INFO: ClassVar[dict[str, object]] = {"author": "thenine", "version": 1}
+
+    def __init__(self) -> None:
+        self._colors: dict[str, str] = {}
+
+    def feed(self, entry: TokenEntry) -> None:
+        if entry.group == "colors" and HEX_RE.match(entry.value):
+            self._colors[entry.key] = entry.value
+
+    def files(self) -> dict[str, str]:
+        files = {f"{self.primary}/Contents.json": json.dumps({"info": self._INFO}, indent=2)}
+        for key, hex_val in self._colors.items():
+            h = hex_val.lstrip("#")
+            r, g, b = (int(h[i : i + 2], 16) / 255 for i in (0, 2, 4))
+            colorset = {
+                "colors": [
+                    {
+                        "color": {
+                            "color-space": "srgb",
+                            "components": {
+                                "red": f"{r:.3f}",
+                                "green": f"{g:.3f}",
+                                "blue": f"{b:.3f}",
+                                "alpha": "1.000",
+                            },
+                        },
+                        "idiom": "universal",
+                    }
+                ],
+                "info": self._INFO,
+            }
+            files[f"{self.primary}/{key}.colorset/Contents.json"] = json.dumps(colorset, indent=2)
+        return files
+
+    @classmethod
+    def stale(cls, root: Path, files: dict[str, str]) -> list[Path]:
+        catalog = root / cls.primary
+        return [
+            path
+            for path in sorted(catalog.glob("*.colorset"))
+            if f"{cls.primary}/{path.name}/Contents.json" not in files
+        ]
@@ -0,0 +1,156 @@
+"""Web token formats - JSON, CSS custom properties, Tailwind 4, SCSS and JS/TS modules."""
+
+from __future__ import annotations
+
+import json
+from typing import ClassVar
+
+from thenine.core.exporters.base import TokenEntry, TokenExporter, is_oklch
+
+# BrandTokens group -> variable prefix
+VAR_PREFIXES = {"colors": "color", "fonts": "font", "spacing": "spacing", "radii": "radius"}
+SECTION_TITLES = {"colors": "Colors", "fonts": "Fonts", "spacing": "Spacing", "radii": "Radii"}
+
+
+def _font_stack(family: str) -> str:
+    return f'"{family}", system-ui, sans-serif'
+
+
+class JsonExporter(TokenExporter):
+    """tokens.json with {"value": ...} leaves; oklch variants are omitted."""
+
+    format = "json"
+    primary = "tokens.json"
+    _GROUP_KEYS: ClassVar[dict[str, str]] = {
+        "colors": "color",
+        "fonts": "font",
+        "spacing": "spacing",
+        "radii": "radii",
+    }
+
+    def __init__(self) -> None:
+        self._data: dict[str, dict[str, dict[str, str]]] = {
+            name: {} for name in self._GROUP_KEYS.values()
+        }
+
+    def feed(self, entry: TokenEntry) -> None:
+        if is_oklch(entry):
+            return
+        self._data[self._GROUP_KEYS[entry.group]][entry.key] = {"value": entry.value}
+
+    def files(self) -> dict[str, str]:
+        return {self.primary: json.dumps(self._data, indent=2)}
+
+
+def css_declaration(entry: TokenEntry) -> tuple[str, str] | None:
+    """Return the (custom property, value) tokens.css uses for an entry, if any."""
+    if is_oklch(entry):
+        return None
+    value = _font_stack(entry.value) if entry.group == "fonts" else entry.value
+    return f"--{VAR_PREFIXES[entry.group]}-{entry.key}", value
+
+
+class CssExporter(TokenExporter):
+    """tokens.css with custom properties on :root."""
+
+    format = "css"
+    primary = "tokens.css"
+
+    def __init__(self) -> None:
+        self._sections: dict[str, list[str]] = {group: [] for group in SECTION_TITLES}
+
+    def feed(self, entry: TokenEntry) -> None:
+        declaration = css_declaration(entry)
+        if declaration is not None:
+            self._sections[entry.group].append(f"  {declaration[0]}: {declaration[1]};")
+
+    def files(self) -> dict[str, str]:
+        lines = [":root {"]
+        for i, (group, body) in enumerate(self._sections.items()):
+            if i:
+                lines.append("")
+            lines.append(f"  /* {SECTION_TITLES[group]} */")
+            lines.extend(body)
+        lines.append("}")
+        return {self.primary: "\n".join(lines)}
+
+
+class TailwindExporter(TokenExporter):
+    """tailwind-theme.css with a Tailwind 4 @theme block; oklch values win over hex."""
+
+    format = "tailwind"
+    primary = "tailwind-theme.css"
+
+    def __init__(self) -> None:
+        self._colors: list[str] = []
+        self._fonts: list[str] = []
+
+    def feed(self, entry: TokenEntry) -> None:
+        if entry.group == "colors":
+            key = entry.key.replace("-oklch", "")
+            self._colors.append(f"  --color-brand-{key}: {entry.value};")
+        elif entry.group == "fonts":
+            self._fonts.append(f"  --font-{entry.key}: {_font_stack(entry.value)};")
+
+    def files(self) -> dict[str, str]:
+        lines = ['@import "tailwindcss";', "", "@theme {", "  /* Brand Colors */"]
+        lines.extend(self._colors)
+        lines.append("")
+        lines.append("  /* Fonts */")
+        lines.extend(self._fonts)
+        lines.append("}")
+        return {self.primary: "\n".join(lines)}
+
+
+class ScssExporter(TokenExporter):
+    """_tokens.scss with one variable per token plus a map per group."""
+
+    format = "scss"
+    primary = "_tokens.scss"
+
+    def __init__(self) -> None:
+        self._sections: dict[str, list[tuple[str, str]]] = {group: [] for group in SECTION_TITLES}
+
+    def feed(self, entry: TokenEntry) -> None:
+        if is_oklch(entry):
+            return
+        value = _font_stack(entry.value) if entry.group == "fonts" else entry.value
+        self._sections[entry.group].append((entry.key, value))
+
+    def files(self) -> dict[str, str]:
+        lines: list[str] = []
+        for group, items in self._sections.items():
+            prefix = VAR_PREFIXES[group]
+            if lines:
+                lines.append("")
+            lines.append(f"// {SECTION_TITLES[group]}")
+            lines.extend(f"${prefix}-{key}: {value};" for key, value in items)
+            entries = ", ".join(f'"{key}": ${prefix}-{key}' for key, _ in items)
+            lines.append(f"${group}: ({entries});")
+        return {self.primary: "\n".join(lines) + "\n"}
+
+
+class JsExporter(TokenExporter):
+    """tokens.js ES module with a matching tokens.d.ts declaration file."""
+
+    format = "js"
+    primary = "tokens.js"
+
+    def __init__(self) -> None:
+        self._data: dict[str, dict[str, str]] = {group: {} for group in SECTION_TITLES}
+
+    def feed(self, entry: TokenEntry) -> None:
+        self._data[entry.group][entry.key] = entry.value
+
+    def files(self) -> dict[str, str]:
+        body = json.dumps(self._data, indent=2, ensure_ascii=False)
+        module = f"export const tokens = Object.freeze({body});\n\nexport default tokens;\n"
+
+        decl = ["export declare const tokens: {"]
+        for group, values in self._data.items():
+            keys = " ".join(f"readonly {json.dumps(key)}: string;" for key in values)
+            decl.append(f"  readonly {group}: {{ {keys} }};")
+        decl.append("};")
+        decl.append("")
+        decl.append("export default tokens;")
+        return {self.primary: module, "tokens.d.ts": "\n".join(decl) + "\n"}
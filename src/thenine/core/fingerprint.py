@@ -0,0 +1,112 @@
+"""Content fingerprints - stable cache keys for brand inputs and pipeline stages.
+
+A stage fingerprint hashes the stage name, its generator version and the
+canonical serialization of everything the stage reads. Downstream stages hash
+the content of upstream results (the palette, not the palette's fingerprint),
+so two brands that end up with the same palette share token fingerprints.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import unicodedata
+from typing import TYPE_CHECKING, Any
+
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    from thenine.core.brand import BrandInput, BrandPackage
+
+# Bump a stage's version whenever its output changes for the same inputs
+STAGE_VERSIONS: dict[str, int] = {
+    "palette": 1,
+    "typography": 1,
+    "tokens": 1,
+    "card": 1,
+    "card_3d": 1,
+    "website": 1,
+}
+
+STAGES = tuple(STAGE_VERSIONS)
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return _normalize(value.model_dump(mode="json"))
+    if isinstance(value, str):
+        return unicodedata.normalize("NFC", value)
+    if isinstance(value, dict):
+        return {str(k): _normalize(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    return value
+
+
+def canonical_json(value: Any) -> str:
+    """Serialize models/values with sorted keys, NFC strings and no whitespace."""
+    return json.dumps(
+        _normalize(value), sort_keys=True, separators=(",", ":"), ensure_ascii=False
+    )
+
+
+def fingerprint(value: Any) -> str:
+    """sha256 hex digest of the canonical serialization of value."""
+    return hashlib.sha256(canonical_json(value).encode("utf-8")).hexdigest()
+
+
+def stage_fingerprint(stage: str, inputs: dict[str, Any]) -> str:
+    """Fingerprint a stage from its inputs and current generator version."""
+    return fingerprint({"stage": stage, "version": STAGE_VERSIONS[stage], "inputs": inputs})
+
+
+def input_digests(inputs: dict[str, Any]) -> dict[str, str]:
+    """Fingerprint each of a stage's inputs separately, so a change can be named."""
+    return {key: fingerprint(value) for key, value in inputs.items()}
+
+
+def input_fingerprint(brand_input: BrandInput) -> str:
+    return fingerprint(brand_input)
+
+
+def package_fingerprints(package: BrandPackage, use_ai: bool = True) -> dict[str, str]:
+    """Fingerprints of the input and of every stage's inputs for a package.
+
+    use_ai is the option the palette was generated with; like the pipeline's
+    palette inputs, the palette fingerprint changes with it.
+    """
+    brand_input = package.input
+    selection = {
+        "industry": brand_input.industry,
+        "mood": brand_input.mood,
+        "name": brand_input.name,
+    }
+    return {
+        "input": input_fingerprint(brand_input),
+        "palette": stage_fingerprint("palette", {**selection, "use_ai": use_ai}),
+        "typography": stage_fingerprint("typography", selection),
+        "tokens": stage_fingerprint(
+            "tokens", {"palette": package.palette, "typography": package.typography}
+        ),
+        "card": stage_fingerprint(
+            "card",
+            {
+                "name": brand_input.name,
+                "contact": brand_input.contact,
+                "palette": package.palette,
+                "typography": package.typography,
+            },
+        ),
+        "card_3d": stage_fingerprint(
+            "card_3d", {"name": brand_input.name, "contact": brand_input.contact}
+        ),
+        "website": stage_fingerprint(
+            "website",
+            {
+                "input": brand_input,
+                "palette": package.palette,
+                "typography": package.typography,
+                "tokens": package.tokens,
+            },
+        ),
+    }
@@ -0,0 +1,414 @@
+"""Font metrics table and vectorized heading/body pairing scorer."""
+
+from __future__ import annotations
+
+import json
+import os
+import warnings
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+from pydantic import BaseModel, Field
+
+from thenine.core.manifest import write_atomic
+
+FONT_SUFFIXES = {".ttf", ".otf"}
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "thenine"
+
+# Scoring weights - must sum to 1.0 so scores stay in [0, 1]
+SCORE_WEIGHTS: dict[str, float] = {
+    "style": 0.30,
+    "readability": 0.15,
+    "distinction": 0.15,
+    "coverage": 0.15,
+    "x_height_harmony": 0.10,
+    "body_contrast": 0.10,
+    "width_harmony": 0.05,
+}
+
+
+class FontMetrics(BaseModel, frozen=True):
+    """Measured glyph metrics for a font family, normalized to the em square."""
+
+    family: str = Field(min_length=1, max_length=100)
+    category: str = Field(default="sans-serif")
+    x_height: float = Field(ge=0.0, le=1.0, description="x-height / units per em")
+    cap_height: float = Field(ge=0.0, le=1.5, description="Cap height / units per em")
+    contrast: float = Field(ge=0.0, le=1.0, description="Stroke contrast, 0 = monolinear")
+    width: float = Field(ge=0.0, le=2.0, description="Average advance width / units per em")
+    weights: tuple[int, ...] = Field(default=(400, 700), description="Available weights")
+
+    @property
+    def weight_coverage(self) -> float:
+        return len({w for w in self.weights if 100 <= w <= 900}) / 9
+
+
+def _m(
+    family: str,
+    category: str,
+    x_height: float,
+    contrast: float,
+    width: float,
+    weights: tuple[int, ...],
+    cap_height: float = 0.70,
+) -> FontMetrics:
+    return FontMetrics(
+        family=family,
+        category=category,
+        x_height=x_height,
+        cap_height=cap_height,
+        contrast=contrast,
+        width=width,
+        weights=weights,
+    )
+
+
+_ALL_WEIGHTS = (100, 200, 300, 400, 500, 600, 700, 800, 900)
+
+# Precomputed metrics for the curated catalog, measured from each family's release:
+# Google Fonts, except Clash Display and Satoshi, which come from Fontshare.
+# Local font files found by load_metrics_table() override these entries.
+BUILTIN_METRICS: dict[str, FontMetrics] = {
+    m.family: m
+    for m in [
+        _m("Inter", "sans-serif", 0.546, 0.05, 0.56, _ALL_WEIGHTS, 0.727),
+        _m("Source Sans 3", "sans-serif", 0.486, 0.08, 0.49, _ALL_WEIGHTS[1:], 0.660),
+        _m("Space Grotesk", "sans-serif", 0.486, 0.04, 0.58, (300, 400, 500, 600, 700)),
+        _m("IBM Plex Sans", "sans-serif", 0.516, 0.08, 0.55, _ALL_WEIGHTS[:7], 0.698),
+        _m("Outfit", "sans-serif", 0.500, 0.02, 0.53, _ALL_WEIGHTS),
+        _m("Nunito Sans", "sans-serif", 0.484, 0.05, 0.53, _ALL_WEIGHTS[1:], 0.705),
+        _m("Playfair Display", "serif", 0.514, 0.75, 0.52, _ALL_WEIGHTS[3:], 0.708),
+        _m("Libre Baskerville", "serif", 0.530, 0.55, 0.62, (400, 700), 0.770),
+        _m("Open Sans", "sans-serif", 0.535, 0.10, 0.56, _ALL_WEIGHTS[2:8], 0.714),
+        _m("Cormorant Garamond", "serif", 0.400, 0.60, 0.45, (300, 400, 500, 600, 700), 0.630),
+        _m("Lato", "sans-serif", 0.506, 0.12, 0.53, (100, 300, 400, 700, 900), 0.717),
+        _m("Nunito", "sans-serif", 0.484, 0.03, 0.54, _ALL_WEIGHTS[1:], 0.705),
+        _m("Poppins", "sans-serif", 0.548, 0.04, 0.62, _ALL_WEIGHTS, 0.698),
+        _m("Roboto", "sans-serif", 0.528, 0.10, 0.55, (100, 300, 400, 500, 700, 900), 0.711),
+        _m("Raleway", "sans-serif", 0.519, 0.06, 0.56, _ALL_WEIGHTS, 0.710),
+        _m("Merriweather", "serif", 0.555, 0.35, 0.60, (300, 400, 700, 900), 0.743),
+        _m("Lora", "serif", 0.500, 0.40, 0.54, (400, 500, 600, 700)),
+        _m("PT Serif", "serif", 0.500, 0.35, 0.55, (400, 700)),
+        _m("PT Sans", "sans-serif", 0.500, 0.10, 0.50, (400, 700)),
+        _m("Montserrat", "sans-serif", 0.517, 0.04, 0.64, _ALL_WEIGHTS),
+        _m("DM Sans", "sans-serif", 0.512, 0.05, 0.55, _ALL_WEIGHTS),
+        _m("Sora", "sans-serif", 0.530, 0.03, 0.60, _ALL_WEIGHTS[:8]),
+        _m("Clash Display", "sans-serif", 0.520, 0.05, 0.52, _ALL_WEIGHTS[1:7]),
+        _m("Satoshi", "sans-serif", 0.500, 0.05, 0.54, (300, 400, 500, 700, 900)),
+        _m("Josefin Sans", "sans-serif", 0.375, 0.05, 0.52, _ALL_WEIGHTS[:7]),
+        _m("Abril Fatface", "serif", 0.500, 0.85, 0.60, (400,)),
+        _m("Oswald", "sans-serif", 0.580, 0.10, 0.42, _ALL_WEIGHTS[1:7], 0.810),
+        _m("JetBrains Mono", "monospace", 0.550, 0.05, 0.60, _ALL_WEIGHTS[:8], 0.730),
+        _m("Fira Code", "monospace", 0.527, 0.05, 0.60, (300, 400, 500, 600, 700), 0.689),
+        _m("Source Code Pro", "monospace", 0.480, 0.05, 0.60, _ALL_WEIGHTS[1:], 0.660),
+    ]
+}
+
+
+def extract_metrics(font_path: Path) -> FontMetrics:
+    """Measure x-height, cap height, contrast and width from a TrueType/OpenType file."""
+    from fontTools.ttLib import TTFont
+
+    font = TTFont(str(font_path), lazy=True)
+    try:
+        upem = float(font["head"].unitsPerEm)
+        os2 = font.get("OS/2")
+        glyph_set = font.getGlyphSet()
+        cmap = font.getBestCmap() or {}
+
+        x_height = float(getattr(os2, "sxHeight", 0) or 0)
+        if not x_height:
+            x_height = _glyph_top(glyph_set, cmap, "x")
+        cap_height = float(getattr(os2, "sCapHeight", 0) or 0)
+        if not cap_height:
+            cap_height = _glyph_top(glyph_set, cmap, "H")
+
+        width = float(getattr(os2, "xAvgCharWidth", 0) or 0)
+        if not width:
+            advances = [
+                glyph_set[cmap[ord(c)]].width
+                for c in "abcdefghijklmnopqrstuvwxyz"
+                if ord(c) in cmap
+            ]
+            width = sum(advances) / len(advances) if advances else 0.0
+
+        contrast = _stroke_contrast(glyph_set, cmap)
+        weight = int(getattr(os2, "usWeightClass", 400) or 400)
+        family = _family_name(font) or font_path.stem
+
+        if font["post"].isFixedPitch:
+            category = "monospace"
+        else:
+            category = "serif" if contrast >= 0.3 else "sans-serif"
+
+        return FontMetrics(
+            family=family,
+            category=category,
+            x_height=round(min(1.0, x_height / upem), 3),
+            cap_height=round(min(1.5, cap_height / upem), 3),
+            contrast=round(contrast, 3),
+            width=round(min(2.0, width / upem), 3),
+            weights=(max(100, min(900, round(weight / 100) * 100)),),
+        )
+    finally:
+        font.close()
+
+
+def _family_name(font: object) -> str:
+    """Return the typographic family name (name ID 16), falling back to ID 1."""
+    name_table = font["name"]  # type: ignore[index]
+    for name_id in (16, 1):
+        record = name_table.getDebugName(name_id)
+        if record:
+            return str(record)
+    return ""
+
+
+def _glyph_top(glyph_set: object, cmap: dict[int, str], char: str) -> float:
+    """Return the top of a glyph's bounding box, or 0 when the glyph is missing."""
+    bounds = _contour_bounds(glyph_set, cmap, char)
+    return max((b[3] for b in bounds), default=0.0)
+
+
+def _contour_bounds(
+    glyph_set: object, cmap: dict[int, str], char: str
+) -> list[tuple[float, float, float, float]]:
+    """Return (xmin, ymin, xmax, ymax) for each contour of a glyph."""
+    from fontTools.pens.recordingPen import RecordingPen
+
+    glyph_name = cmap.get(ord(char))
+    if glyph_name is None:
+        return []
+
+    pen = RecordingPen()
+    glyph_set[glyph_name].draw(pen)  # type: ignore[index]
+
+    bounds: list[tuple[float, float, float, float]] = []
+    points: list[tuple[float, float]] = []
+    for operator, args in pen.value:
+        if operator in ("closePath", "endPath"):
+            if points:
+                xs = [p[0] for p in points]
+                ys = [p[1] for p in points]
+                bounds.append((min(xs), min(ys), max(xs), max(ys)))
+            points = []
+        else:
+            points.extend(args)
+    return bounds
+
+
+def _stroke_contrast(glyph_set: object, cmap: dict[int, str]) -> float:
+    """Estimate stroke contrast from the outer and inner contours of 'o'.
+
+    The side walls of an 'o' are its thick strokes and the top/bottom its thin
+    strokes, so 1 - thin/thick is 0 for monolinear designs and near 1 for Didones.
+    """
+    bounds = _contour_bounds(glyph_set, cmap, "o")
+    if len(bounds) < 2:
+        return 0.0
+
+    bounds.sort(key=lambda b: (b[2] - b[0]) * (b[3] - b[1]), reverse=True)
+    outer, inner = bounds[0], bounds[1]
+    vertical_stem = ((inner[0] - outer[0]) + (outer[2] - inner[2])) / 2
+    horizontal_stem = ((inner[1] - outer[1]) + (outer[3] - inner[3])) / 2
+    thick = max(vertical_stem, horizontal_stem)
+    thin = min(vertical_stem, horizontal_stem)
+    if thick <= 0 or thin < 0:
+        return 0.0
+    return max(0.0, min(1.0, 1 - thin / thick))
+
+
+def build_metrics_table(
+    font_dirs: Iterable[Path], cache_path: Path | None = None
+) -> dict[str, FontMetrics]:
+    """Extract metrics from every font file under font_dirs, grouped by family.
+
+    Per-file results are cached by path, size and mtime, so only new or changed
+    files are parsed on subsequent calls. A file fontTools cannot read is left out
+    with a RuntimeWarning naming it.
+    """
+    from fontTools.ttLib import TTLibError
+
+    cache: dict[str, dict[str, object]] = {}
+    if cache_path and cache_path.exists():
+        try:
+            cache = json.loads(cache_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            cache = {}
+
+    fresh: dict[str, dict[str, object]] = {}
+    per_file: list[FontMetrics] = []
+
+    for font_dir in font_dirs:
+        if not font_dir.is_dir():
+            continue
+        for path in sorted(font_dir.rglob("*")):
+            if path.suffix.lower() not in FONT_SUFFIXES:
+                continue
+            stat = path.stat()
+            key = str(path.resolve())
+            stamp = [stat.st_size, stat.st_mtime_ns]
+
+            entry = cache.get(key)
+            if entry and entry.get("stamp") == stamp:
+                metrics = FontMetrics.model_validate(entry["metrics"])
+            else:
+                try:
+                    metrics = extract_metrics(path)
+                # KeyError: a required table is missing; ValueError: metrics out of range
+                except (TTLibError, OSError, KeyError, ValueError) as e:
+                    warnings.warn(
+                        f"Skipping font {path}: {type(e).__name__}: {e}",
+                        RuntimeWarning,
+                        stacklevel=2,
+                    )
+                    continue
+            fresh[key] = {"stamp": stamp, "metrics": metrics.model_dump(mode="json")}
+            per_file.append(metrics)
+
+    if cache_path and fresh != cache:
+        write_atomic(cache_path, json.dumps(fresh).encode("utf-8"))
+
+    return _merge_families(per_file)
+
+
+def _merge_families(per_file: Sequence[FontMetrics]) -> dict[str, FontMetrics]:
+    """Merge per-file metrics into one entry per family, measured at the regular weight."""
+    grouped: dict[str, list[FontMetrics]] = {}
+    for metrics in per_file:
+        grouped.setdefault(metrics.family, []).append(metrics)
+
+    table: dict[str, FontMetrics] = {}
+    for family, members in grouped.items():
+        regular = min(members, key=lambda m: abs(m.weights[0] - 400))
+        weights = tuple(sorted({w for m in members for w in m.weights}))
+        table[family] = regular.model_copy(update={"weights": weights})
+    return table
+
+
+def load_metrics_table(
+    font_dirs: Iterable[Path] | None = None, cache_path: Path | None = None
+) -> dict[str, FontMetrics]:
+    """Return the builtin metrics overlaid with metrics measured from local font files.
+
+    Font directories default to THENINE_FONT_DIRS (os.pathsep separated).
+    """
+    if font_dirs is None:
+        env_dirs = os.environ.get("THENINE_FONT_DIRS", "")
+        font_dirs = [Path(p) for p in env_dirs.split(os.pathsep) if p]
+    font_dirs = list(font_dirs)
+
+    table = dict(BUILTIN_METRICS)
+    if font_dirs:
+        if cache_path is None:
+            cache_dir = Path(os.environ.get("THENINE_CACHE_DIR", "") or DEFAULT_CACHE_DIR)
+            cache_path = cache_dir / "font_metrics.json"
+        table.update(build_metrics_table(font_dirs, cache_path))
+    return table
+
+
+class PairingScorer:
+    """Scores heading/body font combinations from a metrics table.
+
+    Metrics are held as column vectors so a whole catalog is scored with one
+    broadcast over the heading x body matrix.
+    """
+
+    def __init__(self, table: dict[str, FontMetrics]) -> None:
+        families = sorted(f for f, m in table.items() if m.category != "monospace")
+        self.families = families
+        self._index = {family: i for i, family in enumerate(families)}
+
+        rows = [table[f] for f in families]
+        self._x_height = np.array([m.x_height for m in rows], dtype=np.float64)
+        self._contrast = np.array([m.contrast for m in rows], dtype=np.float64)
+        self._width = np.array([m.width for m in rows], dtype=np.float64)
+        self._coverage = np.array([m.weight_coverage for m in rows], dtype=np.float64)
+        self._has_bold = np.array([max(m.weights) >= 700 for m in rows], dtype=np.float64)
+        self._serif = np.array([m.category == "serif" for m in rows], dtype=bool)
+        self._matrices: dict[bool, np.ndarray] = {}
+
+    def score_matrix(self, preferred_style: str = "sans-serif") -> np.ndarray:
+        """Return an (n, n) matrix of scores, rows = heading, columns = body.
+
+        Pairing a family with itself scores -inf. The matrix depends only on
+        whether serif headings are preferred, so both variants are computed once
+        and returned read-only.
+        """
+        wants_serif = preferred_style == "serif"
+        if wants_serif not in self._matrices:
+            scores = self._compute_matrix(wants_serif)
+            scores.flags.writeable = False
+            self._matrices[wants_serif] = scores
+        return self._matrices[wants_serif]
+
+    def _compute_matrix(self, wants_serif: bool) -> np.ndarray:
+        xh_h, xh_b = self._x_height[:, None], self._x_height[None, :]
+        c_h, c_b = self._contrast[:, None], self._contrast[None, :]
+        w_h, w_b = self._width[:, None], self._width[None, :]
+
+        style = (self._serif == wants_serif).astype(np.float64)[:, None]
+        readability = np.clip((xh_b - 0.40) / 0.15, 0.0, 1.0)
+        distinction = np.clip(np.abs(c_h - c_b) / 0.4 + np.abs(w_h - w_b) / 0.15, 0.0, 1.0)
+        coverage = 0.5 * self._has_bold[:, None] + 0.5 * self._coverage[None, :]
+        x_height_harmony = 1.0 - np.clip(np.abs(xh_h - xh_b) / 0.15, 0.0, 1.0)
+        body_contrast = 1.0 - np.clip(c_b / 0.6, 0.0, 1.0)
+        width_harmony = 1.0 - np.clip(np.abs(w_h - w_b) / 0.2, 0.0, 1.0)
+
+        scores: np.ndarray = (
+            SCORE_WEIGHTS["style"] * style
+            + SCORE_WEIGHTS["readability"] * readability
+            + SCORE_WEIGHTS["distinction"] * distinction
+            + SCORE_WEIGHTS["coverage"] * coverage
+            + SCORE_WEIGHTS["x_height_harmony"] * x_height_harmony
+            + SCORE_WEIGHTS["body_contrast"] * body_contrast
+            + SCORE_WEIGHTS["width_harmony"] * width_harmony
+        )
+        np.fill_diagonal(scores, -np.inf)
+        return scores
+
+    def score_pairs(
+        self, pairs: Sequence[tuple[str, str]], preferred_style: str = "sans-serif"
+    ) -> list[float]:
+        """Score specific pairings. Families missing from the table score 0."""
+        matrix = self.score_matrix(preferred_style)
+        known = [
+            (i, self._index[h], self._index[b])
+            for i, (h, b) in enumerate(pairs)
+            if h in self._index and b in self._index
+        ]
+        scores = [0.0] * len(pairs)
+        if known:
+            pos, rows, cols = (np.array(col) for col in zip(*known, strict=True))
+            for p, s in zip(pos.tolist(), matrix[rows, cols].tolist(), strict=True):
+                scores[p] = s
+        return scores
+
+    def rank(
+        self, preferred_style: str = "sans-serif", limit: int | None = 10
+    ) -> list[tuple[str, str, float]]:
+        """Rank every heading/body combination in the catalog, best first."""
+        matrix = self.score_matrix(preferred_style)
+        flat = matrix.ravel()
+        count = flat.size - len(self.families)
+        if limit is not None:
+            count = min(count, limit)
+        if count <= 0:
+            return []
+
+        top = np.argpartition(-flat, count - 1)[:count]
+        top = top[np.argsort(-flat[top], kind="stable")]
+        n = len(self.families)
+        return [
+            (self.families[i // n], self.families[i % n], round(float(flat[i]), 4))
+            for i in top.tolist()
+        ]
+
+
+@lru_cache(maxsize=1)
+def default_scorer() -> PairingScorer:
+    """Return a process-wide scorer built from load_metrics_table()."""
+    return PairingScorer(load_metrics_table())
@@ -0,0 +1,280 @@
+"""Run history - stage timings of every generate and batch run in a local SQLite file.
+
+The batch ledger only keeps each brand's latest record; the history keeps all
+of them, so `thenine stats` can show how stages trend over time. Each run adds
+a row to runs (with its AI palette requests and fallbacks) and a row per brand
+and stage to stages: status, seconds, bytes written and the error, if any.
+A reused ("unchanged") stage is a cache hit and has no seconds.
+
+Rows are buffered and written FLUSH_ROWS at a time in one transaction, so a
+10k-brand batch costs a few dozen commits. The file lives in the output root
+(<output>/.thenine-history.sqlite): batch's --output, output/ for a generate
+into the default output/<slug>, or a generate's own --output directory.
+THENINE_HISTORY points it elsewhere, or turns it off when set to an empty string.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import Any, NamedTuple
+
+from thenine.core.metrics import AI_REQUESTS
+from thenine.core.snapshot import artifact_bytes
+
+HISTORY_NAME = ".thenine-history.sqlite"
+FLUSH_ROWS = 500
+
+_UNITS = {"m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    command TEXT NOT NULL,
+    started REAL NOT NULL,
+    finished REAL,
+    ai_requests INTEGER NOT NULL DEFAULT 0,
+    ai_fallbacks INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS stages (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    at REAL NOT NULL,
+    slug TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    status TEXT NOT NULL,
+    seconds REAL,
+    bytes INTEGER,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS stages_at ON stages (at);
+"""
+
+
+class StageStats(NamedTuple):
+    stage: str
+    runs: int
+    p50: float | None
+    p90: float | None
+    p99: float | None
+    max: float | None
+    reused: float
+    failed: float
+
+
+class SlowBrand(NamedTuple):
+    slug: str
+    seconds: float
+    slowest_stage: str
+    at: float
+
+
+class Regression(NamedTuple):
+    stage: str
+    before: float
+    now: float
+
+    @property
+    def change(self) -> float:
+        """Percent change of the median, positive when slower."""
+        return (self.now / self.before - 1) * 100 if self.before else 0.0
+
+
+def history_path(output_root: Path) -> Path | None:
+    """Where runs writing under output_root are recorded; None when history is off."""
+    configured = os.environ.get("THENINE_HISTORY")
+    if configured is not None:
+        return Path(configured) if configured else None
+    return output_root / HISTORY_NAME
+
+
+def parse_window(text: str) -> float:
+    """Seconds in a window like "30m", "24h", "7d" or "2w"."""
+    unit = _UNITS.get(text[-1:].lower())
+    try:
+        count = float(text[:-1])
+    except ValueError:
+        count = -1.0
+    if unit is None or count <= 0:
+        raise ValueError(f"Expected a window like 24h, 7d or 2w, got {text!r}")
+    return count * unit
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile (q in 0-100) of sorted values."""
+    if not values:
+        return None
+    return values[max(0, math.ceil(q / 100 * len(values)) - 1)]
+
+
+def record_rows(record: dict[str, Any], at: float) -> Iterator[tuple[Any, ...]]:
+    """(at, slug, stage, status, seconds, bytes, error) for each stage of a ledger record."""
+    timings = record.get("timings", {})
+    errors = record.get("errors", {})
+    artifacts = record.get("artifacts", {})
+    output_dir = Path(record.get("output_dir", ""))
+    stages = record.get("stages") or dict.fromkeys(errors, "failed")
+    for stage, status in stages.items():
+        size = None
+        if status in ("done", "unchanged") and stage in artifacts:
+            paths = [output_dir / p for p in artifacts[stage]]
+            size = sum(artifact_bytes(p) for p in paths if p.exists())
+        yield at, record["slug"], stage, status, timings.get(stage), size, errors.get(stage)
+
+
+def connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(_SCHEMA)
+    return db
+
+
+class RunHistory:
+    """One run's history: ledger records are buffered and written in batches.
+
+    Use as a context manager; leaving it flushes what is left and closes the run.
+    """
+
+    def __init__(self, path: Path, command: str, flush_rows: int = FLUSH_ROWS) -> None:
+        self.path = path
+        self.flush_rows = flush_rows
+        self._db = connect(path)
+        self._rows: list[tuple[Any, ...]] = []
+        self._ai_before = self._ai_counts()
+        with self._db:
+            cursor = self._db.execute(
+                "INSERT INTO runs (command, started) VALUES (?, ?)", (command, time.time())
+            )
+        self.run_id = cursor.lastrowid
+
+    @staticmethod
+    def _ai_counts() -> tuple[float, float]:
+        ok, fallback = AI_REQUESTS.value("palette", "ok"), AI_REQUESTS.value("palette", "fallback")
+        return ok + fallback, fallback
+
+    def add(self, record: dict[str, Any]) -> None:
+        """Queue a brand's ledger record (see batch.brand_record)."""
+        self._rows.extend((self.run_id, *row) for row in record_rows(record, time.time()))
+        if len(self._rows) >= self.flush_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._rows:
+            return
+        with self._db:
+            self._db.executemany("INSERT INTO stages VALUES (?, ?, ?, ?, ?, ?, ?, ?)", self._rows)
+        self._rows.clear()
+
+    def close(self) -> None:
+        self.flush()
+        requests, fallbacks = self._ai_counts()
+        with self._db:
+            self._db.execute(
+                "UPDATE runs SET finished = ?, ai_requests = ?, ai_fallbacks = ? WHERE id = ?",
+                (
+                    time.time(),
+                    int(requests - self._ai_before[0]),
+                    int(fallbacks - self._ai_before[1]),
+                    self.run_id,
+                ),
+            )
+        self._db.close()
+
+    def __enter__(self) -> RunHistory:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def stage_stats(db: sqlite3.Connection, since: float, until: float) -> list[StageStats]:
+    """Per-stage latency percentiles, reuse and failure rates between since and until."""
+    rows = db.execute(
+        "SELECT stage, status, seconds FROM stages WHERE at >= ? AND at < ? ORDER BY stage",
+        (since, until),
+    )
+    by_stage: dict[str, list[tuple[str, float | None]]] = {}
+    for stage, status, seconds in rows:
+        by_stage.setdefault(stage, []).append((status, seconds))
+    stats = []
+    for stage, entries in by_stage.items():
+        seconds = sorted(s for status, s in entries if status == "done" and s is not None)
+        ran = sum(1 for status, _ in entries if status in ("done", "failed"))
+        reused = sum(1 for status, _ in entries if status == "unchanged")
+        failed = sum(1 for status, _ in entries if status == "failed")
+        stats.append(
+            StageStats(
+                stage,
+                ran + reused,
+                percentile(seconds, 50),
+                percentile(seconds, 90),
+                percentile(seconds, 99),
+                seconds[-1] if seconds else None,
+                reused / (ran + reused) if ran + reused else 0.0,
+                failed / ran if ran else 0.0,
+            )
+        )
+    return stats
+
+
+def slowest_brands(
+    db: sqlite3.Connection, since: float, until: float, limit: int = 10
+) -> list[SlowBrand]:
+    """Brand runs with the most stage time, each with the stage that took longest."""
+    rows = db.execute(
+        "SELECT slug, SUM(seconds), MAX(at), run_id FROM stages"
+        " WHERE at >= ? AND at < ? AND seconds IS NOT NULL"
+        " GROUP BY run_id, slug ORDER BY SUM(seconds) DESC LIMIT ?",
+        (since, until, limit),
+    ).fetchall()
+    brands = []
+    for slug, total, at, run_id in rows:
+        (stage,) = db.execute(
+            "SELECT stage FROM stages WHERE run_id = ? AND slug = ? AND seconds IS NOT NULL"
+            " ORDER BY seconds DESC LIMIT 1",
+            (run_id, slug),
+        ).fetchone()
+        brands.append(SlowBrand(slug, total, stage, at))
+    return brands
+
+
+def regressions(
+    db: sqlite3.Connection, window: float, now: float | None = None
+) -> list[Regression]:
+    """Each stage's median in the last window against the window before it."""
+    now = time.time() if now is None else now
+    before = {s.stage: s.p50 for s in stage_stats(db, now - 2 * window, now - window)}
+    found = []
+    for s in stage_stats(db, now - window, math.inf):
+        previous = before.get(s.stage)
+        if s.p50 is not None and previous is not None:
+            found.append(Regression(s.stage, previous, s.p50))
+    return found
+
+
+def ai_fallback_rate(db: sqlite3.Connection, since: float, until: float) -> float | None:
+    """Share of AI palette requests that fell back to the deterministic palette."""
+    requests, fallbacks = db.execute(
+        "SELECT SUM(ai_requests), SUM(ai_fallbacks) FROM runs WHERE started >= ? AND started < ?",
+        (since, until),
+    ).fetchone()
+    return fallbacks / requests if requests else None
+
+
+def runs_between(db: sqlite3.Connection, since: float, until: float) -> list[tuple[str, int]]:
+    """(command, count) of runs started in the window."""
+    return db.execute(
+        "SELECT command, COUNT(*) FROM runs WHERE started >= ? AND started < ? GROUP BY command",
+        (since, until),
+    ).fetchall()
@@ -0,0 +1,282 @@
+"""Bulk ingest - stream brand inputs from CSV/JSONL files with chunked validation.
+
+Rows are read lazily and validated a chunk at a time through one TypeAdapter
+over a list of BrandInput, so memory depends on the chunk size, not the file
+size; only the slugs seen so far are kept, to detect duplicates. Rows
+that fail validation or repeat a slug become RowErrors instead of exceptions,
+and can be collected in a separate error report.
+
+CSV headers are matched loosely ("Contact Email" -> contact_email), and
+spreadsheet exports are handled: a UTF-8 BOM, cp1252 encoding and ';' or tab
+delimiters are detected from the start of the file.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import re
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
+from pathlib import Path
+from types import TracebackType
+from typing import IO, Annotated, Any, NamedTuple
+
+from pydantic import TypeAdapter, ValidationError, ValidatorFunctionWrapHandler, WrapValidator
+
+from thenine.core.brand import BrandInput, slugify
+
+DEFAULT_CHUNK_SIZE = 1000
+
+_SNIFF_BYTES = 64 * 1024
+_DELIMITERS = (",", ";", "\t")
+_HEADER_SEPARATORS = re.compile(r"[\s.\-]+")
+
+
+class _Invalid(NamedTuple):
+    errors: list[Any]
+
+
+def _keep_error(value: Any, handler: ValidatorFunctionWrapHandler) -> BrandInput | _Invalid:
+    try:
+        model: BrandInput = handler(value)
+    except ValidationError as e:
+        # Keep plain error dicts only: the exception's context holds validator
+        # tracebacks whose frames reach the chunk, in a cycle gc can't collect
+        return _Invalid(e.errors(include_url=False, include_context=False))
+    return model
+
+
+# One pass per chunk: an invalid row becomes _Invalid instead of failing the whole list
+_ADAPTER = TypeAdapter(list[Annotated[BrandInput, WrapValidator(_keep_error)]])
+
+
+class RowError(NamedTuple):
+    """Why one input row was rejected. line is the file line the row ends on."""
+
+    line: int
+    field: str
+    message: str
+    value: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return self._asdict()
+
+
+Row = tuple[int, dict[str, Any]]
+
+
+def _column(header: str) -> str:
+    return _HEADER_SEPARATORS.sub("_", header.strip().lower()).strip("_")
+
+
+def _with_contact_defaults(data: dict[str, Any], contact: dict[str, Any]) -> dict[str, Any]:
+    # As with `thenine generate`: contact name defaults to the brand, website to the domain
+    contact.setdefault("name", data.get("name", ""))
+    contact.setdefault("website", data.get("domain", ""))
+    data["contact"] = contact
+    return data
+
+
+def _nest(row: dict[str, Any]) -> dict[str, Any]:
+    """Turn a flat JSON row into BrandInput data; contact_* keys join the contact.
+
+    Blank values are dropped so model defaults apply.
+    """
+    data: dict[str, Any] = {
+        key: value.strip() if isinstance(value, str) else value
+        for key, value in row.items()
+        if key and value is not None
+    }
+    data = {key: value for key, value in data.items() if value != ""}
+    contact = dict(data.pop("contact", None) or {})
+    for key in [k for k in data if k.startswith("contact_")]:
+        contact[key.removeprefix("contact_")] = data.pop(key)
+    return _with_contact_defaults(data, contact)
+
+
+def _csv_nester(headers: list[str]) -> Callable[[list[str]], dict[str, Any] | None]:
+    """Like _nest, but with the column layout worked out once per file.
+
+    The returned function gives None for a row with only blank cells.
+    """
+    top = [(i, h) for i, h in enumerate(headers) if h and not h.startswith("contact_")]
+    sub = [
+        (i, h.removeprefix("contact_")) for i, h in enumerate(headers) if h.startswith("contact_")
+    ]
+
+    def nest(cells: list[str]) -> dict[str, Any] | None:
+        n = len(cells)
+        data = {h: v for i, h in top if i < n and (v := cells[i].strip())}
+        contact = {h: v for i, h in sub if i < n and (v := cells[i].strip())}
+        if not data and not contact:
+            return None
+        return _with_contact_defaults(data, contact)
+
+    return nest
+
+
+def _detect_encoding(head: bytes) -> str:
+    try:
+        head.decode("utf-8")
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the sample boundary is still UTF-8
+        if e.start < len(head) - 3:
+            return "cp1252"
+    return "utf-8-sig"
+
+
+def _csv_rows(fh: IO[str]) -> Iterator[Row | RowError]:
+    header_line = fh.readline()
+    if not header_line:
+        return
+    delimiter = max(_DELIMITERS, key=header_line.count)
+    headers = [_column(h) for h in next(csv.reader([header_line], delimiter=delimiter))]
+    nest = _csv_nester(headers)
+    reader = csv.reader(fh, delimiter=delimiter)
+    for cells in reader:
+        line = reader.line_num + 1  # the header was read separately
+        if len(cells) > len(headers) and any(cell.strip() for cell in cells[len(headers):]):
+            yield RowError(line, "", f"Row has {len(cells)} cells but only {len(headers)} columns")
+            continue
+        data = nest(cells)
+        if data is not None:
+            yield line, data
+
+
+def _jsonl_rows(fh: IO[str]) -> Iterator[Row | RowError]:
+    for line, text in enumerate(fh, 1):
+        if not text.strip():
+            continue
+        try:
+            row = json.loads(text)
+        except ValueError as e:
+            yield RowError(line, "", f"Invalid JSON: {e}")
+            continue
+        if not isinstance(row, dict):
+            yield RowError(line, "", "Expected a JSON object")
+            continue
+        yield line, _nest({_column(k): v for k, v in row.items()})
+
+
+def read_rows(path: Path, encoding: str | None = None) -> Iterator[Row | RowError]:
+    """Stream (line, data) pairs from a .csv/.tsv/.txt or .jsonl/.ndjson file.
+
+    encoding=None detects UTF-8 (with or without BOM) or cp1252 for CSV;
+    JSONL is always UTF-8.
+    """
+    suffix = path.suffix.lower()
+    if suffix in (".jsonl", ".ndjson"):
+        with path.open(encoding="utf-8-sig") as fh:
+            yield from _jsonl_rows(fh)
+    elif suffix in (".csv", ".tsv", ".txt"):
+        if encoding is None:
+            with path.open("rb") as raw:
+                encoding = _detect_encoding(raw.read(_SNIFF_BYTES))
+        with path.open(encoding=encoding, newline="") as fh:
+            yield from _csv_rows(fh)
+    else:
+        raise ValueError(f"Unsupported input file type {suffix!r}: use .csv or .jsonl")
+
+
+def _row_errors(line: int, invalid: _Invalid) -> Iterator[RowError]:
+    for detail in invalid.errors:
+        field = ".".join(str(part) for part in detail["loc"])
+        value = detail.get("input")
+        shown = "" if isinstance(value, dict) else str(value)[:100]
+        yield RowError(line, field, detail["msg"], shown)
+
+
+def _validate_chunk(rows: list[Row]) -> Iterator[tuple[int, BrandInput] | RowError]:
+    models = _ADAPTER.validate_python([data for _, data in rows])
+    for (line, _), model in zip(rows, models, strict=True):
+        if isinstance(model, _Invalid):
+            yield from _row_errors(line, model)
+        else:
+            yield line, model
+
+
+def validate_rows(
+    rows: Iterable[Row | RowError], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[tuple[int, BrandInput] | RowError]:
+    """Validate rows chunk_size at a time, in input order; earlier RowErrors pass through."""
+    it = iter(rows)
+    while chunk := list(islice(it, chunk_size)):
+        valid: list[Row] = []
+        for item in chunk:
+            if isinstance(item, RowError):
+                yield from _validate_chunk(valid) if valid else ()
+                valid = []
+                yield item
+            else:
+                valid.append(item)
+        if valid:
+            yield from _validate_chunk(valid)
+
+
+def ingest(
+    path: Path,
+    on_error: Callable[[RowError], None] | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    encoding: str | None = None,
+) -> Iterator[BrandInput]:
+    """Stream valid, uniquely-slugged brand inputs from path.
+
+    Every rejected row is passed to on_error. A row whose slug was already
+    seen is rejected and the first one kept.
+    """
+    report = on_error or (lambda error: None)
+    first_seen: dict[str, int] = {}
+    for item in validate_rows(read_rows(path, encoding), chunk_size):
+        if isinstance(item, RowError):
+            report(item)
+            continue
+        line, brand = item
+        slug = slugify(brand.name)
+        if not slug:
+            report(RowError(line, "name", "Name has no letters or digits for a slug", brand.name))
+        elif slug in first_seen:
+            message = f"Duplicate slug {slug!r} (first on line {first_seen[slug]})"
+            report(RowError(line, "name", message, brand.name))
+        else:
+            first_seen[slug] = line
+            yield brand
+
+
+class ErrorReport:
+    """Collects RowErrors into a .jsonl or .csv file, created on the first error."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.count = 0
+        self._fh: IO[str] | None = None
+        self._csv: Any = None
+
+    def __call__(self, error: RowError) -> None:
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("w", encoding="utf-8", newline="")
+            if self.path.suffix.lower() == ".csv":
+                self._csv = csv.writer(self._fh)
+                self._csv.writerow(RowError._fields)
+        if self._csv is not None:
+            self._csv.writerow(error)
+        else:
+            self._fh.write(json.dumps(error.to_dict(), ensure_ascii=False) + "\n")
+        self.count += 1
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def __enter__(self) -> ErrorReport:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
@@ -0,0 +1,72 @@
+"""Flyweight pool for frozen brand models - equal colors, fonts and palettes share one instance.
+
+Batch runs build the same neutral BrandColors, the same JetBrains Mono FontSpec
+and often whole identical BrandTypography objects for thousands of brands. The
+pool maps a model's type and field values to a single live instance; entries
+are weak, so instances no brand holds any more are dropped from the pool.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import Any
+
+from pydantic import BaseModel
+
+from thenine.core.brand import BrandPalette, BrandTypography
+
+_pool: weakref.WeakValueDictionary[tuple[Any, ...], BaseModel] = weakref.WeakValueDictionary()
+_lock = threading.Lock()
+
+
+def intern_model[M: BaseModel](model: M) -> M:
+    """Return the pooled instance equal to model, adding model if there is none.
+
+    Only use with frozen models whose field values are hashable.
+    """
+    key = (type(model), *model.__dict__.values())
+    with _lock:
+        existing = _pool.get(key)
+        if existing is not None:
+            return existing  # type: ignore[return-value]
+        _pool[key] = model
+        return model
+
+
+def intern_palette(palette: BrandPalette) -> BrandPalette:
+    """Intern a palette and each of its colors."""
+    colors = {
+        role: intern_model(getattr(palette, role))
+        for role in ("primary", "secondary", "accent", "neutral_light", "neutral_dark")
+    }
+    if any(colors[role] is not getattr(palette, role) for role in colors):
+        palette = palette.model_copy(update=colors)
+    return intern_model(palette)
+
+
+def intern_typography(typography: BrandTypography) -> BrandTypography:
+    """Intern a typography system and each of its FontSpecs."""
+    fonts = {role: intern_model(getattr(typography, role)) for role in ("heading", "body", "mono")}
+    if any(fonts[role] is not getattr(typography, role) for role in fonts):
+        typography = typography.model_copy(update=fonts)
+    return intern_model(typography)
+
+
+def pool_size() -> int:
+    """Number of distinct live instances in the pool."""
+    return len(_pool)
+
+
+def pool_counts() -> dict[str, int]:
+    """Live pooled instances per model type, e.g. {"BrandColor": 120}."""
+    counts: dict[str, int] = {}
+    for key in list(_pool.keys()):
+        name = key[0].__name__
+        counts[name] = counts.get(name, 0) + 1
+    return counts
+
+
+def clear_pool() -> None:
+    with _lock:
+        _pool.clear()
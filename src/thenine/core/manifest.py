@@ -0,0 +1,157 @@
+"""Output manifest - content hashes of generated files for write-if-changed exports."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import stat
+import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import IO, Any
+
+MANIFEST_NAME = ".thenine-manifest.json"
+
+
+def _read_umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+# Read once at import: os.umask() can only be queried by setting it, which
+# would race with other threads creating files
+_UMASK = _read_umask()
+
+
+def _target_mode(path: Path) -> int:
+    """path's permission bits, or what open() would give a new file."""
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+
+@contextmanager
+def open_atomic(path: Path, mode: str = "wb", encoding: str | None = None) -> Iterator[IO[Any]]:
+    """Open a temp file next to path that replaces path only if the block succeeds.
+
+    The result keeps path's permissions, or gets the umask's defaults when new,
+    rather than mkstemp's owner-only 0600.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, mode, encoding=encoding) as fh:
+            yield fh
+        os.chmod(tmp_name, _target_mode(path))
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    """Write bytes to path via a temp file + rename so readers never see partial files."""
+    with open_atomic(path) as fh:
+        fh.write(content)
+
+
+class OutputManifest:
+    """Tracks the sha256, size and mtime of every file written into an output directory.
+
+    A file is rewritten only when its rendered content differs from the manifest
+    entry, or when the file on disk no longer matches what was recorded. write()
+    is safe to call from several threads for different files.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._path = root / MANIFEST_NAME
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._fingerprints: dict[str, str] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.written: list[str] = []
+        self.skipped: list[str] = []
+
+        if self._path.exists():
+            try:
+                data = json.loads(self._path.read_text(encoding="utf-8"))
+                self._entries = data.get("files", {})
+                self._fingerprints = data.get("fingerprints", {})
+            except (OSError, ValueError):
+                self._entries = {}
+
+    def is_current(self, name: str, digest: str) -> bool:
+        """Check whether the file `name` already holds content with this digest."""
+        entry = self._entries.get(name)
+        if not entry or entry.get("sha256") != digest:
+            return False
+
+        file_path = self.root / name
+        try:
+            stat = file_path.stat()
+        except FileNotFoundError:
+            return False
+
+        if stat.st_size == entry.get("size") and stat.st_mtime_ns == entry.get("mtime_ns"):
+            return True
+        # Touched since we wrote it - trust the content, not the timestamp
+        return hashlib.sha256(file_path.read_bytes()).hexdigest() == digest
+
+    def write(self, name: str, content: str | bytes) -> Path:
+        """Write content to root/name unless it is unchanged. Returns the file path."""
+        data = content.encode("utf-8") if isinstance(content, str) else content
+        digest = hashlib.sha256(data).hexdigest()
+        file_path = self.root / name
+
+        if self.is_current(name, digest):
+            with self._lock:
+                self.skipped.append(name)
+            return file_path
+
+        write_atomic(file_path, data)
+        stat = file_path.stat()
+        with self._lock:
+            self._entries[name] = {
+                "sha256": digest,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+            self._dirty = True
+            self.written.append(name)
+        return file_path
+
+    def discard(self, name: str) -> None:
+        """Forget the entries for name and any file under it (the files are not touched)."""
+        prefix = name.rstrip("/") + "/"
+        with self._lock:
+            for key in [k for k in self._entries if k == name or k.startswith(prefix)]:
+                del self._entries[key]
+                self._dirty = True
+
+    @property
+    def fingerprints(self) -> dict[str, str]:
+        """Stage fingerprints recorded for the outputs in this directory."""
+        return dict(self._fingerprints)
+
+    def record_fingerprints(self, fingerprints: dict[str, str]) -> None:
+        with self._lock:
+            merged = {**self._fingerprints, **fingerprints}
+            if merged != self._fingerprints:
+                self._fingerprints = merged
+                self._dirty = True
+
+    def save(self) -> None:
+        """Persist the manifest if any entry changed."""
+        if not self._dirty:
+            return
+        payload: dict[str, Any] = {"files": dict(sorted(self._entries.items()))}
+        if self._fingerprints:
+            payload["fingerprints"] = dict(sorted(self._fingerprints.items()))
+        write_atomic(self._path, json.dumps(payload, indent=2).encode("utf-8"))
+        self._dirty = False
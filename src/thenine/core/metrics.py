@@ -0,0 +1,317 @@
+"""Metrics - counters and latency histograms, exposed in Prometheus text format.
+
+The process-wide REGISTRY holds the pipeline's instruments: stage latency by
+stage and outcome, stage cache hits and misses (resume reusing an unchanged
+stage), and AI palette requests that fell back to the deterministic palette.
+Lookups served by lru_caches are read from cache_info() when the registry is
+rendered, so the palette and token hot paths pay nothing for them.
+
+Worker processes start with an empty registry; WorkerPool ships what each job
+recorded (cache lookups included) back to the parent and merges it there.
+`thenine serve` exposes the result on GET /metrics and `thenine batch
+--metrics-file` writes it for the node_exporter textfile collector.
+"""
+
+from __future__ import annotations
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from thenine.core.manifest import write_atomic
+
+if TYPE_CHECKING:
+    from functools import _lru_cache_wrapper
+
+# Upper bounds, in seconds, of the latency histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _samples(self) -> Iterator[str]: ...
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+    def drain(self) -> dict[tuple[str, ...], Any]:
+        """Take the values recorded so far, leaving the metric empty."""
+        with self._lock:
+            values, self._values = self._values, {}
+        return values
+
+
+class Counter(_Metric):
+    """A total that only goes up, one per combination of label values."""
+
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def value(self, *labels: str) -> float:
+        return float(self._values.get(labels, 0.0))
+
+    def merge(self, values: dict[tuple[str, ...], float]) -> None:
+        for labels, amount in values.items():
+            self.inc(*labels, amount=amount)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labels, labels)} {_number(value)}"
+
+
+class Histogram(_Metric):
+    """Observations counted into fixed buckets, plus their count and sum."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # Count per bucket (the last one is +Inf), then the sum
+                state = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            state[index] += 1
+            state[-1] += value
+
+    def count(self, *labels: str) -> int:
+        state = self._values.get(labels)
+        return int(sum(state[:-1])) if state else 0
+
+    def merge(self, values: dict[tuple[str, ...], list[float]]) -> None:
+        with self._lock:
+            for labels, other in values.items():
+                state = self._values.setdefault(labels, [0] * (len(self.buckets) + 1) + [0.0])
+                for i, amount in enumerate(other):
+                    state[i] += amount
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            values = sorted((labels, list(state)) for labels, state in self._values.items())
+        for labels, state in values:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), state, strict=False):
+                cumulative += count
+                le = f'le="{_number(bound)}"'
+                yield f"{self.name}_bucket{_labels(self.labels, labels, le)} {cumulative}"
+            yield f"{self.name}_sum{_labels(self.labels, labels)} {_number(state[-1])}"
+            yield f"{self.name}_count{_labels(self.labels, labels)} {cumulative}"
+
+
+class CacheCounter(Counter):
+    """One cache_info() field (hits or misses) of every tracked lru_cache, by cache name.
+
+    Read at render time, so cached calls pay nothing. drain() hands out the
+    increase since the last drain, which a worker sends back; the parent adds
+    what its workers sent to its own caches' counts.
+    """
+
+    def __init__(self, name: str, help: str, field: str) -> None:
+        super().__init__(name, help, ("cache",))
+        self.field = field
+        self._drained: dict[tuple[str, ...], float] = {}
+
+    def _info(self) -> dict[tuple[str, ...], float]:
+        return {
+            (name,): float(getattr(fn.cache_info(), self.field)) for name, fn in _caches.items()
+        }
+
+    def value(self, *labels: str) -> float:
+        return self._info().get(labels, 0.0) + super().value(*labels)
+
+    def drain(self) -> dict[tuple[str, ...], Any]:
+        info = self._info()
+        with self._lock:
+            values, self._values = self._values, {}
+            drained, self._drained = self._drained, info
+        for labels, total in info.items():
+            previous = drained.get(labels, 0.0)
+            # cache_clear() starts the count over
+            delta = total - previous if total >= previous else total
+            if delta:
+                values[labels] = values.get(labels, 0.0) + delta
+        return values
+
+    def _samples(self) -> Iterator[str]:
+        info = self._info()
+        with self._lock:
+            merged = dict(self._values)
+        for labels in sorted(info.keys() | merged.keys()):
+            value = info.get(labels, 0.0) + merged.get(labels, 0.0)
+            yield f"{self.name}{_labels(self.labels, labels)} {_number(value)}"
+
+
+class Callback(_Metric):
+    """Values read from collect() at render time: label values -> value."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...],
+        collect: Callable[[], dict[tuple[str, ...], float]],
+        kind: str = "gauge",
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.kind = kind
+        self._collect = collect
+
+    def _samples(self) -> Iterator[str]:
+        for labels, value in sorted(self._collect().items()):
+            yield f"{self.name}{_labels(self.labels, labels)} {_number(value)}"
+
+
+class Registry:
+    """A named set of metrics, rendered together."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _add[M: _Metric](self, metric: M) -> M:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._add(Counter(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._add(Histogram(name, help, labels, buckets))
+
+    def cache_counter(self, name: str, help: str, field: str) -> CacheCounter:
+        return self._add(CacheCounter(name, help, field))
+
+    def callback(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...],
+        collect: Callable[[], dict[tuple[str, ...], float]],
+        kind: str = "gauge",
+    ) -> Callback:
+        return self._add(Callback(name, help, labels, collect, kind))
+
+    def render(self) -> str:
+        """The registry in Prometheus text exposition format."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(metric.render() + "\n" for metric in metrics)
+
+    def write_textfile(self, path: Path) -> Path:
+        """Write render() to path atomically, for the node_exporter textfile collector."""
+        write_atomic(path, self.render().encode("utf-8"))
+        return path
+
+    def drain(self) -> dict[str, dict[tuple[str, ...], Any]]:
+        """Take every counter and histogram value recorded so far (for a worker to send)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        drained = {}
+        for metric in metrics:
+            if isinstance(metric, (Counter, Histogram)):
+                values = metric.drain()
+                if values:
+                    drained[metric.name] = values
+        return drained
+
+    def merge(self, drained: dict[str, dict[tuple[str, ...], Any]]) -> None:
+        """Add values drained from another process's registry."""
+        for name, values in drained.items():
+            metric = self._metrics.get(name)
+            if isinstance(metric, (Counter, Histogram)):
+                metric.merge(values)
+
+
+REGISTRY = Registry()
+
+STAGE_SECONDS = REGISTRY.histogram(
+    "thenine_stage_duration_seconds",
+    "Wall time of pipeline stages that ran, by outcome (done or failed).",
+    ("stage", "status"),
+)
+STAGE_CACHE = REGISTRY.counter(
+    "thenine_stage_cache_total",
+    "Stages reused from the previous build (hit) or rebuilt (miss).",
+    ("stage", "result"),
+)
+AI_REQUESTS = REGISTRY.counter(
+    "thenine_ai_requests_total",
+    "AI generation requests, by outcome (ok, or fallback to the deterministic generator).",
+    ("component", "outcome"),
+)
+
+CACHE_HITS = REGISTRY.cache_counter(
+    "thenine_cache_hits_total",
+    "Lookups answered from an in-process cache, in this process or its workers.",
+    "hits",
+)
+CACHE_MISSES = REGISTRY.cache_counter(
+    "thenine_cache_misses_total",
+    "Lookups an in-process cache had to compute, in this process or its workers.",
+    "misses",
+)
+
+_caches: dict[str, _lru_cache_wrapper[Any]] = {}
+
+
+def track_cache(name: str, cached: _lru_cache_wrapper[Any]) -> None:
+    """Report an lru_cache-wrapped function's hits and misses as thenine_cache_*_total."""
+    _caches[name] = cached
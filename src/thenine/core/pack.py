@@ -0,0 +1,125 @@
+"""Multi-brand token pack - many BrandTokens in one deduplicated CSS + JSON artifact."""
+
+from __future__ import annotations
+
+import json
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any
+
+from thenine.core.brand import BrandTokens
+from thenine.core.exporters import iter_tokens
+from thenine.core.exporters.web import css_declaration
+from thenine.core.manifest import OutputManifest
+
+PACK_CSS_FILENAME = "tokens-pack.css"
+PACK_JSON_FILENAME = "tokens-pack.json"
+PACK_VERSION = 1
+
+
+def _css_string(value: str) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def collect_declarations(
+    brands: Mapping[str, BrandTokens] | Iterable[tuple[str, BrandTokens]],
+) -> dict[str, dict[str, str]]:
+    """Return slug -> {custom property: value}, as tokens.css would declare them."""
+    items = brands.items() if isinstance(brands, Mapping) else brands
+    declared: dict[str, dict[str, str]] = {}
+    for slug, tokens in items:
+        if slug in declared:
+            raise ValueError(f"Duplicate brand slug in pack: {slug!r}")
+        properties: dict[str, str] = {}
+        for entry in iter_tokens(tokens):
+            declaration = css_declaration(entry)
+            if declaration is not None:
+                properties[declaration[0]] = declaration[1]
+        declared[slug] = properties
+    return declared
+
+
+def split_shared(
+    declared: Mapping[str, Mapping[str, str]],
+) -> tuple[dict[str, str], dict[str, dict[str, str]]]:
+    """Split declarations into shared :root values and per-brand overrides.
+
+    A property goes to :root when every brand declares it, using its most common
+    value; brands only keep properties whose value differs from :root.
+    """
+    counts: dict[str, Counter[str]] = {}
+    for properties in declared.values():
+        for name, value in properties.items():
+            counts.setdefault(name, Counter())[value] += 1
+
+    total = len(declared)
+    shared = {
+        name: values.most_common(1)[0][0]
+        for name, values in counts.items()
+        if sum(values.values()) == total
+    }
+    overrides = {
+        slug: {name: value for name, value in properties.items() if shared.get(name) != value}
+        for slug, properties in declared.items()
+    }
+    return shared, overrides
+
+
+def render_pack_css(shared: Mapping[str, str], overrides: Mapping[str, Mapping[str, str]]) -> str:
+    lines = [":root {"]
+    lines.extend(f"  {name}: {value};" for name, value in shared.items())
+    lines.append("}")
+    for slug, properties in overrides.items():
+        if not properties:
+            continue
+        lines.append("")
+        lines.append(f"[data-brand={_css_string(slug)}] {{")
+        lines.extend(f"  {name}: {value};" for name, value in properties.items())
+        lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def render_pack_index(
+    shared: Mapping[str, str], overrides: Mapping[str, Mapping[str, str]]
+) -> str:
+    """Render the JSON index; every distinct value is stored once in "values"."""
+    values: dict[str, int] = {}
+
+    def ref(value: str) -> int:
+        return values.setdefault(value, len(values))
+
+    index: dict[str, Any] = {
+        "version": PACK_VERSION,
+        "shared": {name: ref(value) for name, value in shared.items()},
+        "brands": {
+            slug: {name: ref(value) for name, value in properties.items()}
+            for slug, properties in overrides.items()
+        },
+    }
+    index["values"] = list(values)
+    return json.dumps(index, separators=(",", ":"), ensure_ascii=False)
+
+
+def load_pack_brand(index: Mapping[str, Any], slug: str) -> dict[str, str]:
+    """Return the full custom property set of one brand from a parsed pack index."""
+    if slug not in index["brands"]:
+        raise KeyError(slug)
+    values = index["values"]
+    merged = {name: values[i] for name, i in index["shared"].items()}
+    merged.update({name: values[i] for name, i in index["brands"][slug].items()})
+    return merged
+
+
+def export_pack(
+    brands: Mapping[str, BrandTokens] | Iterable[tuple[str, BrandTokens]], output_path: Path
+) -> dict[str, Path]:
+    """Export a multi-brand pack: tokens-pack.css with [data-brand] overrides and a JSON index."""
+    shared, overrides = split_shared(collect_declarations(brands))
+    manifest = OutputManifest(output_path)
+    paths = {
+        "css": manifest.write(PACK_CSS_FILENAME, render_pack_css(shared, overrides)),
+        "json": manifest.write(PACK_JSON_FILENAME, render_pack_index(shared, overrides)),
+    }
+    manifest.save()
+    return paths
@@ -5,12 +5,16 @@ from __future__ import annotations
 import hashlib
 import json
 import os
+from functools import lru_cache
 from typing import Any
 
 import wcag_contrast_ratio as contrast
 from coloraide import Color
 
 from thenine.core.brand import BrandColor, BrandPalette
+from thenine.core.interning import intern_palette
+from thenine.core.metrics import AI_REQUESTS, track_cache
+from thenine.core.profiling import span
 
 # Industry -> base hue mapping for deterministic fallback
 INDUSTRY_HUES: dict[str, float] = {
@@ -27,6 +31,21 @@ INDUSTRY_HUES: dict[str, float] = {
     "other": 200.0,
 }
 
+# Tonal scale step -> OKLCH lightness
+TONAL_STEPS: dict[int, float] = {
+    50: 0.97,
+    100: 0.93,
+    200: 0.87,
+    300: 0.78,
+    400: 0.68,
+    500: 0.58,
+    600: 0.50,
+    700: 0.42,
+    800: 0.34,
+    900: 0.26,
+    950: 0.20,
+}
+
 # Mood -> chroma + lightness adjustments
 MOOD_ADJUSTMENTS: dict[str, dict[str, float]] = {
     "modern": {"chroma": 0.14, "lightness_offset": 0.0},
@@ -54,14 +73,20 @@ class PaletteGenerator:
         """Generate a 5-color brand palette.
 
         Tries AI generation first, falls back to deterministic algorithm.
+        Identical palettes and colors are shared via the interning pool.
         """
         if use_ai and self._api_key:
             try:
-                return self._generate_with_ai(industry, mood, name)
+                with span("ai_request"):
+                    palette = intern_palette(self._generate_with_ai(industry, mood, name))
             except Exception:
-                pass
+                AI_REQUESTS.inc("palette", "fallback")
+            else:
+                AI_REQUESTS.inc("palette", "ok")
+                return palette
 
-        return self._generate_deterministic(industry, mood, name)
+        with span("deterministic_palette"):
+            return intern_palette(self._generate_deterministic(industry, mood, name))
 
     def _generate_with_ai(self, industry: str, mood: str, name: str) -> BrandPalette:
         """Generate palette using Claude API."""
@@ -195,13 +220,9 @@ def _create_color(
     chroma = max(0.0, min(0.4, chroma))
     hue = hue % 360
 
-    color = Color("oklch", [lightness, chroma, hue])
-    srgb = color.convert("srgb").fit("srgb")
-    hex_val = srgb.to_string(hex=True)
-
     return BrandColor(
         name=name,
-        hex=hex_val,
+        hex=_oklch_to_hex(lightness, chroma, hue),
         oklch_l=round(lightness, 3),
         oklch_c=round(chroma, 3),
         oklch_h=round(hue, 1),
@@ -209,6 +230,31 @@ def _create_color(
     )
 
 
+def tonal_scale(color: BrandColor) -> dict[int, BrandColor]:
+    """A 50-950 tonal scale at the color's hue, tapering chroma toward the ends."""
+    scale = {}
+    for step, lightness in TONAL_STEPS.items():
+        taper = max(0.15, 1.0 - (abs(lightness - 0.55) / 0.45) ** 1.5)
+        scale[step] = _create_color(
+            f"{color.name} {step}", lightness, color.oklch_c * taper, color.oklch_h, color.purpose
+        )
+    return scale
+
+
+@lru_cache(maxsize=32768)
+def _oklch_to_hex(lightness: float, chroma: float, hue: float) -> str:
+    """Gamut-map an OKLCH color to sRGB hex.
+
+    Cached: deterministic palettes reuse a small set of hue/chroma/lightness
+    combinations, and the coloraide conversion dominates palette generation.
+    """
+    color = Color("oklch", [lightness, chroma, hue])
+    return color.convert("srgb").fit("srgb").to_string(hex=True)
+
+
+track_cache("oklch_to_hex", _oklch_to_hex)
+
+
 def _hex_to_oklch(hex_val: str) -> dict[str, float]:
     """Convert hex color to OKLCH values."""
     color = Color(hex_val).convert("oklch")
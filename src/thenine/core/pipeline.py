@@ -0,0 +1,468 @@
+"""Generate pipeline - brand stages as a DAG, independent stages run concurrently.
+
+    palette ----+--> tokens --> website
+                |
+    typography -+--> card_pdf
+                |
+    input ------+--> card_3d
+
+Thread stages share a thread pool (the AI call, token export and website are
+I/O bound). Process stages (WeasyPrint, build123d) hold the GIL for long
+stretches, so they run on a WorkerPool of warm, recycled processes - the
+pipeline's own, or one shared with the caller; with no process workers
+configured they fall back to the thread pool.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable, Iterable, Mapping
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from pydantic import BaseModel, Field
+
+from thenine.core.brand import BrandInput, BrandPalette, BrandTokens, BrandTypography
+from thenine.core.fingerprint import STAGE_VERSIONS, input_digests, package_fingerprints
+from thenine.core.manifest import OutputManifest
+from thenine.core.metrics import STAGE_CACHE, STAGE_SECONDS
+from thenine.core.profiling import Profiled, Profiler, run_profiled, span
+from thenine.core.snapshot import PackageSnapshot, SnapshotRecorder, StageRecord
+from thenine.core.workers import WorkerPool, env_int
+
+# Process workers for WeasyPrint/build123d stages; 0 runs them on threads
+DEFAULT_PROCESSES = env_int("THENINE_PROCESSES", 2)
+DEFAULT_THREADS = 4
+
+STAGE_LABELS = {
+    "palette": "Generating color palette",
+    "typography": "Selecting typography",
+    "tokens": "Generating design tokens",
+    "card_pdf": "Creating PDF business card",
+    "card_3d": "Creating 3D business card",
+    "website": "Generating website",
+}
+
+
+class PipelineOptions(BaseModel, frozen=True):
+    use_ai: bool = True
+    skip_pdf: bool = False
+    skip_3d: bool = False
+    skip_website: bool = False
+    formats: tuple[str, ...] = ("json", "css", "tailwind")
+    tonal_scales: bool = False
+
+
+class StageContext(BaseModel, frozen=True):
+    """What every stage function receives besides its dependencies' results."""
+
+    input: BrandInput
+    output_dir: Path
+    options: PipelineOptions = Field(default_factory=PipelineOptions)
+
+
+class Stage(NamedTuple):
+    """A pipeline node.
+
+    run(ctx, deps) gets the results of the stages named in deps. Process stage
+    functions must be importable module-level functions. inputs(ctx, deps)
+    names everything the stage's output depends on; stages without it are
+    not tracked for incremental rebuilds and always run.
+    """
+
+    name: str
+    run: Callable[[StageContext, dict[str, Any]], Any]
+    deps: tuple[str, ...] = ()
+    kind: str = "thread"
+    label: str = ""
+    inputs: Callable[[StageContext, dict[str, Any]], dict[str, Any]] | None = None
+
+
+class StageEvent(NamedTuple):
+    """Emitted when a stage starts, finishes, fails or is skipped.
+
+    "unchanged" means the stage's inputs match its last build and that
+    build's result was reused. reason says why a stage ran or was reused.
+    """
+
+    stage: str
+    status: str  # "started" | "done" | "failed" | "skipped" | "unchanged"
+    elapsed: float = 0.0
+    result: Any = None
+    error: BaseException | None = None
+    reason: str = ""
+
+
+class StageCheck(NamedTuple):
+    """A check hook's verdict on a ready stage: reuse result, or run it and why."""
+
+    fresh: bool
+    reason: str
+    result: Any = None
+
+
+class PipelineResult(NamedTuple):
+    results: dict[str, Any]
+    errors: dict[str, BaseException]
+    skipped: list[str]
+    timings: dict[str, float]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+class PipelineError(ValueError):
+    """The stage graph is invalid (unknown dependency or cycle)."""
+
+
+def _run_palette(ctx: StageContext, deps: dict[str, Any]) -> BrandPalette:
+    from thenine.core.palette import PaletteGenerator
+
+    brand = ctx.input
+    return PaletteGenerator().generate(
+        brand.industry, brand.mood, brand.name, use_ai=ctx.options.use_ai
+    )
+
+
+def _run_typography(ctx: StageContext, deps: dict[str, Any]) -> BrandTypography:
+    from thenine.core.typography import TypographySelector
+
+    brand = ctx.input
+    return TypographySelector().select(brand.industry, brand.mood, brand.name)
+
+
+def _run_tokens(ctx: StageContext, deps: dict[str, Any]) -> tuple[BrandTokens, Any]:
+    from thenine.core.tokens import create_tokens, export_all
+
+    with span("create_tokens"):
+        tokens = create_tokens(
+            deps["palette"], deps["typography"], tonal_scales=ctx.options.tonal_scales
+        )
+    with span("export_tokens"):
+        formats = list(ctx.options.formats)
+        return tokens, export_all(tokens, ctx.output_dir, formats, slug=ctx.input.slug)
+
+
+def _run_card_pdf(ctx: StageContext, deps: dict[str, Any]) -> Path:
+    from thenine.generators.card_pdf import PDFCardGenerator
+
+    return PDFCardGenerator().generate(
+        ctx.input.name, ctx.input.contact, deps["palette"], deps["typography"], ctx.output_dir
+    )
+
+
+def _run_card_3d(ctx: StageContext, deps: dict[str, Any]) -> dict[str, Path]:
+    from thenine.generators.card_3d import ThreeDCardGenerator
+
+    return ThreeDCardGenerator().generate(ctx.input.name, ctx.input.contact, ctx.output_dir)
+
+
+def _run_website(ctx: StageContext, deps: dict[str, Any]) -> Path:
+    from thenine.generators.website import WebsiteGenerator
+
+    tokens, _ = deps["tokens"]
+    return WebsiteGenerator().generate(
+        ctx.input, deps["palette"], deps["typography"], tokens, ctx.output_dir
+    )
+
+
+def _selection_inputs(ctx: StageContext, deps: dict[str, Any]) -> dict[str, Any]:
+    brand = ctx.input
+    return {"name": brand.name, "industry": brand.industry, "mood": brand.mood}
+
+
+def _palette_inputs(ctx: StageContext, deps: dict[str, Any]) -> dict[str, Any]:
+    return {**_selection_inputs(ctx, deps), "use_ai": ctx.options.use_ai}
+
+
+def _card_pdf_inputs(ctx: StageContext, deps: dict[str, Any]) -> dict[str, Any]:
+    return {"name": ctx.input.name, "contact": ctx.input.contact, **deps}
+
+
+def _card_3d_inputs(ctx: StageContext, deps: dict[str, Any]) -> dict[str, Any]:
+    return {"name": ctx.input.name, "contact": ctx.input.contact}
+
+
+def _website_inputs(ctx: StageContext, deps: dict[str, Any]) -> dict[str, Any]:
+    tokens, _ = deps["tokens"]
+    fields = {name: getattr(ctx.input, name) for name in BrandInput.model_fields}
+    return {
+        **fields,
+        "palette": deps["palette"],
+        "typography": deps["typography"],
+        "tokens": tokens,
+    }
+
+
+def generate_stages(options: PipelineOptions) -> list[Stage]:
+    """The stages of `thenine generate`, minus the ones options skip.
+
+    Tokens are not tracked: exporting is cheap and leaves unchanged files alone.
+    """
+    stages = [
+        Stage("palette", _run_palette, label=STAGE_LABELS["palette"], inputs=_palette_inputs),
+        Stage(
+            "typography",
+            _run_typography,
+            label=STAGE_LABELS["typography"],
+            inputs=_selection_inputs,
+        ),
+        Stage("tokens", _run_tokens, ("palette", "typography"), label=STAGE_LABELS["tokens"]),
+    ]
+    if not options.skip_pdf:
+        stages.append(
+            Stage(
+                "card_pdf",
+                _run_card_pdf,
+                ("palette", "typography"),
+                kind="process",
+                label=STAGE_LABELS["card_pdf"],
+                inputs=_card_pdf_inputs,
+            )
+        )
+    if not options.skip_3d:
+        stages.append(
+            Stage(
+                "card_3d",
+                _run_card_3d,
+                kind="process",
+                label=STAGE_LABELS["card_3d"],
+                inputs=_card_3d_inputs,
+            )
+        )
+    if not options.skip_website:
+        stages.append(
+            Stage(
+                "website",
+                _run_website,
+                ("palette", "typography", "tokens"),
+                label=STAGE_LABELS["website"],
+                inputs=_website_inputs,
+            )
+        )
+    return stages
+
+
+def check_graph(stages: Iterable[Stage]) -> list[str]:
+    """Return stage names in a valid execution order; raise PipelineError otherwise."""
+    by_name = {stage.name: stage for stage in stages}
+    for stage in by_name.values():
+        for dep in stage.deps:
+            if dep not in by_name:
+                raise PipelineError(f"Stage {stage.name!r} depends on unknown stage {dep!r}")
+
+    order: list[str] = []
+    placed: set[str] = set()
+    pending = list(by_name)
+    while pending:
+        ready = [name for name in pending if set(by_name[name].deps) <= placed]
+        if not ready:
+            raise PipelineError(f"Stage dependency cycle among: {', '.join(pending)}")
+        order.extend(ready)
+        placed.update(ready)
+        pending = [name for name in pending if name not in placed]
+    return order
+
+
+class Pipeline:
+    """Runs stages as soon as their dependencies finish.
+
+    Listeners are called from the thread that called run(), so they may
+    update the console or write snapshots without locking. A failed stage
+    skips everything that depends on it; independent stages keep going.
+
+    Pass process_pool to share warm workers across runs; otherwise each run
+    that has process stages starts max_processes workers of its own.
+    """
+
+    def __init__(
+        self,
+        stages: Iterable[Stage],
+        max_threads: int = DEFAULT_THREADS,
+        max_processes: int | None = None,
+        process_pool: Executor | None = None,
+    ) -> None:
+        self.stages = {stage.name: stage for stage in stages}
+        self.order = check_graph(self.stages.values())
+        self._max_threads = max_threads
+        self._max_processes = DEFAULT_PROCESSES if max_processes is None else max_processes
+        self._process_pool = process_pool
+
+    def run(
+        self,
+        ctx: StageContext,
+        done: Mapping[str, Any] | None = None,
+        listener: Callable[[StageEvent], None] | None = None,
+        check: Callable[[Stage, dict[str, Any]], StageCheck | None] | None = None,
+        profiler: Profiler | None = None,
+    ) -> PipelineResult:
+        """Run every stage not already in done (stage -> earlier result).
+
+        check(stage, deps), if given, is asked about each stage once its
+        dependencies are ready; a fresh verdict reuses its result instead.
+        With a profiler, every stage that runs records its spans into it.
+        """
+        notify = listener or (lambda event: None)
+        results: dict[str, Any] = {k: v for k, v in (done or {}).items() if k in self.stages}
+        errors: dict[str, BaseException] = {}
+        skipped: list[str] = []
+        timings: dict[str, float] = {}
+        pending = [name for name in self.order if name not in results]
+
+        owns_processes = self._process_pool is None and self._max_processes > 0 and any(
+            self.stages[name].kind == "process" for name in pending
+        )
+        threads = ThreadPoolExecutor(max_workers=self._max_threads, thread_name_prefix="stage")
+        processes = (
+            WorkerPool(self._max_processes)
+            if owns_processes
+            else self._process_pool
+        )
+        running: dict[Future[Any], tuple[str, float]] = {}
+
+        try:
+            while pending or running:
+                for name in list(pending):
+                    stage = self.stages[name]
+                    if any(dep in errors or dep in skipped for dep in stage.deps):
+                        pending.remove(name)
+                        skipped.append(name)
+                        notify(StageEvent(name, "skipped"))
+                    elif all(dep in results for dep in stage.deps):
+                        pending.remove(name)
+                        deps = {dep: results[dep] for dep in stage.deps}
+                        verdict = check(stage, deps) if check else None
+                        reason = verdict.reason if verdict is not None else ""
+                        if verdict is not None:
+                            STAGE_CACHE.inc(name, "hit" if verdict.fresh else "miss")
+                        if verdict is not None and verdict.fresh:
+                            results[name] = verdict.result
+                            notify(StageEvent(name, "unchanged", 0.0, results[name], reason=reason))
+                            continue
+                        pool = processes if stage.kind == "process" and processes else threads
+                        notify(StageEvent(name, "started", reason=reason))
+                        if profiler is None:
+                            future = pool.submit(stage.run, ctx, deps)
+                        else:
+                            dump, top = profiler.cprofile_path(name), profiler.memory_top
+                            future = pool.submit(run_profiled, stage.run, name, dump, top, ctx, deps)
+                        running[future] = (name, time.perf_counter())
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name, started = running.pop(future)
+                    elapsed = time.perf_counter() - started
+                    timings[name] = elapsed
+                    error = future.exception()
+                    value = future.result() if error is None else None
+                    if profiler is not None and isinstance(value, Profiled):
+                        profiler.add(name, value)
+                        value, error = value.result, value.error
+                    if error is None:
+                        results[name] = value
+                        STAGE_SECONDS.observe(elapsed, name, "done")
+                        notify(StageEvent(name, "done", elapsed, value))
+                    else:
+                        errors[name] = error
+                        STAGE_SECONDS.observe(elapsed, name, "failed")
+                        notify(StageEvent(name, "failed", elapsed, error=error))
+        finally:
+            threads.shutdown(wait=True, cancel_futures=True)
+            if owns_processes and processes is not None:
+                processes.shutdown(wait=True, cancel_futures=True)
+
+        return PipelineResult(results, errors, skipped, timings)
+
+
+# Generate stages whose failure still leaves a usable brand package
+OPTIONAL_STAGES = ("card_3d", "website")
+
+
+def missing_gtk(stage: str, error: BaseException) -> bool:
+    """Whether the PDF card failed only because WeasyPrint's GTK libraries are missing."""
+    text = str(error)
+    return (
+        stage == "card_pdf"
+        and isinstance(error, OSError)
+        and ("libgobject" in text or "GTK" in text)
+    )
+
+
+def is_fatal(stage: str, error: BaseException) -> bool:
+    """Whether a failed stage fails the brand; optional stages and a GTK-less PDF don't."""
+    return stage not in OPTIONAL_STAGES and not missing_gtk(stage, error)
+
+
+class BrandRun(NamedTuple):
+    result: PipelineResult
+    snapshot: PackageSnapshot
+
+    @property
+    def ok(self) -> bool:
+        """No stage failed that the brand needs (see is_fatal)."""
+        return not any(is_fatal(stage, e) for stage, e in self.result.errors.items())
+
+
+# STAGE_VERSIONS entry for pipeline stages named differently there
+_VERSION_KEYS = {"card_pdf": "card"}
+
+
+def stage_record(stage: Stage, ctx: StageContext, deps: dict[str, Any]) -> StageRecord | None:
+    """What the stage is about to be built from; None for untracked stages."""
+    if stage.inputs is None:
+        return None
+    version = STAGE_VERSIONS.get(_VERSION_KEYS.get(stage.name, stage.name), 1)
+    return StageRecord(version=version, inputs=input_digests(stage.inputs(ctx, deps)))
+
+
+def run_brand(
+    ctx: StageContext,
+    snapshot: PackageSnapshot | None = None,
+    listener: Callable[[StageEvent], None] | None = None,
+    pipeline: Pipeline | None = None,
+    force: bool = False,
+    profiler: Profiler | None = None,
+) -> BrandRun:
+    """Run the generate pipeline for one brand, keeping its snapshot and manifest current.
+
+    Like make, a stage whose inputs match what the snapshot records for its
+    last build, and whose outputs are still there, is reported "unchanged"
+    and its stored result reused; force rebuilds everything. The snapshot is
+    saved after every finished stage, and stage fingerprints are recorded in
+    the output manifest once tokens exist.
+    """
+    pipeline = pipeline or Pipeline(generate_stages(ctx.options))
+    previous = snapshot or PackageSnapshot(input=ctx.input)
+    recorder = SnapshotRecorder(previous.model_copy(update={"input": ctx.input}), ctx.output_dir)
+
+    def check(stage: Stage, deps: dict[str, Any]) -> StageCheck:
+        record = stage_record(stage, ctx, deps)
+        if record is None:
+            return StageCheck(False, "not tracked, always runs")
+        reason = "forced" if force else record.changes(previous.stages.get(stage.name))
+        if reason is None:
+            found, result = previous.stored_result(stage.name, ctx.output_dir)
+            if found:
+                return StageCheck(True, "inputs unchanged", result)
+            reason = "outputs missing"
+        recorder.records[stage.name] = record
+        return StageCheck(False, reason)
+
+    def on_event(event: StageEvent) -> None:
+        recorder(event)
+        if listener is not None:
+            listener(event)
+
+    result = pipeline.run(ctx, listener=on_event, check=check, profiler=profiler)
+    snapshot = recorder.snapshot
+
+    if snapshot.tokens is not None:
+        manifest = OutputManifest(ctx.output_dir)
+        package = snapshot.to_package(ctx.output_dir)
+        manifest.record_fingerprints(package_fingerprints(package, use_ai=ctx.options.use_ai))
+        manifest.save()
+    return BrandRun(result, snapshot)
@@ -0,0 +1,329 @@
+"""Profiling - wall and CPU time per stage and sub-step, as a Chrome trace and a summary.
+
+Generators mark their expensive steps with span():
+
+    with span("export_stl"):
+        export_stl(part, path)
+
+span() only records while the current thread is running a profiled stage
+(see run_profiled); otherwise it is a shared no-op context manager, so
+leaving the marks in costs a thread-local lookup.
+
+The pipeline runs each stage through run_profiled when given a Profiler, in
+whichever thread or worker process the stage lands on; the recorded spans
+travel back with the result. Profiler.write_trace produces a Chrome trace
+(open it in chrome://tracing or ui.perfetto.dev), and with cprofile_dir set
+every stage also leaves a cProfile dump (<stage>.prof, for pstats or snakeviz).
+
+With memory_top set, each stage also reports its process's peak RSS and how
+far the stage raised it, plus the top tracemalloc allocation sites still
+held when it finished. Stages that run concurrently in one process share its
+memory, so their figures overlap; run with one stage at a time (or compare
+stages across runs) to attribute a peak exactly.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from pathlib import Path
+from typing import Any, NamedTuple
+
+TRACE_NAME = "trace.json"
+
+# How often a memory-profiled stage samples RSS, in seconds
+RSS_SAMPLE_INTERVAL = 0.005
+# Allocation sites reported per stage by --memory
+MEMORY_TOP = 5
+
+_local = threading.local()
+_NOOP: AbstractContextManager[None] = nullcontext()
+
+# Concurrent stages share tracemalloc; the last one out stops it if we started it
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_started = False
+
+
+class Span(NamedTuple):
+    """One timed step. start is Unix time in microseconds; wall and cpu are seconds.
+
+    cpu is the CPU time of the thread that ran the step, so wall - cpu is
+    time spent waiting: on the network, the disk or a lock.
+    """
+
+    name: str
+    stage: str
+    depth: int
+    start: int
+    wall: float
+    cpu: float
+    pid: int
+    tid: int
+
+
+class Allocation(NamedTuple):
+    """Memory a stage allocated at one source line and still held when it finished."""
+
+    site: str
+    size_kib: float
+    blocks: int
+
+
+class StageMemory(NamedTuple):
+    """A stage's memory footprint, in MiB. python_peak_mb is tracemalloc's peak."""
+
+    rss_before_mb: float
+    rss_peak_mb: float
+    python_peak_mb: float
+    top: list[Allocation]
+
+    @property
+    def rss_delta_mb(self) -> float:
+        return max(self.rss_peak_mb - self.rss_before_mb, 0.0)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "rss_before_mb": round(self.rss_before_mb, 1),
+            "rss_peak_mb": round(self.rss_peak_mb, 1),
+            "rss_delta_mb": round(self.rss_delta_mb, 1),
+            "python_peak_mb": round(self.python_peak_mb, 1),
+            "top": [a._asdict() for a in self.top],
+        }
+
+
+class Profiled(NamedTuple):
+    """What run_profiled returns in place of the stage result."""
+
+    result: Any
+    spans: list[Span]
+    error: BaseException | None = None
+    memory: StageMemory | None = None
+
+
+def peak_rss_mb() -> float:
+    """Highest resident set size this process has reached, in MiB; 0.0 if unknown."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process in MiB (peak where unavailable)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        return peak_rss_mb()
+
+
+@contextmanager
+def _record(spans: list[Span], name: str, stage: str) -> Iterator[None]:
+    depth = _local.depth
+    _local.depth = depth + 1
+    start = time.time_ns() // 1000
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        _local.depth = depth
+        spans.append(
+            Span(
+                name,
+                stage,
+                depth,
+                start,
+                time.perf_counter() - wall,
+                time.thread_time() - cpu,
+                os.getpid(),
+                threading.get_native_id(),
+            )
+        )
+
+
+def span(name: str) -> AbstractContextManager[None]:
+    """Time a sub-step of the current stage; a no-op unless the stage is profiled."""
+    spans = getattr(_local, "spans", None)
+    if spans is None:
+        return _NOOP
+    return _record(spans, name, _local.stage)
+
+
+def _snapshot() -> Any:
+    import tracemalloc
+
+    return tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__)]
+    )
+
+
+def _start_tracing() -> None:
+    import tracemalloc
+
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_started = True
+        _tracing_users += 1
+        tracemalloc.reset_peak()
+
+
+def _stop_tracing() -> None:
+    import tracemalloc
+
+    global _tracing_users, _tracing_started
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_started:
+            tracemalloc.stop()
+            _tracing_started = False
+
+
+class _MemoryWatch:
+    """Samples RSS on a background thread and diffs tracemalloc snapshots."""
+
+    def __init__(self, top: int) -> None:
+        self._top = top
+        if top > 0:
+            _start_tracing()
+        self._before = _snapshot() if top > 0 else None
+        self.rss_before = rss_mb()
+        self._peak = self.rss_before
+        self._high_water = peak_rss_mb()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name="rss-sampler", daemon=True)
+        self._sampler.start()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL):
+            self._peak = max(self._peak, rss_mb())
+
+    def stop(self) -> StageMemory:
+        import tracemalloc
+
+        self._stop.set()
+        self._sampler.join()
+        peak = max(self._peak, rss_mb())
+        high_water = peak_rss_mb()
+        if high_water > self._high_water:
+            # The process set a new high-water mark during the stage, maybe between samples
+            peak = max(peak, high_water)
+        top: list[Allocation] = []
+        python_peak = 0.0
+        if self._before is not None:
+            python_peak = tracemalloc.get_traced_memory()[1] / 2**20
+            for stat in _snapshot().compare_to(self._before, "lineno")[: self._top]:
+                if stat.size_diff <= 0:
+                    break
+                frame = stat.traceback[0]
+                top.append(
+                    Allocation(
+                        f"{frame.filename}:{frame.lineno}",
+                        round(stat.size_diff / 1024, 1),
+                        stat.count_diff,
+                    )
+                )
+            self._before = None
+            _stop_tracing()
+        return StageMemory(self.rss_before, peak, python_peak, top)
+
+
+def run_profiled(
+    fn: Callable[..., Any],
+    stage: str,
+    cprofile_path: Path | None,
+    memory_top: int | None,
+    *args: Any,
+) -> Profiled:
+    """Run a stage function, recording its spans.
+
+    A cProfile dump is written to cprofile_path if given; memory_top=None skips
+    memory measurement, 0 measures RSS only, n > 0 adds the n top allocation sites.
+    """
+    spans: list[Span] = []
+    _local.spans, _local.stage, _local.depth = spans, stage, 0
+    profile = None
+    if cprofile_path is not None:
+        import cProfile
+
+        profile = cProfile.Profile()
+    watch = _MemoryWatch(memory_top) if memory_top is not None else None
+    try:
+        with _record(spans, stage, stage):
+            if profile is not None:
+                try:
+                    profile.enable()
+                except ValueError:
+                    # Python 3.12+ allows one profiler per process; a concurrent stage has it
+                    profile = None
+            try:
+                result = fn(*args)
+            finally:
+                if profile is not None and cprofile_path is not None:
+                    profile.disable()
+                    cprofile_path.parent.mkdir(parents=True, exist_ok=True)
+                    profile.dump_stats(cprofile_path)
+    except Exception as e:
+        return Profiled(None, spans, e, watch.stop() if watch is not None else None)
+    finally:
+        _local.spans = None
+    return Profiled(result, spans, None, watch.stop() if watch is not None else None)
+
+
+class Profiler:
+    """Collects spans (and, with memory_top set, StageMemory) from every stage of a run."""
+
+    def __init__(self, cprofile_dir: Path | None = None, memory_top: int | None = None) -> None:
+        self.cprofile_dir = cprofile_dir
+        self.memory_top = memory_top
+        self.spans: list[Span] = []
+        self.memory: dict[str, StageMemory] = {}
+        self._lock = threading.Lock()
+
+    def cprofile_path(self, stage: str) -> Path | None:
+        return self.cprofile_dir / f"{stage}.prof" if self.cprofile_dir is not None else None
+
+    def add(self, stage: str, profiled: Profiled) -> None:
+        with self._lock:
+            self.spans.extend(profiled.spans)
+            if profiled.memory is not None:
+                self.memory[stage] = profiled.memory
+
+    def summary(self) -> list[Span]:
+        """Spans grouped by stage in the order stages started, each stage's steps in order."""
+        first: dict[str, int] = {}
+        for s in self.spans:
+            first[s.stage] = min(first.get(s.stage, s.start), s.start)
+        return sorted(self.spans, key=lambda s: (first[s.stage], s.stage, s.start, s.depth))
+
+    def trace(self) -> dict[str, Any]:
+        """The spans in Chrome trace event format."""
+        events = [
+            {
+                "name": s.name,
+                "cat": "stage" if s.depth == 0 else s.stage,
+                "ph": "X",
+                "ts": s.start,
+                "dur": round(s.wall * 1e6),
+                "pid": s.pid,
+                "tid": s.tid,
+                "args": {"cpu_ms": round(s.cpu * 1000, 3)},
+            }
+            for s in self.spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write_trace(self, path: Path) -> Path:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.trace()), encoding="utf-8")
+        return path
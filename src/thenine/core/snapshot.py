@@ -0,0 +1,168 @@
+"""BrandPackage snapshots - pipeline state saved next to the outputs so runs can resume."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field, ValidationError
+
+from thenine.core.brand import BrandInput, BrandPackage, BrandPalette, BrandTokens, BrandTypography
+from thenine.core.interning import intern_palette, intern_typography
+from thenine.core.manifest import write_atomic
+
+SNAPSHOT_NAME = ".thenine-package.json"
+SNAPSHOT_VERSION = 1
+
+# Stages that produce files, in pipeline order; their paths live in artifacts
+ARTIFACT_STAGES = ("tokens", "card_pdf", "card_3d", "website")
+
+
+class StageRecord(BaseModel, frozen=True):
+    """What a stage was last built from: its generator version and a digest per input."""
+
+    version: int
+    inputs: dict[str, str]
+
+    def changes(self, previous: StageRecord | None) -> str | None:
+        """Why a stage built from self can't reuse what previous built; None if it can."""
+        if previous is None:
+            return "no previous build"
+        if previous.version != self.version:
+            return f"generator version changed ({previous.version} -> {self.version})"
+        keys = previous.inputs.keys() | self.inputs.keys()
+        changed = sorted(k for k in keys if previous.inputs.get(k) != self.inputs.get(k))
+        return f"changed: {', '.join(changed)}" if changed else None
+
+
+class PackageSnapshot(BaseModel, frozen=True):
+    """Everything a generate run has produced so far.
+
+    palette, typography and tokens stay None until their stage finishes;
+    artifacts maps a stage to the files it wrote, relative to the output
+    directory where possible, and stages to what each stage was built from.
+    """
+
+    version: int = SNAPSHOT_VERSION
+    input: BrandInput
+    palette: BrandPalette | None = None
+    typography: BrandTypography | None = None
+    tokens: BrandTokens | None = None
+    artifacts: dict[str, list[str]] = Field(default_factory=dict)
+    stages: dict[str, StageRecord] = Field(default_factory=dict)
+
+    def with_artifacts(self, stage: str, paths: list[Path], root: Path) -> PackageSnapshot:
+        relative = [str(p.relative_to(root)) if p.is_relative_to(root) else str(p) for p in paths]
+        return self.model_copy(update={"artifacts": {**self.artifacts, stage: relative}})
+
+    def has_artifacts(self, stage: str, root: Path) -> bool:
+        """Check that the stage finished and every file it wrote is still there."""
+        paths = self.artifacts.get(stage)
+        return paths is not None and all((root / p).exists() for p in paths)
+
+    def with_record(self, stage: str, record: StageRecord | None) -> PackageSnapshot:
+        stages = {k: v for k, v in self.stages.items() if k != stage}
+        if record is not None:
+            stages[stage] = record
+        return self.model_copy(update={"stages": stages})
+
+    def stored_result(self, stage: str, root: Path) -> tuple[bool, Any]:
+        """(found, result): what the stage produced last time, if it is still there."""
+        if stage in ("palette", "typography"):
+            value = getattr(self, stage)
+            return value is not None, value
+        if stage in ("card_pdf", "card_3d", "website") and self.has_artifacts(stage, root):
+            paths = [root / p for p in self.artifacts[stage]]
+            if stage == "card_3d":
+                return True, {p.suffix.lstrip("."): p for p in paths}
+            return True, paths[0]
+        return False, None
+
+    def to_package(self, output_dir: Path | str = "") -> BrandPackage:
+        if self.palette is None or self.typography is None or self.tokens is None:
+            raise ValueError("Snapshot is incomplete: palette, typography and tokens are required")
+        return BrandPackage(
+            input=self.input,
+            palette=self.palette,
+            typography=self.typography,
+            tokens=self.tokens,
+            output_dir=str(output_dir),
+        )
+
+
+def stage_artifacts(stage: str, result: Any) -> list[Path]:
+    """Files a finished stage wrote, from its pipeline result."""
+    if stage == "tokens":
+        return list(result[1].values())
+    if stage == "card_3d":
+        return list(result.values())
+    return [result]
+
+
+def artifact_bytes(path: Path) -> int:
+    """Bytes in a file, or in every file under a directory (the website)."""
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return path.stat().st_size
+
+
+class SnapshotRecorder:
+    """Pipeline listener that folds finished stages into the snapshot and saves it.
+
+    records holds the StageRecord of each stage about to run; it is stored
+    once the stage finishes. A stage that starts loses its old record, so a
+    run that fails halfway is never mistaken for an up-to-date one.
+    """
+
+    def __init__(self, snapshot: PackageSnapshot, output_dir: Path) -> None:
+        self.snapshot = snapshot
+        self.output_dir = output_dir
+        self.records: dict[str, StageRecord] = {}
+
+    def __call__(self, event: Any) -> None:
+        if event.status == "started" and event.stage in self.snapshot.stages:
+            self.snapshot = self.snapshot.with_record(event.stage, None)
+            save_snapshot(self.snapshot, self.output_dir)
+            return
+        if event.status != "done":
+            return
+        if event.stage in self.records:
+            self.snapshot = self.snapshot.with_record(event.stage, self.records.pop(event.stage))
+        if event.stage in ("palette", "typography"):
+            self.snapshot = self.snapshot.model_copy(update={event.stage: event.result})
+        elif event.stage in ARTIFACT_STAGES:
+            if event.stage == "tokens":
+                self.snapshot = self.snapshot.model_copy(update={"tokens": event.result[0]})
+            paths = stage_artifacts(event.stage, event.result)
+            self.snapshot = self.snapshot.with_artifacts(event.stage, paths, self.output_dir)
+        save_snapshot(self.snapshot, self.output_dir)
+
+
+def snapshot_path(output_dir: Path) -> Path:
+    return output_dir / SNAPSHOT_NAME
+
+
+def save_snapshot(snapshot: PackageSnapshot, output_dir: Path) -> Path:
+    """Write the snapshot atomically; encoding runs in pydantic-core, not the json module."""
+    path = snapshot_path(output_dir)
+    write_atomic(path, snapshot.model_dump_json().encode("utf-8"))
+    return path
+
+
+def load_snapshot(output_dir: Path) -> PackageSnapshot | None:
+    """Load the snapshot in output_dir; None if missing, unreadable or from another version."""
+    path = snapshot_path(output_dir)
+    try:
+        snapshot = PackageSnapshot.model_validate_json(path.read_bytes())
+    except (OSError, ValidationError):
+        return None
+    if snapshot.version != SNAPSHOT_VERSION:
+        return None
+
+    # Share palette/typography instances with brands already in memory
+    update: dict[str, Any] = {}
+    if snapshot.palette is not None:
+        update["palette"] = intern_palette(snapshot.palette)
+    if snapshot.typography is not None:
+        update["typography"] = intern_typography(snapshot.typography)
+    return snapshot.model_copy(update=update) if update else snapshot
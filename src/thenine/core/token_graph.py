@@ -0,0 +1,208 @@
+"""Token reference graph - aliases like {colors.primary} resolved with memoization."""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+from collections.abc import Mapping
+
+from thenine.core.brand import BrandTokens
+
+# A token value that is exactly "{group.key}" refers to another token
+REFERENCE_RE = re.compile(r"^\{([a-z_]+\.[^{}]+)\}$")
+
+# BrandTokens fields that hold tokens, in output order
+TOKEN_GROUPS = ("colors", "fonts", "spacing", "radii")
+
+
+class TokenReferenceError(ValueError):
+    """A token refers to a token that does not exist."""
+
+
+class TokenCycleError(ValueError):
+    """Token references form a cycle."""
+
+    def __init__(self, cycle: list[str]) -> None:
+        self.cycle = cycle
+        super().__init__(f"Token reference cycle: {' -> '.join(cycle)}")
+
+
+def reference(token_id: str) -> str:
+    """Return the alias value that points at token_id, e.g. "{colors.primary}"."""
+    return f"{{{token_id}}}"
+
+
+def parse_reference(value: str) -> str | None:
+    """Return the referenced token id if value is an alias, else None."""
+    match = REFERENCE_RE.match(value)
+    return match.group(1) if match else None
+
+
+class TokenGraph:
+    """Directed graph of tokens keyed by "group.key", with alias edges.
+
+    Resolved values are memoized. set() invalidates only the changed token and
+    the tokens that (transitively) refer to it, so re-resolving after editing a
+    base token touches just that token's dependents.
+    """
+
+    def __init__(self, values: Mapping[str, str] | None = None) -> None:
+        self._raw: dict[str, str] = {}
+        self._refs: dict[str, str] = {}
+        self._dependents: dict[str, set[str]] = {}
+        self._memo: dict[str, str] = {}
+        for token_id, value in (values or {}).items():
+            self._add(token_id, value)
+
+    @classmethod
+    def from_tokens(cls, tokens: BrandTokens) -> TokenGraph:
+        return cls(
+            {
+                f"{group}.{key}": value
+                for group in TOKEN_GROUPS
+                for key, value in getattr(tokens, group).items()
+            }
+        )
+
+    def __contains__(self, token_id: object) -> bool:
+        return token_id in self._raw
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    def raw(self, token_id: str) -> str:
+        return self._raw[token_id]
+
+    def reference_of(self, token_id: str) -> str | None:
+        """Return the token id that token_id aliases, if any."""
+        return self._refs.get(token_id)
+
+    def _add(self, token_id: str, value: str) -> None:
+        self._raw[token_id] = value
+        ref = parse_reference(value)
+        if ref is not None:
+            self._refs[token_id] = ref
+            self._dependents.setdefault(ref, set()).add(token_id)
+
+    def dependents(self, token_id: str) -> set[str]:
+        """Return every token that resolves through token_id."""
+        found: set[str] = set()
+        queue = deque([token_id])
+        while queue:
+            for dependent in self._dependents.get(queue.popleft(), ()):
+                if dependent not in found:
+                    found.add(dependent)
+                    queue.append(dependent)
+        return found
+
+    def set(self, token_id: str, value: str) -> set[str]:
+        """Add or change a token. Returns the tokens whose resolved value was invalidated."""
+        old_ref = self._refs.pop(token_id, None)
+        if old_ref is not None:
+            self._dependents[old_ref].discard(token_id)
+
+        self._add(token_id, value)
+        invalidated = {token_id} | self.dependents(token_id)
+        for stale in invalidated:
+            self._memo.pop(stale, None)
+        return invalidated
+
+    def resolve(self, token_id: str) -> str:
+        """Resolve one token by following its alias chain."""
+        chain: list[str] = []
+        on_chain: set[str] = set()
+        node = token_id
+
+        while node not in self._memo:
+            if node in on_chain:
+                raise TokenCycleError([*chain[chain.index(node) :], node])
+            if node not in self._raw:
+                source = chain[-1] if chain else token_id
+                raise TokenReferenceError(f"Token {source!r} refers to unknown token {node!r}")
+
+            ref = self._refs.get(node)
+            if ref is None:
+                self._memo[node] = self._raw[node]
+                break
+            chain.append(node)
+            on_chain.add(node)
+            node = ref
+
+        value = self._memo[node]
+        for alias in chain:
+            self._memo[alias] = value
+        return value
+
+    def order(self) -> list[str]:
+        """Return all token ids in topological order (referenced tokens first)."""
+        for token_id, ref in self._refs.items():
+            if ref not in self._raw:
+                raise TokenReferenceError(f"Token {token_id!r} refers to unknown token {ref!r}")
+
+        ordered = [t for t in self._raw if t not in self._refs]
+        queue = deque(ordered)
+        while queue:
+            for dependent in sorted(self._dependents.get(queue.popleft(), ())):
+                ordered.append(dependent)
+                queue.append(dependent)
+
+        if len(ordered) < len(self._raw):
+            placed = set(ordered)
+            start = next(t for t in self._raw if t not in placed)
+            raise TokenCycleError(self._find_cycle(start))
+        return ordered
+
+    def _find_cycle(self, start: str) -> list[str]:
+        seen: list[str] = []
+        node = start
+        while node not in seen:
+            seen.append(node)
+            node = self._refs[node]
+        return [*seen[seen.index(node) :], node]
+
+    def resolve_all(self) -> dict[str, str]:
+        """Resolve every token in topological order, reusing memoized values."""
+        for token_id in self.order():
+            if token_id not in self._memo:
+                ref = self._refs.get(token_id)
+                self._memo[token_id] = self._raw[token_id] if ref is None else self._memo[ref]
+        return {token_id: self._memo[token_id] for token_id in self._raw}
+
+    def to_tokens(self, base: BrandTokens | None = None) -> BrandTokens:
+        """Return a BrandTokens with every alias replaced by its resolved value."""
+        resolved = self.resolve_all()
+        groups: dict[str, dict[str, str]] = {group: {} for group in TOKEN_GROUPS}
+        for token_id, value in resolved.items():
+            group, _, key = token_id.partition(".")
+            groups.setdefault(group, {})[key] = value
+        if base is not None:
+            return base.model_copy(update=groups)
+        return BrandTokens.model_validate(groups)
+
+
+def has_references(tokens: BrandTokens) -> bool:
+    return any(
+        parse_reference(value) is not None
+        for group in TOKEN_GROUPS
+        for value in getattr(tokens, group).values()
+    )
+
+
+def with_aliases(tokens: BrandTokens, aliases: Mapping[str, str]) -> BrandTokens:
+    """Return tokens with semantic aliases added, e.g. {"colors.button-bg": "colors.primary"}."""
+    groups = {group: dict(getattr(tokens, group)) for group in TOKEN_GROUPS}
+    for token_id, target in aliases.items():
+        group, _, key = token_id.partition(".")
+        if group not in groups or not key:
+            raise TokenReferenceError(f"Alias {token_id!r} must be '<group>.<key>'")
+        groups[group][key] = reference(target)
+    updated = tokens.model_copy(update=groups)
+    TokenGraph.from_tokens(updated).order()
+    return updated
+
+
+def resolve_tokens(tokens: BrandTokens) -> BrandTokens:
+    """Return tokens with all aliases resolved; returns the input when there are none."""
+    if not has_references(tokens):
+        return tokens
+    return TokenGraph.from_tokens(tokens).to_tokens(tokens)
@@ -2,21 +2,60 @@
 
 from __future__ import annotations
 
-import json
+from collections.abc import Mapping, Sequence
 from pathlib import Path
 
-from thenine.core.brand import BrandPalette, BrandTokens, BrandTypography
-
-
-def create_tokens(palette: BrandPalette, typography: BrandTypography) -> BrandTokens:
-    """Create a BrandTokens object from palette and typography."""
+from thenine.core.brand import BrandColor, BrandPalette, BrandTokens, BrandTypography
+from thenine.core.exporters import DEFAULT_FORMATS, ExportResult, export_formats, render_formats
+from thenine.core.manifest import OutputManifest
+from thenine.core.palette import TONAL_STEPS, tonal_scale
+from thenine.core.token_graph import with_aliases
+
+BUNDLE_FILENAME = "tokens.bundle"
+# Binary, so not an exporter plugin: export_all() writes it next to the text formats
+BUNDLE_FORMAT = "bundle"
+
+__all__ = [
+    "BUNDLE_FILENAME",
+    "BUNDLE_FORMAT",
+    "TONAL_STEPS",
+    "ExportResult",
+    "build_tonal_scale",
+    "create_tokens",
+    "export_all",
+    "export_bundle",
+    "export_css",
+    "export_json",
+    "export_tailwind_theme",
+    "render_css",
+    "render_json",
+    "render_tailwind_theme",
+]
+
+
+def create_tokens(
+    palette: BrandPalette,
+    typography: BrandTypography,
+    aliases: Mapping[str, str] | None = None,
+    tonal_scales: bool = False,
+) -> BrandTokens:
+    """Create a BrandTokens object from palette and typography.
+
+    aliases adds semantic tokens that refer to others, e.g.
+    {"colors.button-bg": "colors.primary"}; exporters emit their resolved values.
+    tonal_scales adds primary-50 ... accent-950 steps for the brand colors.
+    """
     colors = _build_color_scale(palette)
+    if tonal_scales:
+        for role in ("primary", "secondary", "accent"):
+            colors.update(build_tonal_scale(role, getattr(palette, role)))
     fonts = {
         "heading": typography.heading.family,
         "body": typography.body.family,
         "mono": typography.mono.family,
     }
-    return BrandTokens(colors=colors, fonts=fonts)
+    tokens = BrandTokens(colors=colors, fonts=fonts)
+    return with_aliases(tokens, aliases) if aliases else tokens
 
 
 def _build_color_scale(palette: BrandPalette) -> dict[str, str]:
@@ -35,81 +74,86 @@ def _build_color_scale(palette: BrandPalette) -> dict[str, str]:
     }
 
 
-def export_json(tokens: BrandTokens, output_path: Path) -> Path:
-    """Export tokens as JSON file."""
-    data = {
-        "color": {key: {"value": val} for key, val in tokens.colors.items() if "-oklch" not in key},
-        "font": {key: {"value": val} for key, val in tokens.fonts.items()},
-        "spacing": {key: {"value": val} for key, val in tokens.spacing.items()},
-        "radii": {key: {"value": val} for key, val in tokens.radii.items()},
-    }
-    file_path = output_path / "tokens.json"
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    file_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
-    return file_path
+def build_tonal_scale(role: str, color: BrandColor) -> dict[str, str]:
+    """Color tokens role-50 ... role-950 for the color's tonal scale (see palette.tonal_scale)."""
+    return {f"{role}-{step}": tone.hex for step, tone in tonal_scale(color).items()}
 
 
-def export_css(tokens: BrandTokens, output_path: Path) -> Path:
-    """Export tokens as CSS custom properties."""
-    lines = [":root {"]
-
-    lines.append("  /* Colors */")
-    for key, val in tokens.colors.items():
-        if "-oklch" not in key:
-            lines.append(f"  --color-{key}: {val};")
+def _render_one(tokens: BrandTokens, fmt: str) -> str:
+    (content,) = render_formats(tokens, [fmt])[fmt].values()
+    return content
 
-    lines.append("")
-    lines.append("  /* Fonts */")
-    for key, val in tokens.fonts.items():
-        lines.append(f"  --font-{key}: \"{val}\", system-ui, sans-serif;")
 
-    lines.append("")
-    lines.append("  /* Spacing */")
-    for key, val in tokens.spacing.items():
-        lines.append(f"  --spacing-{key}: {val};")
+def render_json(tokens: BrandTokens) -> str:
+    """Render tokens as a JSON document."""
+    return _render_one(tokens, "json")
 
-    lines.append("")
-    lines.append("  /* Radii */")
-    for key, val in tokens.radii.items():
-        lines.append(f"  --radius-{key}: {val};")
 
-    lines.append("}")
+def render_css(tokens: BrandTokens) -> str:
+    """Render tokens as CSS custom properties."""
+    return _render_one(tokens, "css")
 
-    file_path = output_path / "tokens.css"
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    file_path.write_text("\n".join(lines), encoding="utf-8")
-    return file_path
 
+def render_tailwind_theme(tokens: BrandTokens) -> str:
+    """Render tokens as a Tailwind CSS 4 @theme directive."""
+    return _render_one(tokens, "tailwind")
 
-def export_tailwind_theme(tokens: BrandTokens, output_path: Path) -> Path:
-    """Export tokens as Tailwind CSS 4 @theme directive."""
-    lines = ['@import "tailwindcss";', "", "@theme {"]
 
-    lines.append("  /* Brand Colors */")
-    for key, val in tokens.colors.items():
-        if "-oklch" in key:
-            css_key = key.replace("-oklch", "")
-            lines.append(f"  --color-brand-{css_key}: {val};")
-        else:
-            lines.append(f"  --color-brand-{key}: {val};")
-
-    lines.append("")
-    lines.append("  /* Fonts */")
-    for key, val in tokens.fonts.items():
-        lines.append(f"  --font-{key}: \"{val}\", system-ui, sans-serif;")
+def export_json(
+    tokens: BrandTokens, output_path: Path, manifest: OutputManifest | None = None
+) -> Path:
+    """Export tokens as JSON file."""
+    return export_formats(tokens, output_path, ["json"], manifest)["json"]
 
-    lines.append("}")
 
-    file_path = output_path / "tailwind-theme.css"
-    file_path.parent.mkdir(parents=True, exist_ok=True)
-    file_path.write_text("\n".join(lines), encoding="utf-8")
-    return file_path
+def export_css(
+    tokens: BrandTokens, output_path: Path, manifest: OutputManifest | None = None
+) -> Path:
+    """Export tokens as CSS custom properties."""
+    return export_formats(tokens, output_path, ["css"], manifest)["css"]
 
 
-def export_all(tokens: BrandTokens, output_path: Path) -> dict[str, Path]:
-    """Export tokens in all formats."""
-    return {
-        "json": export_json(tokens, output_path),
-        "css": export_css(tokens, output_path),
-        "tailwind": export_tailwind_theme(tokens, output_path),
-    }
+def export_tailwind_theme(
+    tokens: BrandTokens, output_path: Path, manifest: OutputManifest | None = None
+) -> Path:
+    """Export tokens as Tailwind CSS 4 @theme directive."""
+    return export_formats(tokens, output_path, ["tailwind"], manifest)["tailwind"]
+
+
+def export_all(
+    tokens: BrandTokens,
+    output_path: Path,
+    formats: Sequence[str] = DEFAULT_FORMATS,
+    slug: str | None = None,
+) -> ExportResult:
+    """Export tokens in the selected formats, rewriting only files whose content changed.
+
+    The "bundle" format writes a one-brand binary bundle with the tokens under slug.
+    """
+    if BUNDLE_FORMAT not in formats:
+        return export_formats(tokens, output_path, formats)
+    if slug is None:
+        raise ValueError("The bundle format needs the brand's slug")
+
+    from thenine.core.bundle import render_bundle
+
+    manifest = OutputManifest(output_path)
+    text_formats = [f for f in formats if f != BUNDLE_FORMAT]
+    result = export_formats(tokens, output_path, text_formats, manifest)
+    skipped_before = len(manifest.skipped)
+    path = manifest.write(BUNDLE_FILENAME, render_bundle({slug: tokens}))
+    manifest.save()
+    skipped = result.skipped
+    if len(manifest.skipped) > skipped_before:
+        skipped = [*skipped, BUNDLE_FORMAT]
+    return ExportResult({**result, BUNDLE_FORMAT: path}, skipped)
+
+
+def export_bundle(brands: Mapping[str, BrandTokens], output_path: Path) -> Path:
+    """Export many brands (slug -> tokens) into one memory-mappable binary bundle.
+
+    Read it back with thenine.core.bundle.TokenBundle.
+    """
+    from thenine.core.bundle import write_bundle
+
+    return write_bundle(brands, output_path / BUNDLE_FILENAME)
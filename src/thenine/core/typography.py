@@ -9,6 +9,8 @@ from typing import Any
 import httpx
 
 from thenine.core.brand import BrandTypography, FontSpec
+from thenine.core.font_metrics import PairingScorer, default_scorer
+from thenine.core.interning import intern_typography
 
 # Curated font pairings: (heading, body) tuples
 CURATED_PAIRINGS: dict[str, list[tuple[str, str]]] = {
@@ -80,12 +82,16 @@ MOOD_FONT_STYLE: dict[str, str] = {
 
 MONO_FONTS = ["JetBrains Mono", "Fira Code", "Source Code Pro"]
 
+# Pairings scoring within this margin of the best candidate are treated as equals
+PAIRING_SCORE_TOLERANCE = 0.05
+
 
 class TypographySelector:
     """Selects and pairs fonts based on industry and mood."""
 
-    def __init__(self, api_key: str | None = None) -> None:
+    def __init__(self, api_key: str | None = None, scorer: PairingScorer | None = None) -> None:
         self._api_key = api_key or os.environ.get("GOOGLE_FONTS_API_KEY", "")
+        self._scorer = scorer
 
     def select(self, industry: str, mood: str, name: str = "") -> BrandTypography:
         """Select a font pairing for the brand."""
@@ -113,7 +119,7 @@ class TypographySelector:
             google_fonts_url=_google_fonts_url("JetBrains Mono", 400),
         )
 
-        return BrandTypography(heading=heading, body=body, mono=mono)
+        return intern_typography(BrandTypography(heading=heading, body=body, mono=mono))
 
     def _pick_pairing(self, industry: str, mood: str, name: str) -> tuple[str, str]:
         """Pick a heading/body font pairing."""
@@ -129,9 +135,29 @@ class TypographySelector:
         ]
 
         candidates = matching if matching else pairings
+
+        # Keep the best-scoring pairings, then let the name hash vary among them
+        scores = self.scorer.score_pairs(candidates, preferred_style)
+        best = max(scores)
+        candidates = [
+            pair
+            for pair, score in zip(candidates, scores, strict=True)
+            if score >= best - PAIRING_SCORE_TOLERANCE
+        ]
         idx = name_hash % len(candidates)
         return candidates[idx]
 
+    @property
+    def scorer(self) -> PairingScorer:
+        if self._scorer is None:
+            self._scorer = default_scorer()
+        return self._scorer
+
+    def rank_pairings(self, mood: str, limit: int | None = 10) -> list[tuple[str, str, float]]:
+        """Rank every heading/body combination in the metrics catalog for a mood."""
+        preferred_style = MOOD_FONT_STYLE.get(mood, "sans-serif")
+        return self.scorer.rank(preferred_style, limit=limit)
+
     def fetch_font_metadata(self, family: str) -> dict[str, Any] | None:
         """Fetch font metadata from Google Fonts API."""
         if not self._api_key:
@@ -0,0 +1,352 @@
+"""Worker pool - pre-warmed child processes for the heavy renderers, recycled as they age.
+
+WeasyPrint and build123d are slow to import and grow with every render. A
+WorkerPool starts its processes up front and runs an initializer in each
+(warm_worker imports the renderers) before the first job arrives. A worker
+retires after max_jobs jobs or once its resident memory passes max_rss_mb, and
+a warm replacement takes its place. Batch runs, the pipeline's process stages
+and `thenine serve` all take a WorkerPool as their process pool.
+
+WorkerPool is a concurrent.futures.Executor, so it can stand in wherever a
+ProcessPoolExecutor was used. Jobs must be picklable module-level functions.
+Workers are never forked from this process, whose other threads may hold
+locks a forked child would wait on forever: they come from a fork server
+(spawned where there is none) and get their job functions by import.
+Metrics a job records in its worker are sent back with its result and merged
+into this process's registry.
+"""
+
+from __future__ import annotations
+
+import importlib
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+import warnings
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+from contextlib import suppress
+from functools import cache
+from multiprocessing.connection import Connection
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from thenine.core.metrics import REGISTRY
+from thenine.core.profiling import rss_mb
+
+if TYPE_CHECKING:
+    # ForkServerContext does not exist on Windows
+    from multiprocessing.context import ForkServerContext, SpawnContext
+
+
+def env_int(name: str, default: int) -> int:
+    """A non-negative integer setting from the environment; default when unset or invalid."""
+    value = os.environ.get(name, "").strip()
+    if not value:
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        number = -1
+    if number < 0:
+        warnings.warn(
+            f"Ignoring {name}={value!r}: expected a non-negative integer, using {default}",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return default
+    return number
+
+
+# Recycle a worker after this many jobs / this much resident memory; 0 never does
+DEFAULT_MAX_JOBS = env_int("THENINE_WORKER_MAX_JOBS", 200)
+DEFAULT_MAX_RSS_MB = env_int("THENINE_WORKER_MAX_RSS_MB", 1024)
+
+# Modules every brand needs; imported once per worker instead of once per job
+WARM_IMPORTS = (
+    "thenine.core.palette",
+    "thenine.core.typography",
+    "thenine.core.tokens",
+    "thenine.core.exporters.web",
+    "thenine.generators.card_pdf",
+    "thenine.generators.card_3d",
+    "thenine.generators.website",
+    "weasyprint",
+    "build123d",
+)
+
+# A worker that has not started and run its initializer by then counts as crashed
+DEFAULT_START_TIMEOUT = 120.0
+
+_PARENT_POLL_SECONDS = 1.0
+
+
+class WorkerCrashedError(RuntimeError):
+    """A worker process died, or never started, before it could report back."""
+
+
+def warm_worker() -> None:
+    """Pool initializer: import the heavy modules once per worker."""
+    for module in WARM_IMPORTS:
+        # Optional renderers may be missing; their stages report it
+        with suppress(Exception):
+            importlib.import_module(module)
+
+
+@cache
+def _mp_context() -> ForkServerContext | SpawnContext:
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        # The fork server imports this module once, so workers start with it loaded
+        context.set_forkserver_preload([__name__])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+def _worker_main(
+    conn: Connection,
+    initializer: Callable[[], None] | None,
+    max_jobs: int,
+    max_rss_mb: int,
+) -> None:
+    # Ctrl+C reaches the whole process group; the pool shuts workers down itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    parent = multiprocessing.parent_process()
+    if initializer is not None:
+        initializer()
+    conn.send(os.getpid())
+    jobs = 0
+    while True:
+        while not conn.poll(_PARENT_POLL_SECONDS):
+            if parent is not None and not parent.is_alive():
+                return
+        try:
+            call = conn.recv()
+        except EOFError:
+            return
+        if call is None:
+            return
+        fn, args, kwargs = call
+        try:
+            ok, value = True, fn(*args, **kwargs)
+        except Exception as e:
+            ok, value = False, e
+        jobs += 1
+        retire = (max_jobs > 0 and jobs >= max_jobs) or (max_rss_mb > 0 and rss_mb() > max_rss_mb)
+        metrics = REGISTRY.drain()
+        try:
+            conn.send((ok, value, retire, metrics))
+        except Exception as e:
+            error = RuntimeError(f"Could not return the job's result: {e}")
+            conn.send((False, error, retire, metrics))
+        if retire:
+            return
+
+
+class _Job(NamedTuple):
+    future: Future[Any]
+    fn: Callable[..., Any]
+    args: tuple[Any, ...]
+    kwargs: dict[str, Any]
+
+
+class _Worker:
+    """One child process and the parent's end of its pipe."""
+
+    def __init__(self, pool: WorkerPool) -> None:
+        context = _mp_context()
+        ours, theirs = context.Pipe()
+        self.conn = ours
+        self.process = context.Process(
+            target=_worker_main,
+            args=(theirs, pool.initializer, pool.max_jobs, pool.max_rss_mb),
+            name=f"{pool.name}-{pool.started + 1}",
+            daemon=True,
+        )
+        self.process.start()
+        theirs.close()
+        try:
+            if not self.conn.poll(pool.start_timeout):
+                self.process.kill()
+                self.stop()
+                raise WorkerCrashedError(
+                    f"Worker process did not start within {pool.start_timeout:g}s"
+                )
+            self.pid = self.conn.recv()
+        except EOFError:
+            self.stop()
+            raise WorkerCrashedError(
+                f"Worker process exited with code {self.process.exitcode} while starting"
+            ) from None
+
+    def stop(self) -> None:
+        with suppress(OSError):
+            self.conn.send(None)
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class WorkerPool(Executor):
+    """A fixed number of warm worker processes, each replaced after max_jobs or max_rss_mb.
+
+    Each worker is driven by a thread in this process that hands it one job
+    at a time, so a recycled or crashed worker only delays its own queue slot.
+    A job whose worker dies, or whose worker could not be started within
+    start_timeout seconds, fails with WorkerCrashedError; the pool carries on.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        initializer: Callable[[], None] | None = None,
+        max_jobs: int = DEFAULT_MAX_JOBS,
+        max_rss_mb: int = DEFAULT_MAX_RSS_MB,
+        name: str = "thenine-worker",
+        start_timeout: float = DEFAULT_START_TIMEOUT,
+    ) -> None:
+        if workers < 1:
+            raise ValueError("WorkerPool needs at least one worker")
+        self.workers = workers
+        self.initializer = initializer
+        self.max_jobs = max_jobs
+        self.max_rss_mb = max_rss_mb
+        self.name = name
+        self.start_timeout = start_timeout
+        self.started = 0
+        self.jobs = 0
+        self.recycled = 0
+        self.crashed = 0
+        self.busy = 0
+
+        self._queue: queue.SimpleQueue[_Job | None] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._warm = threading.Semaphore(0)
+        self._slots = [
+            threading.Thread(target=self._drive, name=f"{name}-slot-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for slot in self._slots:
+            slot.start()
+
+    def wait_warm(self, timeout: float | None = None) -> bool:
+        """Block until every worker has started and run its initializer."""
+        acquired = 0
+        while acquired < self.workers and self._warm.acquire(timeout=timeout):
+            acquired += 1
+        for _ in range(acquired):
+            self._warm.release()
+        return acquired == self.workers
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future[Any]:
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            future: Future[Any] = Future()
+            self._queue.put(_Job(future, fn, args, kwargs))
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            if not self._shutdown:
+                self._shutdown = True
+                if cancel_futures:
+                    while True:
+                        try:
+                            job = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if job is not None:
+                            job.future.cancel()
+                for _ in self._slots:
+                    self._queue.put(None)
+        if wait:
+            for slot in self._slots:
+                slot.join()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "busy": self.busy,
+                "queued": self._queue.qsize(),
+                "jobs": self.jobs,
+                "recycled": self.recycled,
+                "crashed": self.crashed,
+            }
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, name, getattr(self, name) + delta)
+
+    def _start_worker(self) -> _Worker | WorkerCrashedError:
+        try:
+            worker = _Worker(self)
+        except WorkerCrashedError as e:
+            self._count(crashed=1)
+            return e
+        self._count(started=1)
+        return worker
+
+    def _drive(self) -> None:
+        """Slot thread: keep one warm worker and feed it jobs from the queue."""
+        worker: _Worker | WorkerCrashedError | None = self._start_worker()
+        self._warm.release()
+        try:
+            while True:
+                if worker is None:
+                    worker = self._start_worker()
+                job = self._queue.get()
+                if job is None:
+                    return
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+                if isinstance(worker, WorkerCrashedError):
+                    job.future.set_exception(worker)
+                    worker = None
+                    continue
+                self._count(busy=1)
+                try:
+                    reply = self._call(worker, job)
+                finally:
+                    self._count(busy=-1, jobs=1)
+                if reply is None:
+                    worker = None
+                    continue
+                ok, value, retire, metrics = reply
+                REGISTRY.merge(metrics)
+                if ok:
+                    job.future.set_result(value)
+                else:
+                    job.future.set_exception(value)
+                if retire:
+                    worker.stop()
+                    self._count(recycled=1)
+                    worker = None
+        finally:
+            if isinstance(worker, _Worker):
+                worker.stop()
+
+    def _call(self, worker: _Worker, job: _Job) -> tuple[bool, Any, bool, Any] | None:
+        """Run job on worker; None (with the future failed) if the worker died."""
+        try:
+            worker.conn.send((job.fn, job.args, job.kwargs))
+        except Exception as e:
+            # Pickling failed before anything was written; the worker is fine
+            return False, e, False, {}
+        try:
+            reply: tuple[bool, Any, bool, Any] = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.process.join()
+            worker.conn.close()
+            self._count(crashed=1)
+            job.future.set_exception(
+                WorkerCrashedError(f"Worker process exited with code {worker.process.exitcode}")
+            )
+            return None
+        return reply
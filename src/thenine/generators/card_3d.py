@@ -5,6 +5,7 @@ from __future__ import annotations
 from pathlib import Path
 
 from thenine.core.brand import BrandContact
+from thenine.core.profiling import span
 
 # Card dimensions in mm
 CARD_WIDTH = 85.0
@@ -27,16 +28,19 @@ class ThreeDCardGenerator:
         """Generate 3D business card in STL and 3MF formats."""
         output_dir.mkdir(parents=True, exist_ok=True)
 
-        part = self._build_card(brand_name, contact)
+        with span("build_card"):
+            part = self._build_card(brand_name, contact)
 
         stl_path = output_dir / "business-card.stl"
         threemf_path = output_dir / "business-card.3mf"
 
         from build123d import export_stl
 
-        export_stl(part, str(stl_path))
+        with span("export_stl"):
+            export_stl(part, str(stl_path))
 
-        self._export_3mf_via_lib3mf(stl_path, threemf_path)
+        with span("export_3mf"):
+            self._export_3mf_via_lib3mf(stl_path, threemf_path)
 
         paths = {"stl": stl_path}
         if threemf_path.exists():
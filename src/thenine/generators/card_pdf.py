@@ -7,6 +7,7 @@ from pathlib import Path
 from jinja2 import Template
 
 from thenine.core.brand import BrandContact, BrandPalette, BrandTypography
+from thenine.core.profiling import span
 
 CARD_WIDTH_MM = 85
 CARD_HEIGHT_MM = 55
@@ -139,13 +140,16 @@ class PDFCardGenerator:
         output_dir: Path,
     ) -> Path:
         """Generate a PDF business card with front and back sides."""
-        html = self._render_html(brand_name, contact, palette, typography)
+        with span("render_html"):
+            html = self._render_html(brand_name, contact, palette, typography)
         output_dir.mkdir(parents=True, exist_ok=True)
         pdf_path = output_dir / "business-card.pdf"
 
-        from weasyprint import HTML
+        with span("import_weasyprint"):
+            from weasyprint import HTML
 
-        HTML(string=html).write_pdf(str(pdf_path))
+        with span("write_pdf"):
+            HTML(string=html).write_pdf(str(pdf_path))
         return pdf_path
 
     def _render_html(
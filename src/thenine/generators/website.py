@@ -8,6 +8,7 @@ import subprocess
 from pathlib import Path
 
 from thenine.core.brand import BrandInput, BrandPalette, BrandTokens, BrandTypography
+from thenine.core.profiling import span
 
 TEMPLATE_DIR = Path(__file__).parent.parent.parent.parent / "templates" / "astro-landing"
 
@@ -29,9 +30,11 @@ class WebsiteGenerator:
         """Generate a branded website in the output directory."""
         site_dir = output_dir / "website"
 
-        self._copy_template(site_dir)
-        self._inject_site_data(site_dir, brand_input)
-        self._inject_theme(site_dir, palette, typography)
+        with span("copy_template"):
+            self._copy_template(site_dir)
+        with span("inject_brand"):
+            self._inject_site_data(site_dir, brand_input)
+            self._inject_theme(site_dir, palette, typography)
 
         return site_dir
 
@@ -0,0 +1,445 @@
+"""Local HTTP/JSON API - `thenine serve` keeps generators loaded between requests.
+
+    GET  /healthz     liveness, queue and worker stats
+    GET  /readyz      503 until the worker processes have imported their renderers
+    GET  /metrics     Prometheus text: stage latency, caches, AI fallbacks, job queue
+    POST /palette     {"name", "industry", "mood", "use_ai"} -> BrandPalette
+    POST /tokens      same plus "formats" and "tonal_scales"
+                      -> {"tokens": BrandTokens, "files": {path: content}}
+    POST /card/pdf    {"input": BrandInput, "use_ai"} -> application/pdf
+    POST /card/3d     {"input": BrandInput, "format": "stl" | "3mf"} -> model file
+    POST /package     {"input": BrandInput, "options": PipelineOptions} -> batch ledger record
+
+Palette and token requests run on the request thread. Cards and packages
+(WeasyPrint, build123d) run on a pool of warm worker processes; at most
+queue_limit of them may be queued or running, after which requests get 503
+with Retry-After instead of piling up.
+"""
+
+from __future__ import annotations
+
+import json
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import partial
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+from pydantic import BaseModel, ValidationError
+
+from thenine.core.batch import generate_brand
+from thenine.core.brand import BrandInput
+from thenine.core.exporters import DEFAULT_FORMATS
+from thenine.core.metrics import CONTENT_TYPE, REGISTRY, Registry
+from thenine.core.pipeline import DEFAULT_PROCESSES, PipelineOptions
+from thenine.core.workers import WorkerPool, warm_worker
+
+DEFAULT_PORT = 8000
+DEFAULT_THREADS = 8
+DEFAULT_JOB_TIMEOUT = 300.0
+
+MAX_BODY_BYTES = 1024 * 1024
+
+_MODEL_TYPES = {"stl": "model/stl", "3mf": "model/3mf"}
+
+# GET /metrics entries taken from ThenineServer.stats(): name, stats key, type, help
+_SERVER_METRICS = (
+    ("thenine_ready", "ready", "gauge", "1 once the worker processes are warm."),
+    ("thenine_jobs_queued", "queued", "gauge", "Card and package jobs waiting for a worker."),
+    ("thenine_jobs_running", "running", "gauge", "Card and package jobs running."),
+    ("thenine_jobs_queue_limit", "queue_limit", "gauge", "Jobs allowed in flight before 503s."),
+    ("thenine_jobs_served_total", "served", "counter", "Jobs finished, failed or timed out."),
+    ("thenine_jobs_rejected_total", "rejected", "counter", "Jobs refused with 503, queue full."),
+    ("thenine_workers_recycled_total", "recycled", "counter", "Workers retired by max jobs/RSS."),
+    ("thenine_workers_crashed_total", "crashed", "counter", "Worker processes that died."),
+)
+
+
+class PaletteRequest(BaseModel, frozen=True):
+    name: str = "Brand"
+    industry: str = "technology"
+    mood: str = "modern"
+    use_ai: bool = True
+
+
+class TokensRequest(PaletteRequest, frozen=True):
+    formats: tuple[str, ...] = DEFAULT_FORMATS
+    tonal_scales: bool = False
+
+
+class CardRequest(BaseModel, frozen=True):
+    input: BrandInput
+    use_ai: bool = True
+    format: str = "stl"
+
+
+class PackageRequest(BaseModel, frozen=True):
+    input: BrandInput
+    options: PipelineOptions = PipelineOptions()
+
+
+class HTTPError(Exception):
+    """Sent back as {"error": message} with the given status."""
+
+    def __init__(self, status: int, message: str, headers: dict[str, str] | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or {}
+
+
+def _select(brand_input: BrandInput, use_ai: bool) -> tuple[Any, Any]:
+    from thenine.core.palette import PaletteGenerator
+    from thenine.core.typography import TypographySelector
+
+    palette = PaletteGenerator().generate(
+        brand_input.industry, brand_input.mood, brand_input.name, use_ai=use_ai
+    )
+    return palette, TypographySelector().select(
+        brand_input.industry, brand_input.mood, brand_input.name
+    )
+
+
+def render_card_pdf(brand_input: BrandInput, use_ai: bool) -> bytes:
+    """Worker job: the PDF business card as bytes."""
+    from thenine.generators.card_pdf import PDFCardGenerator
+
+    palette, typography = _select(brand_input, use_ai)
+    with tempfile.TemporaryDirectory(prefix="thenine-") as tmp:
+        path = PDFCardGenerator().generate(
+            brand_input.name, brand_input.contact, palette, typography, Path(tmp)
+        )
+        return path.read_bytes()
+
+
+def render_card_3d(brand_input: BrandInput, fmt: str) -> bytes:
+    """Worker job: the 3D business card in one format as bytes."""
+    from thenine.generators.card_3d import ThreeDCardGenerator
+
+    with tempfile.TemporaryDirectory(prefix="thenine-") as tmp:
+        paths = ThreeDCardGenerator().generate(brand_input.name, brand_input.contact, Path(tmp))
+        if fmt not in paths:
+            raise RuntimeError(f"3D card could not be exported as {fmt}")
+        return paths[fmt].read_bytes()
+
+
+class ThenineServer:
+    """The API server: a bounded request thread pool plus warm worker processes.
+
+    processes=0 runs card and package jobs on a thread pool in this process.
+    Use as a context manager, or call start() and close().
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        output_root: Path = Path("output"),
+        processes: int | None = None,
+        threads: int = DEFAULT_THREADS,
+        queue_limit: int | None = None,
+        job_timeout: float = DEFAULT_JOB_TIMEOUT,
+    ) -> None:
+        self.output_root = output_root
+        self.processes = DEFAULT_PROCESSES if processes is None else processes
+        self.queue_limit = queue_limit if queue_limit is not None else 4 * max(self.processes, 1)
+        self.job_timeout = job_timeout
+        self.ready = threading.Event()
+        self.started_at = time.monotonic()
+
+        self._slots = threading.BoundedSemaphore(self.queue_limit) if self.queue_limit else None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._served = 0
+        self._rejected = 0
+
+        self._jobs: Executor
+        # Jobs beyond this many are waiting in the pool's queue
+        self._workers = self.processes or threads
+        if self.processes > 0:
+            self._jobs = WorkerPool(self.processes, initializer=warm_worker)
+        else:
+            self._jobs = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="job")
+        self.metrics = self._server_metrics()
+        self._httpd = _PooledHTTPServer((host, port), _Handler, self, threads)
+        self._serve_thread: threading.Thread | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self._httpd.server_address[:2]
+        return str(host), int(port)
+
+    @property
+    def url(self) -> str:
+        host, port = self.address
+        return f"http://{host}:{port}"
+
+    def _warm_up(self) -> None:
+        from thenine.core import palette, tokens, typography  # noqa: F401
+
+        if isinstance(self._jobs, WorkerPool):
+            self._jobs.wait_warm()
+        else:
+            warm_worker()
+        self.ready.set()
+
+    def start(self) -> None:
+        """Serve on a background thread; warm-up runs alongside and sets ready."""
+        threading.Thread(target=self._warm_up, name="warm-up", daemon=True).start()
+        self._serve_thread = threading.Thread(
+            target=self._httpd.serve_forever, name="http", daemon=True
+        )
+        self._serve_thread.start()
+
+    def serve_forever(self) -> None:
+        """Serve on the calling thread until interrupted."""
+        threading.Thread(target=self._warm_up, name="warm-up", daemon=True).start()
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        if self._serve_thread is not None:
+            self._httpd.shutdown()
+            self._serve_thread = None
+        self._httpd.server_close()
+        self._httpd.pool.shutdown(wait=True)
+        self._jobs.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self) -> ThenineServer:
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            in_flight, served, rejected = self._in_flight, self._served, self._rejected
+        workers = self._workers
+        pool = self._jobs.stats() if isinstance(self._jobs, WorkerPool) else {}
+        return {
+            "uptime": round(time.monotonic() - self.started_at, 3),
+            "ready": self.ready.is_set(),
+            "processes": self.processes,
+            "queued": max(in_flight - workers, 0),
+            "running": min(in_flight, workers),
+            "queue_limit": self.queue_limit,
+            "served": served,
+            "rejected": rejected,
+            "recycled": pool.get("recycled", 0),
+            "crashed": pool.get("crashed", 0),
+        }
+
+    def _server_metrics(self) -> Registry:
+        """This server's gauges and counters, read from stats() at scrape time."""
+        registry = Registry()
+        for name, key, kind, help in _SERVER_METRICS:
+            registry.callback(name, help, (), partial(self._stat, key), kind=kind)
+        return registry
+
+    def _stat(self, key: str) -> dict[tuple[str, ...], float]:
+        return {(): float(self.stats()[key])}
+
+    def render_metrics(self) -> str:
+        return REGISTRY.render() + self.metrics.render()
+
+    def _count(self, **deltas: int) -> None:
+        with self._lock:
+            for name, delta in deltas.items():
+                setattr(self, f"_{name}", getattr(self, f"_{name}") + delta)
+
+    def run_job(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run fn on the job pool and wait for it; 503 when the queue is full.
+
+        A timed-out job that already started cannot be stopped, so it keeps its
+        queue slot until it finishes: a stuck worker still counts against
+        queue_limit.
+        """
+        if self._slots is not None and not self._slots.acquire(blocking=False):
+            self._count(rejected=1)
+            raise HTTPError(503, "Server busy, retry later", {"Retry-After": "1"})
+        self._count(in_flight=1)
+        try:
+            future = self._jobs.submit(fn, *args)
+        except BaseException:
+            self._finish_job()
+            raise
+        try:
+            return future.result(timeout=self.job_timeout)
+        except FutureTimeout:
+            future.cancel()  # only succeeds while the job is still queued
+            raise HTTPError(504, f"Job did not finish within {self.job_timeout:g}s") from None
+        finally:
+            if future.done():
+                self._finish_job()
+            else:
+                future.add_done_callback(self._finish_job)
+
+    def _finish_job(self, future: Future[Any] | None = None) -> None:
+        self._count(in_flight=-1, served=1)
+        if self._slots is not None:
+            self._slots.release()
+
+    # Endpoints
+
+    def palette(self, body: dict[str, Any]) -> Any:
+        from thenine.core.palette import PaletteGenerator
+
+        request = PaletteRequest.model_validate(body)
+        return PaletteGenerator().generate(
+            request.industry, request.mood, request.name, use_ai=request.use_ai
+        )
+
+    def tokens(self, body: dict[str, Any]) -> Any:
+        from thenine.core.exporters import available_formats, render_formats
+        from thenine.core.tokens import create_tokens
+
+        request = TokensRequest.model_validate(body)
+        unknown = sorted(set(request.formats) - set(available_formats()))
+        if unknown:
+            raise HTTPError(422, f"Unknown token format(s): {', '.join(unknown)}")
+        brand = BrandInput(name=request.name, industry=request.industry, mood=request.mood)
+        tokens = create_tokens(*_select(brand, request.use_ai), tonal_scales=request.tonal_scales)
+        files: dict[str, str] = {}
+        for rendered in render_formats(tokens, request.formats).values():
+            files.update(rendered)
+        return {"tokens": tokens.model_dump(mode="json"), "files": files}
+
+    def card_pdf(self, body: dict[str, Any]) -> tuple[str, bytes]:
+        request = CardRequest.model_validate(body)
+        return "application/pdf", self.run_job(render_card_pdf, request.input, request.use_ai)
+
+    def card_3d(self, body: dict[str, Any]) -> tuple[str, bytes]:
+        request = CardRequest.model_validate(body)
+        if request.format not in _MODEL_TYPES:
+            raise HTTPError(422, f"format must be one of: {', '.join(_MODEL_TYPES)}")
+        data = self.run_job(render_card_3d, request.input, request.format)
+        return _MODEL_TYPES[request.format], data
+
+    def package(self, body: dict[str, Any]) -> Any:
+        request = PackageRequest.model_validate(body)
+        return self.run_job(generate_brand, request.input, self.output_root, request.options, True)
+
+
+_POST_ROUTES: dict[str, Callable[[ThenineServer, dict[str, Any]], Any]] = {
+    "/palette": ThenineServer.palette,
+    "/tokens": ThenineServer.tokens,
+    "/card/pdf": ThenineServer.card_pdf,
+    "/card/3d": ThenineServer.card_3d,
+    "/package": ThenineServer.package,
+}
+
+
+class _PooledHTTPServer(HTTPServer):
+    """HTTPServer that handles connections on a fixed-size thread pool."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        handler: type[BaseHTTPRequestHandler],
+        app: ThenineServer,
+        threads: int,
+    ) -> None:
+        super().__init__(address, handler)
+        self.app = app
+        self.pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix="http")
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        self.pool.submit(self._process, request, client_address)
+
+    def _process(self, request: Any, client_address: Any) -> None:
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: _PooledHTTPServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str = "application/json",
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: Any, headers: dict[str, str] | None = None) -> None:
+        if isinstance(payload, BaseModel):
+            body = payload.model_dump_json().encode("utf-8")
+        else:
+            body = json.dumps(payload).encode("utf-8")
+        self._send(status, body, headers=headers)
+
+    def _read_json(self) -> dict[str, Any]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Request body too large")
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError as e:
+            raise HTTPError(400, f"Invalid JSON: {e}") from e
+        if not isinstance(body, dict):
+            raise HTTPError(400, "Expected a JSON object")
+        return body
+
+    def do_GET(self) -> None:
+        app = self.server.app
+        if self.path == "/healthz":
+            self._send_json(200, {"status": "ok", **app.stats()})
+        elif self.path == "/metrics":
+            self._send(200, app.render_metrics().encode("utf-8"), content_type=CONTENT_TYPE)
+        elif self.path == "/readyz":
+            ready = app.ready.is_set()
+            self._send_json(200 if ready else 503, {"ready": ready})
+        else:
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+
+    def do_POST(self) -> None:
+        route = _POST_ROUTES.get(self.path)
+        try:
+            if route is None:
+                # Drain the body so the connection stays usable
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                raise HTTPError(404, f"Not found: {self.path}")
+            result = route(self.server.app, self._read_json())
+        except HTTPError as e:
+            self._send_json(e.status, {"error": str(e)}, e.headers)
+        except ValidationError as e:
+            errors = e.errors(include_url=False, include_context=False, include_input=False)
+            self._send_json(422, {"error": "Invalid request", "details": errors})
+        except Exception as e:
+            self._send_json(500, {"error": f"{type(e).__name__}: {e}"})
+        else:
+            if isinstance(result, tuple):
+                self._send(200, result[1], content_type=result[0])
+            else:
+                self._send_json(200, result)
@@ -0,0 +1,184 @@
+"""Tests for batch generation and its results ledger."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from thenine.cli import app
+from thenine.core.batch import read_ledger, run_batch
+from thenine.core.ingest import ingest
+from thenine.core.pipeline import PipelineOptions
+
+# Tokens only: no WeasyPrint/build123d needed and no API calls
+OPTIONS = PipelineOptions(use_ai=False, skip_pdf=True, skip_3d=True, skip_website=True)
+CLI_OPTIONS = ["--workers", "0", "--no-ai", "--skip-pdf", "--skip-3d", "--skip-website"]
+
+
+@pytest.fixture
+def brands_csv(tmp_path: Path) -> Path:
+    path = tmp_path / "brands.csv"
+    path.write_text(
+        "name,industry,mood,domain,contact_email\n"
+        "Acme,technology,modern,acme.com,jan@acme.com\n"
+        "Bistro,food,warm,,\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+class TestRunBatch:
+    def test_writes_ledger_and_outputs(self, brands_csv: Path, tmp_path: Path) -> None:
+        ledger = tmp_path / "out" / "ledger.jsonl"
+        summary = run_batch(ingest(brands_csv), tmp_path / "out", ledger, OPTIONS, 0)
+
+        assert (summary.ok, summary.failed, summary.resumed) == (2, 0, 0)
+        records = read_ledger(ledger)
+        assert set(records) == {"acme", "bistro"}
+        acme = records["acme"]
+        assert acme["status"] == "ok"
+        assert acme["stages"] == {"palette": "done", "typography": "done", "tokens": "done"}
+        assert set(acme["timings"]) == {"palette", "typography", "tokens"}
+        assert (tmp_path / "out" / "acme" / "tokens.json").exists()
+
+    def test_optional_stage_failure_keeps_brand_ok(
+        self, brands_csv: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def broken(*args: object) -> None:
+            raise RuntimeError("no templates")
+
+        monkeypatch.setattr("thenine.core.pipeline._run_website", broken)
+        options = OPTIONS.model_copy(update={"skip_website": False})
+        ledger = tmp_path / "ledger.jsonl"
+        summary = run_batch(ingest(brands_csv), tmp_path / "out", ledger, options, 0)
+
+        assert (summary.ok, summary.failed) == (2, 0)
+        acme = read_ledger(ledger)["acme"]
+        assert acme["status"] == "ok"
+        assert acme["stages"]["website"] == "failed"
+        assert acme["errors"] == {"website": "RuntimeError: no templates"}
+
+    def test_resume_skips_finished_brands(self, brands_csv: Path, tmp_path: Path) -> None:
+        ledger = tmp_path / "ledger.jsonl"
+        run_batch(ingest(brands_csv), tmp_path / "out", ledger, OPTIONS, 0)
+        seen: list[str] = []
+        summary = run_batch(
+            ingest(brands_csv),
+            tmp_path / "out",
+            ledger,
+            OPTIONS,
+            0,
+            on_record=lambda r: seen.append(r["slug"]),
+        )
+        assert (summary.ok, summary.resumed) == (0, 2)
+        assert seen == []
+
+        summary = run_batch(
+            ingest(brands_csv), tmp_path / "out", ledger, OPTIONS, 0, resume=False
+        )
+        assert summary.ok == 2
+
+    def test_failed_brand_is_recorded_and_retried(
+        self, brands_csv: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def broken(*args: object, **kwargs: object) -> None:
+            raise RuntimeError("export broke")
+
+        ledger = tmp_path / "ledger.jsonl"
+        monkeypatch.setattr("thenine.core.tokens.export_all", broken)
+        summary = run_batch(ingest(brands_csv), tmp_path / "out", ledger, OPTIONS, 0)
+        assert summary.failed == 2
+        assert read_ledger(ledger)["acme"]["errors"] == {"tokens": "RuntimeError: export broke"}
+
+        monkeypatch.undo()
+        summary = run_batch(ingest(brands_csv), tmp_path / "out", ledger, OPTIONS, 0)
+        assert summary.ok == 2
+        assert read_ledger(ledger)["acme"]["stages"]["palette"] == "unchanged"
+
+    def test_memory_is_recorded(self, brands_csv: Path, tmp_path: Path) -> None:
+        ledger = tmp_path / "ledger.jsonl"
+        run_batch(ingest(brands_csv), tmp_path / "out", ledger, OPTIONS, 0, memory=True)
+        memory = read_ledger(ledger)["acme"]["memory"]
+        assert set(memory) == {"palette", "typography", "tokens"}
+        assert memory["tokens"]["rss_peak_mb"] > 0
+        assert {"rss_delta_mb", "python_peak_mb", "top"} <= set(memory["tokens"])
+
+    def test_worker_processes(self, brands_csv: Path, tmp_path: Path) -> None:
+        ledger = tmp_path / "ledger.jsonl"
+        summary = run_batch(ingest(brands_csv), tmp_path / "out", ledger, OPTIONS, 2)
+        assert summary.ok == 2
+        assert set(read_ledger(ledger)) == {"acme", "bistro"}
+
+
+def test_read_ledger_ignores_torn_line(tmp_path: Path) -> None:
+    ledger = tmp_path / "ledger.jsonl"
+    ledger.write_text('{"slug": "acme", "status": "ok"}\n{"slug": "bis', encoding="utf-8")
+    assert list(read_ledger(ledger)) == ["acme"]
+
+
+def test_batch_command(brands_csv: Path, tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    result = CliRunner().invoke(app, ["batch", str(brands_csv), "--output", str(out), *CLI_OPTIONS])
+    assert result.exit_code == 0, result.output
+    assert "acme" in result.output
+    assert set(read_ledger(out / "batch-ledger.jsonl")) == {"acme", "bistro"}
+    assert not (out / "batch-errors.jsonl").exists()
+
+
+def test_batch_command_reports_rejected_rows(brands_csv: Path, tmp_path: Path) -> None:
+    with brands_csv.open("a", encoding="utf-8") as fh:
+        fh.write("ACME,food,warm,,\n")
+    out = tmp_path / "out"
+    result = CliRunner().invoke(app, ["batch", str(brands_csv), "--output", str(out), *CLI_OPTIONS])
+    assert result.exit_code == 1
+    (line,) = (out / "batch-errors.jsonl").read_text(encoding="utf-8").splitlines()
+    assert "Duplicate slug 'acme'" in line
+    assert set(read_ledger(out / "batch-ledger.jsonl")) == {"acme", "bistro"}
+
+
+def test_batch_command_memory(brands_csv: Path, tmp_path: Path) -> None:
+    out = tmp_path / "out"
+    result = CliRunner().invoke(
+        app, ["batch", str(brands_csv), "--output", str(out), "--memory", *CLI_OPTIONS]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Memory (largest Δ per stage)" in result.output
+    assert "memory" in read_ledger(out / "batch-ledger.jsonl")["bistro"]
+
+
+def test_batch_command_metrics_file(brands_csv: Path, tmp_path: Path) -> None:
+    metrics = tmp_path / "textfile" / "thenine.prom"
+    result = CliRunner().invoke(
+        app,
+        [
+            "batch",
+            str(brands_csv),
+            "--output",
+            str(tmp_path / "out"),
+            *CLI_OPTIONS,
+            "--metrics-file",
+            str(metrics),
+        ],
+    )
+    assert result.exit_code == 0, result.output
+    assert 'thenine_stage_cache_total{stage="palette",result="miss"}' in metrics.read_text(
+        encoding="utf-8"
+    )
+
+
+def test_batch_command_records_history(
+    brands_csv: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    history = tmp_path / "history.sqlite"
+    monkeypatch.setenv("THENINE_HISTORY", str(history))
+    out = tmp_path / "out"
+    result = CliRunner().invoke(app, ["batch", str(brands_csv), "--output", str(out), *CLI_OPTIONS])
+    assert result.exit_code == 0, result.output
+    db = sqlite3.connect(history)
+    assert db.execute("SELECT command FROM runs").fetchall() == [("batch",)]
+    rows = db.execute("SELECT slug, status, bytes FROM stages WHERE stage = 'tokens'").fetchall()
+    assert sorted(slug for slug, _, _ in rows) == ["acme", "bistro"]
+    assert all(status == "done" and size > 0 for _, status, size in rows)
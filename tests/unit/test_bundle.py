@@ -0,0 +1,80 @@
+"""Tests for the binary token bundle."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from thenine.core.brand import BrandPalette, BrandTokens, BrandTypography
+from thenine.core.bundle import BundleFormatError, TokenBundle, write_bundle
+from thenine.core.tokens import BUNDLE_FILENAME, create_tokens, export_bundle
+
+
+@pytest.fixture
+def brands(sample_palette: BrandPalette, sample_typography: BrandTypography) -> dict[str, BrandTokens]:
+    base = create_tokens(sample_palette, sample_typography, aliases={"colors.link": "colors.accent"})
+    return {
+        "zeta": base,
+        "acme": base.model_copy(update={"colors": {**base.colors, "primary": "#000000"}}),
+        "émile": BrandTokens(colors={"primary": "#ffffff"}, fonts={"body": "Lora"}),
+    }
+
+
+class TestTokenBundle:
+    def test_round_trip(self, brands: dict[str, BrandTokens], tmp_output: Path) -> None:
+        path = export_bundle(brands, tmp_output)
+        assert path.name == BUNDLE_FILENAME
+
+        with TokenBundle(path) as bundle:
+            assert len(bundle) == 3
+            assert list(bundle.brands()) == sorted(brands, key=lambda s: s.encode())
+            assert bundle.get("acme", "colors.primary") == "#000000"
+            assert bundle.get("zeta", "colors.primary") == brands["zeta"].colors["primary"]
+            assert bundle.get("émile", "fonts.body") == "Lora"
+            assert bundle.get("zeta", "spacing.md") == "1rem"
+
+    def test_aliases_are_resolved(self, brands: dict[str, BrandTokens], tmp_output: Path) -> None:
+        with TokenBundle(write_bundle(brands, tmp_output / "b.bin")) as bundle:
+            assert bundle.get("zeta", "colors.link") == brands["zeta"].colors["accent"]
+
+    def test_missing_lookups(self, brands: dict[str, BrandTokens], tmp_output: Path) -> None:
+        with TokenBundle(write_bundle(brands, tmp_output / "b.bin")) as bundle:
+            assert bundle.get("nope", "colors.primary") is None
+            assert bundle.get("acme", "colors.nope") is None
+            assert "acme" in bundle
+            assert "nope" not in bundle
+            with pytest.raises(KeyError):
+                bundle.tokens("nope")
+
+    def test_tokens_decodes_brand(self, brands: dict[str, BrandTokens], tmp_output: Path) -> None:
+        with TokenBundle(write_bundle(brands, tmp_output / "b.bin")) as bundle:
+            assert bundle.tokens("émile") == {
+                "colors.primary": "#ffffff",
+                "fonts.body": "Lora",
+                **{f"spacing.{k}": v for k, v in brands["émile"].spacing.items()},
+                **{f"radii.{k}": v for k, v in brands["émile"].radii.items()},
+            }
+
+    def test_shared_strings_stored_once(self, brands: dict[str, BrandTokens], tmp_output: Path) -> None:
+        base = brands["zeta"]
+        one = write_bundle({"a": base}, tmp_output / "one.bin").stat().st_size
+        many = write_bundle({f"b{i}": base for i in range(100)}, tmp_output / "many.bin").stat().st_size
+        records = sum(len(getattr(base, g)) for g in ("colors", "fonts", "spacing", "radii"))
+        # Each extra brand costs its index row, its records and its slug - no repeated values
+        assert many - one <= 99 * (12 + 8 * records + 8 + 3)
+
+    def test_empty_bundle(self, tmp_output: Path) -> None:
+        with TokenBundle(write_bundle({}, tmp_output / "empty.bin")) as bundle:
+            assert len(bundle) == 0
+            assert bundle.get("a", "b") is None
+
+    def test_duplicate_slug_rejected(self, brands: dict[str, BrandTokens], tmp_output: Path) -> None:
+        with pytest.raises(ValueError, match="Duplicate"):
+            write_bundle([("a", brands["zeta"]), ("a", brands["acme"])], tmp_output / "b.bin")
+
+    def test_rejects_foreign_file(self, tmp_output: Path) -> None:
+        path = tmp_output / "tokens.json"
+        path.write_text('{"color": {}, "font": {}}')
+        with pytest.raises(BundleFormatError):
+            TokenBundle(path)
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import json
+import os
+import subprocess
+import sys
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
@@ -17,10 +21,17 @@ from thenine.core.brand import (
     BrandTypography,
     FontSpec,
 )
+from thenine.core.tokens import ExportResult
 
 runner = CliRunner()
 
 
+@pytest.fixture(autouse=True)
+def stages_in_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Run process stages on threads so the generator patches below apply."""
+    monkeypatch.setattr("thenine.core.pipeline.DEFAULT_PROCESSES", 0)
+
+
 def _make_palette() -> BrandPalette:
     return BrandPalette(
         primary=BrandColor(
@@ -102,7 +113,9 @@ class TestGenerateCommand:
         json_path = tmp_path / "tokens.json"
         css_path = tmp_path / "tokens.css"
         tw_path = tmp_path / "tailwind-theme.css"
-        mock_export.return_value = {"json": json_path, "css": css_path, "tailwind": tw_path}
+        mock_export.return_value = ExportResult(
+            {"json": json_path, "css": css_path, "tailwind": tw_path}, skipped=[]
+        )
         mock_pdf_gen.return_value = tmp_path / "card.pdf"
         stl_mock = tmp_path / "card.stl"
         mock_3d_gen.return_value = {"stl": stl_mock}
@@ -139,7 +152,9 @@ class TestGenerateCommand:
         json_path = tmp_path / "tokens.json"
         css_path = tmp_path / "tokens.css"
         tw_path = tmp_path / "tailwind-theme.css"
-        mock_export.return_value = {"json": json_path, "css": css_path, "tailwind": tw_path}
+        mock_export.return_value = ExportResult(
+            {"json": json_path, "css": css_path, "tailwind": tw_path}, skipped=[]
+        )
         mock_pdf_gen.side_effect = OSError("cannot load library 'libgobject-2.0-0'")
 
         result = runner.invoke(app, [
@@ -171,7 +186,9 @@ class TestGenerateCommand:
         json_path = tmp_path / "tokens.json"
         css_path = tmp_path / "tokens.css"
         tw_path = tmp_path / "tailwind-theme.css"
-        mock_export.return_value = {"json": json_path, "css": css_path, "tailwind": tw_path}
+        mock_export.return_value = ExportResult(
+            {"json": json_path, "css": css_path, "tailwind": tw_path}, skipped=[]
+        )
         mock_pdf_gen.side_effect = OSError("disk full")
 
         result = runner.invoke(app, [
@@ -185,6 +202,194 @@ class TestGenerateCommand:
         assert result.exit_code != 0
 
 
+    @patch("thenine.generators.card_pdf.PDFCardGenerator.generate")
+    @patch("thenine.core.typography.TypographySelector.select")
+    @patch("thenine.core.palette.PaletteGenerator.generate")
+    def test_generate_reuses_unchanged_stages(
+        self, mock_pal_gen, mock_typo_sel, mock_pdf_gen, tmp_path: Path,
+    ) -> None:
+        out = tmp_path / "out"
+        mock_pal_gen.return_value = _make_palette()
+        mock_typo_sel.return_value = _make_typography()
+
+        def write_pdf(name, contact, palette, typography, output_dir):
+            pdf = output_dir / "business-card.pdf"
+            pdf.write_bytes(b"%PDF")
+            return pdf
+
+        mock_pdf_gen.side_effect = write_pdf
+        args = [
+            "generate", "--name", "TestCo", "--skip-website", "--skip-3d", "--no-ai",
+            "--output", str(out),
+        ]
+
+        assert runner.invoke(app, args).exit_code == 0
+        assert (out / ".thenine-package.json").exists()
+
+        result = runner.invoke(app, [*args, "--explain"])
+        assert result.exit_code == 0
+        assert "PDF Card: unchanged" in result.output
+        assert "palette: reuse - inputs unchanged" in result.output
+        assert "tokens: build - not tracked" in result.output
+        assert (mock_pal_gen.call_count, mock_typo_sel.call_count) == (1, 1)
+        assert mock_pdf_gen.call_count == 1
+
+        # A changed contact only rebuilds the card
+        result = runner.invoke(app, [*args, "--contact-title", "CEO", "--explain"])
+        assert result.exit_code == 0
+        assert "card_pdf: build - changed: contact" in result.output
+        assert (mock_pal_gen.call_count, mock_pdf_gen.call_count) == (1, 2)
+
+        # A deleted output is rebuilt
+        (out / "business-card.pdf").unlink()
+        result = runner.invoke(app, [*args, "--contact-title", "CEO", "--explain"])
+        assert "card_pdf: build - outputs missing" in result.output
+        assert mock_pdf_gen.call_count == 3
+
+        result = runner.invoke(app, [*args, "--force"])
+        assert result.exit_code == 0
+        assert (mock_pal_gen.call_count, mock_pdf_gen.call_count) == (2, 4)
+
+    def test_generate_resume_is_deprecated(self, tmp_path: Path) -> None:
+        args = [
+            "generate", "--name", "TestCo", "--skip-website", "--skip-3d", "--skip-pdf",
+            "--no-ai", "--output", str(tmp_path / "out"), "--events", "jsonl", "--resume",
+        ]
+        result = runner.invoke(app, args)
+        assert result.exit_code == 0, result.output
+        assert "--resume is deprecated" in result.stderr
+        assert all(json.loads(line) for line in result.stdout.splitlines())
+
+    def test_generate_profile(self, tmp_path: Path) -> None:
+        out = tmp_path / "out"
+        result = runner.invoke(
+            app,
+            [
+                "generate", "--name", "TestCo", "--skip-website", "--skip-3d", "--skip-pdf",
+                "--no-ai", "--output", str(out), "--profile", "--cprofile",
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        assert "Profile" in result.output
+        assert "export_tokens" in result.output
+        trace = (out / "profile" / "trace.json").read_text(encoding="utf-8")
+        assert '"name": "palette"' in trace
+        assert (out / "profile" / "tokens.prof").exists()
+
+    def test_generate_events_jsonl(self, tmp_path: Path) -> None:
+        out = tmp_path / "out"
+        args = [
+            "generate", "--name", "TestCo", "--skip-website", "--skip-3d", "--skip-pdf",
+            "--no-ai", "--output", str(out), "--events", "jsonl",
+        ]
+        result = runner.invoke(app, args)
+        assert result.exit_code == 0, result.output
+        events = [json.loads(line) for line in result.output.splitlines()]
+        assert events[0]["event"] == "run_start"
+        assert events[-1] == {**events[-1], "event": "run_end", "status": "ok", "failed": []}
+        tokens = next(e for e in events if e.get("stage") == "tokens" and e["status"] == "done")
+        assert {Path(a["path"]).name for a in tokens["artifacts"]} >= {"tokens.json"}
+
+        again = runner.invoke(app, args)
+        assert '"status": "unchanged"' in again.output
+
+        result = runner.invoke(app, [*args[:-1], "yaml"])
+        assert result.exit_code != 0
+
+    def test_generate_bundle_format(self, tmp_path: Path) -> None:
+        out = tmp_path / "out"
+        result = runner.invoke(app, [
+            "generate", "--name", "TestCo", "--skip-website", "--skip-3d", "--skip-pdf",
+            "--no-ai", "--output", str(out), "--formats", "css,bundle",
+        ])
+        assert result.exit_code == 0, result.output
+        assert (out / "tokens.bundle").exists()
+
+        brand = out / ".thenine-package.json"
+        result = runner.invoke(app, ["diff", str(brand), str(brand), "--formats", "bundle"])
+        assert result.exit_code != 0
+        assert "Unknown token format" in result.output
+
+    def test_generate_records_history_for_stats(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.delenv("THENINE_HISTORY", raising=False)
+        monkeypatch.chdir(tmp_path)
+        args = ["--skip-website", "--skip-3d", "--skip-pdf", "--no-ai"]
+        for name in ("Alpha", "Beta", "Alpha"):
+            result = runner.invoke(app, ["generate", "--name", name, *args])
+            assert result.exit_code == 0, result.output
+        assert (tmp_path / "output" / ".thenine-history.sqlite").exists()
+
+        out = tmp_path / "site"
+        result = runner.invoke(app, ["generate", "--name", "Gamma", "--output", str(out), *args])
+        assert result.exit_code == 0, result.output
+        assert (out / ".thenine-history.sqlite").exists()
+        assert not (tmp_path / ".thenine-history.sqlite").exists()
+
+        result = runner.invoke(app, ["stats", "--window", "1d"])
+        assert result.exit_code == 0, result.output
+        assert "3 generate" in result.output
+        assert "Slowest brands" in result.output
+        assert "alpha" in result.output
+        assert "No runs in the 1d before" in result.output
+
+        assert runner.invoke(app, ["stats", "--output", str(tmp_path / "none")]).exit_code == 1
+        result = runner.invoke(app, ["stats", "--output", str(tmp_path), "--window", "soon"])
+        assert result.exit_code != 0
+
+    def test_generate_survives_unwritable_history(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        (tmp_path / "file").write_text("", encoding="utf-8")
+        monkeypatch.setenv("THENINE_HISTORY", str(tmp_path / "file" / "history.sqlite"))
+        args = [
+            "generate", "--name", "TestCo", "--skip-website", "--skip-3d", "--skip-pdf",
+            "--no-ai", "--output", str(tmp_path / "out"),
+        ]
+        result = runner.invoke(app, args)
+        assert result.exit_code == 0, result.output
+        assert "Run history not saved" in result.output
+        assert "Brand package generated" in result.output
+
+        result = runner.invoke(app, [*args, "--events", "jsonl"])
+        assert result.exit_code == 0, result.output
+        assert "Run history not saved" in result.stderr
+        assert json.loads(result.stdout.splitlines()[-1])["event"] == "run_end"
+
+    @patch("thenine.core.tokens.export_all")
+    @patch("thenine.core.tokens.create_tokens")
+    @patch("thenine.core.typography.TypographySelector.select")
+    @patch("thenine.core.palette.PaletteGenerator.generate")
+    def test_generate_passes_formats(
+        self, mock_pal_gen, mock_typo_sel, mock_create_tok, mock_export, tmp_path: Path,
+    ) -> None:
+        palette = _make_palette()
+        typography = _make_typography()
+        mock_pal_gen.return_value = palette
+        mock_typo_sel.return_value = typography
+        mock_create_tok.return_value = _make_tokens(palette, typography)
+        mock_export.return_value = ExportResult({"scss": tmp_path / "_tokens.scss"}, skipped=[])
+
+        with patch("thenine.generators.card_pdf.PDFCardGenerator.generate") as mock_pdf:
+            mock_pdf.return_value = tmp_path / "card.pdf"
+            result = runner.invoke(app, [
+                "generate", "--name", "TestCo", "--skip-website", "--skip-3d", "--no-ai",
+                "--formats", "scss, android,scss",
+                "--output", str(tmp_path / "out"),
+            ])
+        assert result.exit_code == 0
+        assert mock_export.call_args.args[2] == ["scss", "android"]
+
+    def test_generate_rejects_unknown_format(self, tmp_path: Path) -> None:
+        result = runner.invoke(app, [
+            "generate", "--name", "TestCo", "--no-ai", "--formats", "css,yaml",
+            "--output", str(tmp_path / "out"),
+        ])
+        assert result.exit_code != 0
+        assert "yaml" in result.output
+
+
 class TestCardCommand:
     @patch("thenine.generators.card_pdf.PDFCardGenerator.generate")
     @patch("thenine.core.typography.TypographySelector.select")
@@ -295,3 +500,57 @@ class TestShowPalette:
     def test_load_env_no_dotenv(self) -> None:
         from thenine.cli import _load_env
         _load_env()
+
+
+class TestStartup:
+    """`thenine --help` and shell completion only need typer."""
+
+    # Cumulative import time of thenine.cli, best of three runs. typer alone is
+    # ~40 ms on a laptop; importing the Pydantic models at module level adds ~130 ms.
+    BUDGET_MS = 150
+    HEAVY = ("pydantic", "thenine.core", "thenine.generators", "thenine.infra")
+
+    def _import_times(self, code: str) -> dict[str, int]:
+        """Module -> cumulative import time in microseconds, from python -X importtime."""
+        import thenine
+
+        env = {**os.environ, "PYTHONPATH": str(Path(thenine.__file__).parents[1])}
+        stderr = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stderr
+        times = {}
+        for line in stderr.splitlines():
+            parts = line.removeprefix("import time:").split("|")
+            if len(parts) == 3 and parts[1].strip().isdigit():
+                times[parts[2].strip()] = int(parts[1])
+        return times
+
+    def test_import_skips_heavy_modules(self) -> None:
+        imported = self._import_times("import thenine.cli")
+        assert sorted(m for m in imported if m.startswith((*self.HEAVY, "rich"))) == []
+
+    def test_import_within_budget(self) -> None:
+        best = min(self._import_times("import thenine.cli")["thenine.cli"] for _ in range(3))
+        assert best / 1000 < self.BUDGET_MS, f"thenine.cli took {best / 1000:.0f} ms to import"
+
+    def test_generate_events_skips_rich(self, tmp_path: Path) -> None:
+        imported = self._import_times(
+            "import sys; sys.argv = ['thenine', 'generate', '--name', 'X', '--no-ai',"
+            " '--skip-pdf', '--skip-3d', '--skip-website', '--events', 'jsonl',"
+            f" '--output', {str(tmp_path)!r}]\n"
+            "from thenine.cli import app; app(standalone_mode=False)"
+        )
+        assert "thenine.core.events" in imported
+        assert sorted(m for m in imported if m.startswith(("rich.progress", "rich.panel"))) == []
+
+    def test_help_skips_heavy_modules(self) -> None:
+        imported = self._import_times(
+            "import sys; sys.argv = ['thenine', 'generate', '--help']\n"
+            "from thenine.cli import app; app()"
+        )
+        assert "thenine.cli" in imported
+        assert sorted(m for m in imported if m.startswith(self.HEAVY)) == []
@@ -0,0 +1,149 @@
+"""Tests for the structural brand diff."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from typer.testing import CliRunner
+
+from thenine.cli import app
+from thenine.core.brand import BrandInput, BrandPackage, BrandPalette, BrandTypography
+from thenine.core.diff import diff_flat, diff_packages, diff_tokens
+from thenine.core.token_graph import with_aliases
+from thenine.core.tokens import create_tokens
+
+runner = CliRunner()
+
+
+def _package(
+    brand_input: BrandInput, palette: BrandPalette, typography: BrandTypography
+) -> BrandPackage:
+    return BrandPackage(
+        input=brand_input,
+        palette=palette,
+        typography=typography,
+        tokens=create_tokens(palette, typography),
+    )
+
+
+class TestDiffFlat:
+    def test_added_removed_changed(self) -> None:
+        result = diff_flat({"a": 1, "b": 2, "c": 3}, {"a": 1, "b": 20, "d": 4})
+        assert [c.path for c in result.added] == ["d"]
+        assert [(c.path, c.old) for c in result.removed] == [("c", 3)]
+        assert [(c.path, c.old, c.new) for c in result.changed] == [("b", 2, 20)]
+
+    def test_identical_is_empty(self) -> None:
+        assert diff_flat({"a": 1}, {"a": 1}).is_empty
+
+
+class TestDiffTokens:
+    def test_changed_color_affects_token_files(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography
+    ) -> None:
+        old = create_tokens(sample_palette, sample_typography)
+        new = old.model_copy(update={"colors": {**old.colors, "primary": "#000000"}})
+
+        result = diff_tokens(old, new, ["json", "css", "ios"])
+        assert [c.path for c in result.changed] == ["colors.primary"]
+        assert result.artifacts == [
+            "ios/Tokens.xcassets/primary.colorset/Contents.json",
+            "tokens.css",
+            "tokens.json",
+        ]
+
+    def test_oklch_change_skips_hex_only_files(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography
+    ) -> None:
+        old = create_tokens(sample_palette, sample_typography)
+        new = old.model_copy(update={"colors": {**old.colors, "primary-oklch": "oklch(0 0 0)"}})
+        assert diff_tokens(old, new, ["css", "tailwind"]).artifacts == ["tailwind-theme.css"]
+
+    def test_alias_follows_resolved_value(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography
+    ) -> None:
+        old = with_aliases(
+            create_tokens(sample_palette, sample_typography), {"colors.button": "colors.primary"}
+        )
+        new = old.model_copy(update={"colors": {**old.colors, "primary": "#000000"}})
+        changed = {c.path for c in diff_tokens(old, new, ["json"]).changed}
+        assert changed == {"colors.primary", "colors.button"}
+
+    def test_no_change_no_artifacts(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography
+    ) -> None:
+        tokens = create_tokens(sample_palette, sample_typography)
+        result = diff_tokens(tokens, tokens)
+        assert result.is_empty
+        assert result.artifacts == []
+
+
+class TestDiffPackages:
+    def test_contact_change_affects_cards_only(
+        self,
+        sample_brand_input: BrandInput,
+        sample_palette: BrandPalette,
+        sample_typography: BrandTypography,
+    ) -> None:
+        old = _package(sample_brand_input, sample_palette, sample_typography)
+        contact = sample_brand_input.contact.model_copy(update={"phone": "+1 555 000 0000"})
+        brand_input = sample_brand_input.model_copy(update={"contact": contact})
+        new = old.model_copy(update={"input": brand_input})
+
+        result = diff_packages(old, new)
+        assert [c.path for c in result.changed] == ["input.contact.phone"]
+        assert result.artifacts == [
+            "business-card.pdf",
+            "business-card.stl",
+            "business-card.3mf",
+            "website/",
+        ]
+
+    def test_tagline_change_affects_website_only(
+        self,
+        sample_brand_input: BrandInput,
+        sample_palette: BrandPalette,
+        sample_typography: BrandTypography,
+    ) -> None:
+        old = _package(sample_brand_input, sample_palette, sample_typography)
+        new = old.model_copy(
+            update={"input": sample_brand_input.model_copy(update={"tagline": "New"})}
+        )
+        assert diff_packages(old, new).artifacts == ["website/"]
+
+
+class TestDiffCommand:
+    def test_outputs_json_and_exit_code(
+        self, tmp_path: Path, sample_palette: BrandPalette, sample_typography: BrandTypography
+    ) -> None:
+        old = create_tokens(sample_palette, sample_typography)
+        new = old.model_copy(update={"spacing": {**old.spacing, "md": "1.25rem"}})
+        old_path, new_path = tmp_path / "old.json", tmp_path / "new.json"
+        old_path.write_text(old.model_dump_json())
+        new_path.write_text(new.model_dump_json())
+
+        result = runner.invoke(
+            app, ["diff", str(old_path), str(new_path), "--formats", "css", "--exit-code"]
+        )
+        assert result.exit_code == 1
+        data = json.loads(result.output)
+        assert data["changed"] == [{"path": "spacing.md", "old": "1rem", "new": "1.25rem"}]
+        assert data["artifacts"] == ["tokens.css"]
+
+        same = runner.invoke(app, ["diff", str(old_path), str(old_path), "--exit-code"])
+        assert same.exit_code == 0
+
+    def test_mismatched_models_rejected(
+        self,
+        tmp_path: Path,
+        sample_brand_input: BrandInput,
+        sample_palette: BrandPalette,
+        sample_typography: BrandTypography,
+    ) -> None:
+        package = _package(sample_brand_input, sample_palette, sample_typography)
+        a, b = tmp_path / "a.json", tmp_path / "b.json"
+        a.write_text(package.model_dump_json())
+        b.write_text(package.tokens.model_dump_json())
+        result = runner.invoke(app, ["diff", str(a), str(b)])
+        assert result.exit_code != 0
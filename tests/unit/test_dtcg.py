@@ -0,0 +1,125 @@
+"""Tests for the streaming DTCG exporter."""
+
+from __future__ import annotations
+
+import io
+import json
+import tracemalloc
+from collections.abc import Iterator
+from pathlib import Path
+
+from thenine.core.brand import BrandPalette, BrandTokens, BrandTypography
+from thenine.core.exporters import export_formats
+from thenine.core.exporters.dtcg import MODES_EXTENSION, DTCGWriter, dtcg_value, write_dtcg
+from thenine.core.tokens import create_tokens
+
+
+class TestDTCGWriter:
+    def test_empty_document(self) -> None:
+        buffer = io.StringIO()
+        DTCGWriter(buffer).close()
+        assert json.loads(buffer.getvalue()) == {}
+
+    def test_nested_groups(self) -> None:
+        buffer = io.StringIO()
+        writer = DTCGWriter(buffer)
+        writer.begin_group("color", "color")
+        writer.token("a", "#000000")
+        writer.begin_group("empty")
+        writer.end_group()
+        writer.end_group()
+        writer.token("b", 1, token_type="number")
+        writer.close()
+        assert json.loads(buffer.getvalue()) == {
+            "color": {"$type": "color", "a": {"$value": "#000000"}, "empty": {}},
+            "b": {"$value": 1, "$type": "number"},
+        }
+
+
+class TestDTCGValues:
+    def test_hex_color(self) -> None:
+        value = dtcg_value("colors", "#FF0000")
+        assert value == {"colorSpace": "srgb", "components": [1.0, 0.0, 0.0], "hex": "#ff0000"}
+
+    def test_oklch_color(self) -> None:
+        value = dtcg_value("colors", "oklch(0.450 0.180 260.0)")
+        assert value == {"colorSpace": "oklch", "components": [0.45, 0.18, 260.0]}
+
+    def test_dimension(self) -> None:
+        assert dtcg_value("spacing", "0.25rem") == {"value": 0.25, "unit": "rem"}
+        assert dtcg_value("radii", "9999px") == {"value": 9999, "unit": "px"}
+
+    def test_alias_uses_dtcg_group_names(self) -> None:
+        assert dtcg_value("colors", "{colors.primary}") == "{color.primary}"
+        assert dtcg_value("radii", "{radii.md}") == "{radii.md}"
+
+
+class TestDTCGExport:
+    def test_document_structure(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography, tmp_output: Path
+    ) -> None:
+        tokens = create_tokens(sample_palette, sample_typography)
+        path = export_formats(tokens, tmp_output, ["dtcg"])["dtcg"]
+        data = json.loads(path.read_text())
+
+        assert data["color"]["$type"] == "color"
+        assert data["color"]["primary"]["$value"]["hex"] == sample_palette.primary.hex
+        assert data["color"]["primary-oklch"]["$value"]["colorSpace"] == "oklch"
+        assert data["font"]["heading"] == {"$value": "Inter"}
+        assert data["spacing"]["$type"] == "dimension"
+        assert data["radii"]["full"]["$value"] == {"value": 9999, "unit": "px"}
+
+    def test_tonal_scales_aliases_and_modes(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography, tmp_output: Path
+    ) -> None:
+        tokens = create_tokens(
+            sample_palette,
+            sample_typography,
+            aliases={"colors.surface": "colors.neutral-light"},
+            tonal_scales=True,
+        )
+        tokens = tokens.model_copy(
+            update={"modes": {"dark": {"colors.surface": "{colors.neutral-dark}"}}}
+        )
+        data = json.loads(write_dtcg(tokens, tmp_output / "t.json").read_text())
+
+        assert "primary-50" in data["color"]
+        assert "accent-950" in data["color"]
+        surface = data["color"]["surface"]
+        assert surface["$value"] == "{color.neutral-light}"
+        assert surface["$extensions"][MODES_EXTENSION] == {"dark": "{color.neutral-dark}"}
+
+    def test_multi_brand_stream(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography, tmp_output: Path
+    ) -> None:
+        tokens = create_tokens(
+            sample_palette, sample_typography, aliases={"colors.surface": "colors.neutral-light"}
+        )
+        path = write_dtcg(((f"brand-{i}", tokens) for i in range(3)), tmp_output / "all.json")
+        data = json.loads(path.read_text())
+        assert list(data) == ["brand-0", "brand-1", "brand-2"]
+        assert data["brand-2"]["color"]["primary"]["$value"]["hex"] == sample_palette.primary.hex
+
+        alias = data["brand-1"]["color"]["surface"]["$value"]
+        assert alias == "{brand-1.color.neutral-light}"
+        node = data
+        for part in alias.strip("{}").split("."):
+            node = node[part]
+        assert node["$value"]["hex"] == sample_palette.neutral_light.hex
+
+    def test_streaming_memory_is_bounded(self, tmp_output: Path) -> None:
+        def brands(count: int) -> Iterator[tuple[str, BrandTokens]]:
+            for i in range(count):
+                colors = {f"c{j}": f"#{(i * 97 + j) % 0xFFFFFF:06x}" for j in range(50)}
+                yield f"brand-{i}", BrandTokens(colors=colors, fonts={"body": "Inter"})
+
+        def peak(count: int) -> int:
+            tracemalloc.start()
+            write_dtcg(brands(count), tmp_output / f"{count}.json")
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak_bytes
+
+        small, large = peak(10), peak(200)
+        assert (tmp_output / "200.json").stat().st_size > 15 * (tmp_output / "10.json").stat().st_size
+        assert large < small * 2
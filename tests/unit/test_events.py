@@ -0,0 +1,44 @@
+"""Tests for the JSON-lines stage event stream."""
+
+from __future__ import annotations
+
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+from thenine.core.brand import BrandInput
+from thenine.core.events import JsonlEvents
+from thenine.core.pipeline import StageEvent
+
+
+def _lines(stream: io.StringIO) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_stage_events(sample_brand_input: BrandInput, tmp_output: Path) -> None:
+    site = tmp_output / "website"
+    site.mkdir()
+    (site / "index.html").write_text("x" * 100, encoding="utf-8")
+    (site / "style.css").write_text("y" * 20, encoding="utf-8")
+
+    stream = io.StringIO()
+    events = JsonlEvents(stream)
+    events.start(sample_brand_input, tmp_output)
+    events(StageEvent("website", "started", reason="no previous build"))
+    events(StageEvent("website", "done", 0.5, site))
+    events(StageEvent("card_3d", "failed", 0.25, error=RuntimeError("no build123d")))
+    events(StageEvent("palette", "unchanged", result=object(), reason="inputs unchanged"))
+    events.end(ok=True)
+
+    start, started, done, failed, unchanged, end = _lines(stream)
+    assert start["event"] == "run_start"
+    assert start["slug"] == "acme-corp"
+    assert started == {**started, "event": "stage", "status": "started"}
+    assert "elapsed" not in started
+    assert done["elapsed"] == 0.5
+    assert done["artifacts"] == [{"path": str(site), "bytes": 120}]
+    assert failed["error"] == "RuntimeError: no build123d"
+    assert "artifacts" not in unchanged
+    assert unchanged["reason"] == "inputs unchanged"
+    assert (end["event"], end["status"], end["failed"]) == ("run_end", "ok", ["card_3d"])
@@ -0,0 +1,189 @@
+"""Tests for the token exporter registry and format plugins."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+from thenine.core.brand import BrandPalette, BrandTokens, BrandTypography
+from thenine.core.exporters import (
+    DEFAULT_FORMATS,
+    TokenEntry,
+    TokenExporter,
+    available_formats,
+    export_formats,
+    iter_tokens,
+    load_exporter,
+    register_exporter,
+    render_formats,
+)
+from thenine.core.manifest import MANIFEST_NAME, OutputManifest
+from thenine.core.tokens import create_tokens
+
+
+@pytest.fixture
+def tokens(sample_palette: BrandPalette, sample_typography: BrandTypography) -> BrandTokens:
+    return create_tokens(sample_palette, sample_typography)
+
+
+@pytest.fixture
+def isolated_registry(monkeypatch: pytest.MonkeyPatch) -> None:
+    import thenine.core.exporters as registry
+
+    monkeypatch.setattr(registry, "EXPORTERS", dict(registry.EXPORTERS))
+    monkeypatch.setattr(registry, "_loaded", dict(registry._loaded))
+
+
+class CountingExporter(TokenExporter):
+    format = "count"
+    primary = "count.txt"
+
+    def __init__(self) -> None:
+        self.seen: list[TokenEntry] = []
+
+    def feed(self, entry: TokenEntry) -> None:
+        self.seen.append(entry)
+
+    def files(self) -> dict[str, str]:
+        return {self.primary: str(len(self.seen))}
+
+
+class NoFilesExporter(TokenExporter):
+    def feed(self, entry: TokenEntry) -> None:
+        return
+
+
+class TestRegistry:
+    def test_builtin_formats(self) -> None:
+        formats = available_formats()
+        for name in ["json", "css", "tailwind", "scss", "js", "android", "ios"]:
+            assert name in formats
+
+    def test_unknown_format(self) -> None:
+        with pytest.raises(ValueError, match="Unknown token format"):
+            load_exporter("yaml")
+
+    def test_plugins_are_lazy(self) -> None:
+        sys.modules.pop("thenine.core.exporters.native", None)
+        render_formats(BrandTokens(colors={}, fonts={}), ["json"])
+        assert "thenine.core.exporters.native" not in sys.modules
+
+    @pytest.mark.usefixtures("isolated_registry")
+    def test_register_exporter(self, tokens: BrandTokens, tmp_output: Path) -> None:
+        register_exporter("count", CountingExporter)
+        result = export_formats(tokens, tmp_output, ["count"])
+        assert result["count"].read_text() == str(len(list(iter_tokens(tokens))))
+
+    @pytest.mark.usefixtures("isolated_registry")
+    def test_incomplete_exporter_is_rejected(self) -> None:
+        with pytest.raises(TypeError, match="does not implement files"):
+            register_exporter("nofiles", NoFilesExporter)
+        assert "nofiles" not in available_formats()
+
+        register_exporter("nofiles", f"{__name__}:NoFilesExporter")
+        with pytest.raises(TypeError, match="does not implement files"):
+            load_exporter("nofiles")
+
+
+class TestSinglePass:
+    def test_walks_tokens_once(self, tokens: BrandTokens, monkeypatch: pytest.MonkeyPatch) -> None:
+        calls = []
+        original = iter_tokens
+
+        def counting(t: BrandTokens):  # type: ignore[no-untyped-def]
+            calls.append(t)
+            return original(t)
+
+        monkeypatch.setattr("thenine.core.exporters.iter_tokens", counting)
+        render_formats(tokens, available_formats())
+        assert len(calls) == 1
+
+
+class TestFormats:
+    def test_default_formats(self, tokens: BrandTokens, tmp_output: Path) -> None:
+        result = export_formats(tokens, tmp_output)
+        assert list(result) == list(DEFAULT_FORMATS)
+
+    def test_scss(self, tokens: BrandTokens, tmp_output: Path) -> None:
+        content = export_formats(tokens, tmp_output, ["scss"])["scss"].read_text()
+        assert f"$color-primary: {tokens.colors['primary']};" in content
+        assert '$font-heading: "Inter", system-ui, sans-serif;' in content
+        assert "$spacing: (" in content
+        assert "oklch" not in content
+
+    def test_js_module(self, tokens: BrandTokens, tmp_output: Path) -> None:
+        path = export_formats(tokens, tmp_output, ["js"])["js"]
+        content = path.read_text()
+        assert content.startswith("export const tokens = Object.freeze(")
+        assert "export default tokens;" in content
+        body = content[len("export const tokens = Object.freeze(") : content.index(");")]
+        assert json.loads(body)["colors"]["primary"] == tokens.colors["primary"]
+        assert '"primary": string;' in (tmp_output / "tokens.d.ts").read_text()
+
+    def test_android(self, tokens: BrandTokens, tmp_output: Path) -> None:
+        path = export_formats(tokens, tmp_output, ["android"])["android"]
+        root = ElementTree.parse(path).getroot()
+        values = {el.get("name"): el.text for el in root}
+        assert values["color_primary"] == tokens.colors["primary"]
+        assert values["color_neutral_light"] == tokens.colors["neutral-light"]
+        assert values["spacing_md"] == "16dp"
+        assert values["spacing_2xl"] == "48dp"
+        assert values["radius_full"] == "9999dp"
+        assert values["font_heading"] == "Inter"
+
+    def test_ios(self, tokens: BrandTokens, tmp_output: Path) -> None:
+        catalog = export_formats(tokens, tmp_output, ["ios"])["ios"]
+        assert (catalog / "Contents.json").exists()
+        colorsets = sorted(p.name for p in catalog.glob("*.colorset"))
+        assert colorsets == sorted(
+            f"{k}.colorset" for k in tokens.colors if not k.endswith("-oklch")
+        )
+        data = json.loads((catalog / "primary.colorset" / "Contents.json").read_text())
+        components = data["colors"][0]["color"]["components"]
+        r, _, b = (int(tokens.colors["primary"][i : i + 2], 16) for i in (1, 3, 5))
+        assert components["red"] == f"{r / 255:.3f}"
+        assert components["blue"] == f"{b / 255:.3f}"
+
+    def test_multi_file_format_skipped_when_unchanged(
+        self, tokens: BrandTokens, tmp_output: Path
+    ) -> None:
+        export_formats(tokens, tmp_output, ["ios", "js"])
+        result = export_formats(tokens, tmp_output, ["ios", "js"])
+        assert result.skipped == ["ios", "js"]
+
+    def test_ios_removes_stale_colorsets(self, tokens: BrandTokens, tmp_output: Path) -> None:
+        catalog = export_formats(tokens, tmp_output, ["ios"])["ios"]
+        colors = {k: v for k, v in tokens.colors.items() if k != "accent"}
+        result = export_formats(tokens.model_copy(update={"colors": colors}), tmp_output, ["ios"])
+        assert not (catalog / "accent.colorset").exists()
+        assert (catalog / "primary.colorset").exists()
+        assert result.skipped == []
+        manifest = json.loads((tmp_output / MANIFEST_NAME).read_text())
+        assert not any("accent.colorset" in name for name in manifest["files"])
+
+    def test_shared_manifest_reports_this_calls_skips(
+        self, tokens: BrandTokens, tmp_output: Path
+    ) -> None:
+        export_formats(tokens, tmp_output, ["js"])
+        manifest = OutputManifest(tmp_output)
+        assert export_formats(tokens, tmp_output, ["js"], manifest=manifest).skipped == ["js"]
+        (tmp_output / "tokens.js").unlink()
+        assert export_formats(tokens, tmp_output, ["js"], manifest=manifest).skipped == []
+
+    def test_sequential_and_parallel_match(self, tokens: BrandTokens, tmp_path: Path) -> None:
+        formats = available_formats()
+        export_formats(tokens, tmp_path / "seq", formats, max_workers=1)
+        export_formats(tokens, tmp_path / "par", formats, max_workers=4)
+
+        def contents(root: Path) -> dict[Path, bytes]:
+            return {
+                p.relative_to(root): p.read_bytes()
+                for p in root.rglob("*")
+                if p.is_file() and p.name != MANIFEST_NAME
+            }
+
+        assert contents(tmp_path / "seq") == contents(tmp_path / "par")
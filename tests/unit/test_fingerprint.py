@@ -0,0 +1,116 @@
+"""Tests for content fingerprints."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from thenine.core.brand import BrandInput, BrandPackage, BrandPalette, BrandTypography
+from thenine.core.fingerprint import (
+    STAGE_VERSIONS,
+    STAGES,
+    canonical_json,
+    fingerprint,
+    input_fingerprint,
+    package_fingerprints,
+)
+from thenine.core.manifest import OutputManifest
+from thenine.core.tokens import create_tokens
+
+
+@pytest.fixture
+def package(
+    sample_brand_input: BrandInput,
+    sample_palette: BrandPalette,
+    sample_typography: BrandTypography,
+) -> BrandPackage:
+    return BrandPackage(
+        input=sample_brand_input,
+        palette=sample_palette,
+        typography=sample_typography,
+        tokens=create_tokens(sample_palette, sample_typography),
+    )
+
+
+def _changed(old: dict[str, str], new: dict[str, str]) -> set[str]:
+    return {key for key in old if old[key] != new[key]}
+
+
+class TestCanonicalJson:
+    def test_key_order_is_irrelevant(self) -> None:
+        assert canonical_json({"b": 1, "a": [2, {"d": 3, "c": 4}]}) == canonical_json(
+            {"a": [2, {"c": 4, "d": 3}], "b": 1}
+        )
+
+    def test_unicode_is_normalized(self) -> None:
+        composed, decomposed = "Caf\u00e9", "Cafe\u0301"
+        assert fingerprint(composed) == fingerprint(decomposed)
+
+    def test_input_fingerprint_is_stable(self, sample_brand_input: BrandInput) -> None:
+        copy = BrandInput.model_validate(sample_brand_input.model_dump())
+        assert input_fingerprint(copy) == input_fingerprint(sample_brand_input)
+        assert len(input_fingerprint(copy)) == 64
+
+
+class TestPackageFingerprints:
+    def test_covers_every_stage(self, package: BrandPackage) -> None:
+        assert set(package.fingerprints) == {"input", *STAGES}
+
+    def test_use_ai_only_affects_palette(self, package: BrandPackage) -> None:
+        without_ai = package_fingerprints(package, use_ai=False)
+        assert _changed(package.fingerprints, without_ai) == {"palette"}
+
+    def test_tagline_only_affects_website(self, package: BrandPackage) -> None:
+        brand_input = package.input.model_copy(update={"tagline": "Something else"})
+        changed = package.model_copy(update={"input": brand_input})
+        assert _changed(package.fingerprints, changed.fingerprints) == {"input", "website"}
+
+    def test_contact_affects_cards_and_website(self, package: BrandPackage) -> None:
+        contact = package.input.contact.model_copy(update={"phone": "+1 555 000 0000"})
+        brand_input = package.input.model_copy(update={"contact": contact})
+        changed = package.model_copy(update={"input": brand_input})
+        assert _changed(package.fingerprints, changed.fingerprints) == {
+            "input",
+            "card",
+            "card_3d",
+            "website",
+        }
+
+    def test_palette_content_flows_downstream(self, package: BrandPackage) -> None:
+        primary = package.palette.primary.model_copy(update={"hex": "#000000"})
+        palette = package.palette.model_copy(update={"primary": primary})
+        changed = package.model_copy(update={"palette": palette})
+        assert _changed(package.fingerprints, changed.fingerprints) == {"tokens", "card", "website"}
+
+    def test_version_bump_changes_stage(
+        self, package: BrandPackage, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        before = package.fingerprints
+        monkeypatch.setitem(STAGE_VERSIONS, "tokens", 99)
+        assert _changed(before, package.fingerprints) == {"tokens"}
+
+    def test_output_dir_is_not_part_of_fingerprints(self, package: BrandPackage) -> None:
+        moved = package.model_copy(update={"output_dir": "/somewhere/else"})
+        assert moved.fingerprints == package.fingerprints
+
+
+class TestManifestFingerprints:
+    def test_round_trip(self, package: BrandPackage, tmp_output: Path) -> None:
+        manifest = OutputManifest(tmp_output)
+        manifest.record_fingerprints(package.fingerprints)
+        manifest.save()
+        assert OutputManifest(tmp_output).fingerprints == package.fingerprints
+
+    def test_unchanged_fingerprints_do_not_rewrite(
+        self, package: BrandPackage, tmp_output: Path
+    ) -> None:
+        manifest = OutputManifest(tmp_output)
+        manifest.record_fingerprints(package.fingerprints)
+        manifest.save()
+        mtime = (tmp_output / ".thenine-manifest.json").stat().st_mtime_ns
+
+        again = OutputManifest(tmp_output)
+        again.record_fingerprints(package.fingerprints)
+        again.save()
+        assert (tmp_output / ".thenine-manifest.json").stat().st_mtime_ns == mtime
@@ -0,0 +1,192 @@
+"""Tests for font metrics extraction and pairing scorer."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from thenine.core.font_metrics import (
+    BUILTIN_METRICS,
+    FontMetrics,
+    PairingScorer,
+    build_metrics_table,
+    extract_metrics,
+    load_metrics_table,
+)
+from thenine.core.typography import CURATED_PAIRINGS, TypographySelector
+
+
+def _rect(pen: object, x0: int, y0: int, x1: int, y1: int, clockwise: bool = True) -> None:
+    points = [(x0, y0), (x0, y1), (x1, y1), (x1, y0)]
+    if not clockwise:
+        points.reverse()
+    pen.moveTo(points[0])  # type: ignore[attr-defined]
+    for p in points[1:]:
+        pen.lineTo(p)  # type: ignore[attr-defined]
+    pen.closePath()  # type: ignore[attr-defined]
+
+
+def _build_font(path: Path, family: str, weight: int, stem: int, hairline: int) -> Path:
+    """Build a tiny TrueType font whose 'o' has the given stem and hairline thickness."""
+    from fontTools.fontBuilder import FontBuilder
+    from fontTools.pens.ttGlyphPen import TTGlyphPen
+
+    def glyph(draw: object) -> object:
+        pen = TTGlyphPen(None)
+        draw(pen)  # type: ignore[operator]
+        return pen.glyph()
+
+    glyphs = {
+        ".notdef": glyph(lambda p: None),
+        "o": glyph(
+            lambda p: (
+                _rect(p, 50, 0, 450, 500),
+                _rect(p, 50 + stem, hairline, 450 - stem, 500 - hairline, clockwise=False),
+            )
+        ),
+        "x": glyph(lambda p: _rect(p, 0, 0, 500, 500)),
+        "H": glyph(lambda p: _rect(p, 0, 0, 600, 700)),
+    }
+
+    fb = FontBuilder(1000, isTTF=True)
+    fb.setupGlyphOrder(list(glyphs))
+    fb.setupCharacterMap({ord("o"): "o", ord("x"): "x", ord("H"): "H"})
+    fb.setupGlyf(glyphs)
+    fb.setupHorizontalMetrics({name: (500, 0) for name in glyphs})
+    fb.setupHorizontalHeader(ascent=800, descent=-200)
+    fb.setupNameTable({"familyName": family, "styleName": "Regular"})
+    fb.setupOS2(sxHeight=500, sCapHeight=700, xAvgCharWidth=520, usWeightClass=weight)
+    fb.setupPost()
+    fb.save(str(path))
+    return path
+
+
+class TestExtractMetrics:
+    def test_measures_normalized_metrics(self, tmp_path: Path) -> None:
+        path = _build_font(tmp_path / "mono.ttf", "Testa Sans", 400, stem=60, hairline=60)
+        metrics = extract_metrics(path)
+        assert metrics.family == "Testa Sans"
+        assert metrics.x_height == 0.5
+        assert metrics.cap_height == 0.7
+        assert metrics.width == 0.52
+        assert metrics.weights == (400,)
+
+    def test_monolinear_has_no_contrast(self, tmp_path: Path) -> None:
+        path = _build_font(tmp_path / "mono.ttf", "Testa Sans", 400, stem=60, hairline=60)
+        metrics = extract_metrics(path)
+        assert metrics.contrast == 0.0
+        assert metrics.category == "sans-serif"
+
+    def test_high_contrast_is_serif(self, tmp_path: Path) -> None:
+        path = _build_font(tmp_path / "didone.ttf", "Testa Didone", 400, stem=100, hairline=20)
+        metrics = extract_metrics(path)
+        assert metrics.contrast == pytest.approx(0.8)
+        assert metrics.category == "serif"
+
+
+class TestBuildMetricsTable:
+    def test_merges_weights_by_family(self, tmp_path: Path) -> None:
+        fonts = tmp_path / "fonts"
+        fonts.mkdir()
+        _build_font(fonts / "a-regular.ttf", "Testa Sans", 400, stem=60, hairline=60)
+        _build_font(fonts / "a-bold.ttf", "Testa Sans", 700, stem=90, hairline=90)
+
+        table = build_metrics_table([fonts])
+        assert set(table) == {"Testa Sans"}
+        assert table["Testa Sans"].weights == (400, 700)
+
+    def test_cache_is_reused(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        fonts = tmp_path / "fonts"
+        fonts.mkdir()
+        _build_font(fonts / "a.ttf", "Testa Sans", 400, stem=60, hairline=60)
+        cache = tmp_path / "cache.json"
+
+        build_metrics_table([fonts], cache)
+        assert cache.exists()
+
+        def fail(path: Path) -> FontMetrics:
+            raise AssertionError("font should have been served from the cache")
+
+        monkeypatch.setattr("thenine.core.font_metrics.extract_metrics", fail)
+        table = build_metrics_table([fonts], cache)
+        assert "Testa Sans" in table
+
+    def test_unreadable_font_is_skipped_with_warning(self, tmp_path: Path) -> None:
+        fonts = tmp_path / "fonts"
+        fonts.mkdir()
+        _build_font(fonts / "a.ttf", "Testa Sans", 400, stem=60, hairline=60)
+        (fonts / "broken.otf").write_bytes(b"not a font")
+
+        with pytest.warns(RuntimeWarning, match=r"Skipping font .*broken\.otf"):
+            table = build_metrics_table([fonts])
+        assert set(table) == {"Testa Sans"}
+
+    def test_local_fonts_override_builtin(self, tmp_path: Path) -> None:
+        fonts = tmp_path / "fonts"
+        fonts.mkdir()
+        _build_font(fonts / "inter.ttf", "Inter", 400, stem=60, hairline=60)
+
+        table = load_metrics_table([fonts], tmp_path / "cache.json")
+        assert table["Inter"].x_height == 0.5
+        assert "Lato" in table
+
+
+class TestPairingScorer:
+    def test_excludes_monospace(self) -> None:
+        scorer = PairingScorer(BUILTIN_METRICS)
+        assert "JetBrains Mono" not in scorer.families
+
+    def test_self_pairing_never_ranked(self) -> None:
+        scorer = PairingScorer(BUILTIN_METRICS)
+        ranked = scorer.rank(limit=None)
+        assert all(h != b for h, b, _ in ranked)
+        n = len(scorer.families)
+        assert len(ranked) == n * n - n
+
+    def test_rank_is_sorted(self) -> None:
+        scorer = PairingScorer(BUILTIN_METRICS)
+        scores = [s for _, _, s in scorer.rank(limit=20)]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_preferred_style_leads_ranking(self) -> None:
+        scorer = PairingScorer(BUILTIN_METRICS)
+        heading, _, _ = scorer.rank("serif", limit=1)[0]
+        assert BUILTIN_METRICS[heading].category == "serif"
+
+    def test_high_contrast_body_penalized(self) -> None:
+        scorer = PairingScorer(BUILTIN_METRICS)
+        good, bad = scorer.score_pairs(
+            [("Inter", "Open Sans"), ("Inter", "Abril Fatface")], "sans-serif"
+        )
+        assert good > bad
+
+    def test_matrix_is_cached_read_only(self) -> None:
+        scorer = PairingScorer(BUILTIN_METRICS)
+        matrix = scorer.score_matrix("serif")
+        assert scorer.score_matrix("serif") is matrix
+        assert scorer.score_matrix("sans-serif") is not matrix
+        assert not matrix.flags.writeable
+
+    def test_unknown_family_scores_zero(self) -> None:
+        scorer = PairingScorer(BUILTIN_METRICS)
+        assert scorer.score_pairs([("Nope", "Inter")]) == [0.0]
+
+    def test_curated_catalog_is_covered(self) -> None:
+        families = {f for pairs in CURATED_PAIRINGS.values() for pair in pairs for f in pair}
+        assert families <= set(BUILTIN_METRICS)
+
+
+class TestSelectorRanking:
+    def test_rank_pairings(self) -> None:
+        selector = TypographySelector(scorer=PairingScorer(BUILTIN_METRICS))
+        ranked = selector.rank_pairings("luxury", limit=3)
+        assert len(ranked) == 3
+        assert BUILTIN_METRICS[ranked[0][0]].category == "serif"
+
+    def test_pick_prefers_higher_score(self) -> None:
+        selector = TypographySelector(scorer=PairingScorer(BUILTIN_METRICS))
+        # Playfair/Lato outscores Cormorant/Montserrat by more than the tolerance
+        for name in ["A", "B", "C", "D"]:
+            heading, _ = selector._pick_pairing("food", "classic", name)
+            assert heading == "Playfair Display"
@@ -0,0 +1,146 @@
+"""Tests for the SQLite run history and its statistics."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from thenine.core.history import (
+    RunHistory,
+    ai_fallback_rate,
+    history_path,
+    parse_window,
+    percentile,
+    record_rows,
+    regressions,
+    slowest_brands,
+    stage_stats,
+)
+from thenine.core.metrics import AI_REQUESTS
+
+DAY = 86400.0
+
+
+def _record(slug: str, tokens: float, website: str = "done", **extra: Any) -> dict[str, Any]:
+    return {
+        "slug": slug,
+        "status": "ok",
+        "output_dir": extra.get("output_dir", f"/nowhere/{slug}"),
+        "stages": {"palette": "unchanged", "tokens": "done", "website": website},
+        "errors": {"website": "RuntimeError: boom"} if website == "failed" else {},
+        "timings": {"tokens": tokens, "website": 0.5},
+        "artifacts": extra.get("artifacts", {}),
+    }
+
+
+def _insert(db: sqlite3.Connection, at: float, stage: str, seconds: float, slug: str = "a") -> None:
+    db.execute(
+        "INSERT INTO stages VALUES (1, ?, ?, ?, 'done', ?, NULL, NULL)", (at, slug, stage, seconds)
+    )
+
+
+@pytest.fixture
+def db(tmp_path: Path) -> sqlite3.Connection:
+    path = tmp_path / "history.sqlite"
+    RunHistory(path, "test").close()
+    return sqlite3.connect(path)
+
+
+def test_history_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("THENINE_HISTORY", raising=False)
+    assert history_path(tmp_path) == tmp_path / ".thenine-history.sqlite"
+    monkeypatch.setenv("THENINE_HISTORY", str(tmp_path / "h.db"))
+    assert history_path(Path("elsewhere")) == tmp_path / "h.db"
+    monkeypatch.setenv("THENINE_HISTORY", "")
+    assert history_path(tmp_path) is None
+
+
+def test_parse_window_and_percentile() -> None:
+    assert parse_window("24h") == DAY
+    assert parse_window("2w") == 14 * DAY
+    for bad in ("", "7", "xd", "-1d"):
+        with pytest.raises(ValueError, match="window"):
+            parse_window(bad)
+    values = [float(v) for v in range(1, 101)]
+    assert (percentile(values, 50), percentile(values, 99), percentile(values, 100)) == (
+        50.0,
+        99.0,
+        100.0,
+    )
+    assert percentile([], 50) is None
+
+
+def test_record_rows(tmp_path: Path) -> None:
+    (tmp_path / "tokens.json").write_text("x" * 10, encoding="utf-8")
+    record = _record("acme", 0.25, output_dir=str(tmp_path), artifacts={"tokens": ["tokens.json"]})
+    rows = {row[2]: row for row in record_rows(record, 1.0)}
+    assert rows["palette"] == (1.0, "acme", "palette", "unchanged", None, None, None)
+    assert rows["tokens"] == (1.0, "acme", "tokens", "done", 0.25, 10, None)
+
+    crashed = {"slug": "x", "status": "failed", "errors": {"pipeline": "WorkerCrashedError: gone"}}
+    assert list(record_rows(crashed, 1.0)) == [
+        (1.0, "x", "pipeline", "failed", None, None, "WorkerCrashedError: gone")
+    ]
+
+
+def test_writes_are_batched(tmp_path: Path) -> None:
+    path = tmp_path / "history.sqlite"
+    with RunHistory(path, "batch", flush_rows=6) as history:
+        reader = sqlite3.connect(path)
+        history.add(_record("a", 0.1))
+        assert reader.execute("SELECT COUNT(*) FROM stages").fetchone() == (0,)
+        history.add(_record("b", 0.2))
+        assert reader.execute("SELECT COUNT(*) FROM stages").fetchone() == (6,)
+        history.add(_record("c", 0.3))
+    assert reader.execute("SELECT COUNT(*) FROM stages").fetchone() == (9,)
+    command, finished = reader.execute("SELECT command, finished FROM runs").fetchone()
+    assert command == "batch"
+    assert finished is not None
+
+
+def test_stage_stats_and_slowest_brands(tmp_path: Path) -> None:
+    path = tmp_path / "history.sqlite"
+    with RunHistory(path, "batch") as history:
+        for i in range(1, 11):
+            history.add(_record(f"b{i}", i / 10, website="failed" if i == 10 else "done"))
+    db = sqlite3.connect(path)
+
+    stats = {s.stage: s for s in stage_stats(db, 0, 2e10)}
+    tokens = stats["tokens"]
+    assert (tokens.runs, tokens.p50, tokens.p90, tokens.max) == (10, 0.5, 0.9, 1.0)
+    assert stats["palette"].reused == 1.0
+    assert stats["palette"].p50 is None
+    assert stats["website"].failed == pytest.approx(0.1)
+
+    slowest = slowest_brands(db, 0, 2e10, limit=2)
+    assert [(b.slug, b.slowest_stage) for b in slowest] == [("b10", "tokens"), ("b9", "tokens")]
+    assert slowest[0].seconds == pytest.approx(1.5)
+
+
+def test_regressions_compare_windows(db: sqlite3.Connection) -> None:
+    now = 100 * DAY
+    for seconds in (1.0, 1.0, 1.2):
+        _insert(db, now - 10 * DAY, "card_3d", seconds)
+        _insert(db, now - 10 * DAY, "tokens", seconds / 100)
+    for seconds in (1.5, 1.6, 1.7):
+        _insert(db, now - DAY, "card_3d", seconds)
+    _insert(db, now - DAY, "website", 0.2)
+
+    found = {r.stage: r for r in regressions(db, 7 * DAY, now)}
+    assert set(found) == {"card_3d"}
+    assert (found["card_3d"].before, found["card_3d"].now) == (1.0, 1.6)
+    assert found["card_3d"].change == pytest.approx(60.0)
+
+
+def test_ai_fallback_rate(tmp_path: Path) -> None:
+    path = tmp_path / "history.sqlite"
+    with RunHistory(path, "generate"):
+        AI_REQUESTS.inc("palette", "ok", amount=3)
+        AI_REQUESTS.inc("palette", "fallback")
+    db = sqlite3.connect(path)
+    assert db.execute("SELECT ai_requests, ai_fallbacks FROM runs").fetchone() == (4, 1)
+    assert ai_fallback_rate(db, 0, 2e10) == 0.25
+    assert ai_fallback_rate(db, 0, 1) is None
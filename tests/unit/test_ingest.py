@@ -0,0 +1,157 @@
+"""Tests for streaming bulk ingest of brand inputs."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+from typer.testing import CliRunner
+
+from thenine.cli import app
+from thenine.core.brand import BrandInput, slugify
+from thenine.core.ingest import ErrorReport, RowError, ingest, read_rows, validate_rows
+
+
+def _ingest(path: Path, **kwargs: Any) -> tuple[list[BrandInput], list[RowError]]:
+    errors: list[RowError] = []
+    return list(ingest(path, errors.append, **kwargs)), errors
+
+
+class TestSlugify:
+    @pytest.mark.parametrize(
+        ("name", "slug"),
+        [
+            ("Acme Corp", "acme-corp"),
+            ("Café & Co.", "cafe-co"),
+            ("  my_cool__project ", "my-cool-project"),
+            ("a/b", "a-b"),
+            ("!!!", ""),
+        ],
+    )
+    def test_slugify(self, name: str, slug: str) -> None:
+        assert slugify(name) == slug
+
+    def test_brand_slug_never_empty(self) -> None:
+        assert BrandInput(name="!!!").slug == "brand"
+
+
+class TestReadRows:
+    def test_csv_nests_contact_columns(self, tmp_path: Path) -> None:
+        path = tmp_path / "brands.csv"
+        path.write_text(
+            "name,domain,contact_email\nAcme,acme.com,jan@acme.com\n,,\n", encoding="utf-8"
+        )
+        ((line, row),) = read_rows(path)  # type: ignore[misc]
+        assert line == 2
+        assert row == {
+            "name": "Acme",
+            "domain": "acme.com",
+            "contact": {"email": "jan@acme.com", "name": "Acme", "website": "acme.com"},
+        }
+
+    def test_excel_export(self, tmp_path: Path) -> None:
+        path = tmp_path / "brands.csv"
+        text = '﻿Name;Contact Email;Description\r\nCafé;a@b.cz;"two\r\nlines"\r\nBar;;\r\n'
+        path.write_bytes(text.encode("cp1252", errors="ignore"))
+        rows = list(read_rows(path))
+        assert [line for line, _ in rows] == [3, 4]  # type: ignore[misc]
+        assert rows[0][1]["name"] == "Café"  # type: ignore[index]
+        assert rows[0][1]["contact"]["email"] == "a@b.cz"  # type: ignore[index]
+
+    def test_utf8_bom(self, tmp_path: Path) -> None:
+        path = tmp_path / "brands.csv"
+        path.write_bytes("name\nCafé\n".encode("utf-8-sig"))
+        ((_, row),) = read_rows(path)  # type: ignore[misc]
+        assert row["name"] == "Café"
+
+    def test_jsonl_bad_lines_become_errors(self, tmp_path: Path) -> None:
+        path = tmp_path / "brands.jsonl"
+        path.write_text('{"name": "Acme"}\n\n{oops\n[1]\n', encoding="utf-8")
+        first, bad_json, not_object = read_rows(path)
+        assert first[0] == 1
+        assert isinstance(bad_json, RowError) and bad_json.line == 3
+        assert isinstance(not_object, RowError) and not_object.line == 4
+
+    def test_unsupported_type(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="Unsupported"):
+            list(read_rows(tmp_path / "brands.xlsx"))
+
+
+class TestValidateRows:
+    def test_bad_rows_do_not_drop_good_rows(self) -> None:
+        rows = [
+            (1, {"name": "A"}),
+            (2, {"name": ""}),
+            (3, {"name": "C", "contact": {"name": "C", "email": "nope"}}),
+            (4, {"name": "D"}),
+        ]
+        results = list(validate_rows(rows, chunk_size=3))
+        assert [r[0] if isinstance(r, tuple) else r.line for r in results] == [1, 2, 3, 4]
+        assert isinstance(results[1], RowError) and results[1].field == "name"
+        assert isinstance(results[2], RowError) and results[2].field == "contact.email"
+        assert isinstance(results[3], tuple) and results[3][1].name == "D"
+
+    def test_streams_in_chunks(self) -> None:
+        consumed = 0
+
+        def rows() -> Iterator[tuple[int, dict[str, Any]]]:
+            nonlocal consumed
+            for i in range(1_000_000):
+                consumed += 1
+                yield i, {"name": f"Brand {i}"}
+
+        results = validate_rows(rows(), chunk_size=100)
+        for _ in range(150):
+            next(results)
+        assert consumed == 200
+
+
+class TestIngest:
+    def test_duplicates_and_invalid_rows(self, tmp_path: Path) -> None:
+        path = tmp_path / "brands.csv"
+        path.write_text(
+            "name,contact_email\nAcme Corp,\nBad,nope\nacme-corp,\n???,\nBistro,\n",
+            encoding="utf-8",
+        )
+        brands, errors = _ingest(path, chunk_size=2)
+        assert [b.name for b in brands] == ["Acme Corp", "Bistro"]
+        assert [(e.line, e.field) for e in errors] == [
+            (3, "contact.email"),
+            (4, "name"),
+            (5, "name"),
+        ]
+        assert "first on line 2" in errors[1].message
+
+    def test_error_report(self, tmp_path: Path) -> None:
+        path = tmp_path / "brands.jsonl"
+        path.write_text('{"name": ""}\n{"name": "Ok"}\n', encoding="utf-8")
+        with ErrorReport(tmp_path / "errors.jsonl") as report:
+            assert [b.name for b in ingest(path, report)] == ["Ok"]
+        assert report.count == 1
+        (line,) = (tmp_path / "errors.jsonl").read_text(encoding="utf-8").splitlines()
+        assert json.loads(line)["line"] == 1
+
+    def test_csv_error_report(self, tmp_path: Path) -> None:
+        report = ErrorReport(tmp_path / "errors.csv")
+        report(RowError(7, "name", "bad", "x"))
+        report.close()
+        text = (tmp_path / "errors.csv").read_text(encoding="utf-8")
+        assert text.splitlines() == ["line,field,message,value", "7,name,bad,x"]
+
+    def test_no_errors_no_report_file(self, tmp_path: Path) -> None:
+        with ErrorReport(tmp_path / "errors.jsonl"):
+            pass
+        assert not (tmp_path / "errors.jsonl").exists()
+
+
+def test_validate_command(tmp_path: Path) -> None:
+    path = tmp_path / "brands.csv"
+    path.write_text("name\nAcme\nAcme\n", encoding="utf-8")
+    report = tmp_path / "errors.jsonl"
+    result = CliRunner().invoke(app, ["validate", str(path), "--errors", str(report)])
+    assert result.exit_code == 1
+    assert "1 valid rows, 1 rejected" in result.output
+    assert report.exists()
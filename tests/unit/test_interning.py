@@ -0,0 +1,82 @@
+"""Tests for the flyweight model pool."""
+
+from __future__ import annotations
+
+import gc
+from pathlib import Path
+
+from thenine.core.brand import BrandColor, BrandInput, BrandPalette, FontSpec
+from thenine.core.interning import (
+    clear_pool,
+    intern_model,
+    intern_palette,
+    pool_counts,
+    pool_size,
+)
+from thenine.core.palette import PaletteGenerator
+from thenine.core.snapshot import PackageSnapshot, load_snapshot, save_snapshot
+from thenine.core.typography import TypographySelector
+
+
+def _color(hex_value: str = "#f8fafc") -> BrandColor:
+    return BrandColor(
+        name="Cloud", hex=hex_value, oklch_l=0.98, oklch_c=0.005, oklch_h=250.0, purpose="neutral"
+    )
+
+
+class TestInternModel:
+    def test_equal_models_share_instance(self) -> None:
+        first = intern_model(_color())
+        assert intern_model(_color()) is first
+
+    def test_different_values_stay_distinct(self) -> None:
+        assert intern_model(_color("#000000")) is not intern_model(_color("#ffffff"))
+
+    def test_type_is_part_of_key(self) -> None:
+        spec = intern_model(FontSpec(family="Inter"))
+        assert intern_model(FontSpec(family="Inter")) is spec
+        assert pool_counts().get("FontSpec", 0) >= 1
+
+    def test_unused_instances_are_dropped(self) -> None:
+        clear_pool()
+        color = intern_model(_color("#123456"))
+        assert pool_size() == 1
+        del color
+        gc.collect()
+        assert pool_size() == 0
+
+
+class TestPipelineInterning:
+    def test_palettes_share_colors(self) -> None:
+        generator = PaletteGenerator(api_key="")
+        a = generator.generate("technology", "modern", "Acme", use_ai=False)
+        b = generator.generate("technology", "modern", "Acme", use_ai=False)
+        assert a is b
+
+    def test_mono_font_is_shared(self) -> None:
+        selector = TypographySelector()
+        a = selector.select("technology", "modern", "Acme")
+        b = selector.select("food", "warm", "Crumb")
+        assert a.mono is b.mono
+
+    def test_intern_palette_interns_children(self, sample_palette: BrandPalette) -> None:
+        copy = BrandPalette.model_validate(sample_palette.model_dump())
+        interned = intern_palette(sample_palette)
+        assert intern_palette(copy) is interned
+        assert interned.primary is intern_model(copy.primary)
+
+    def test_snapshot_reload_uses_pool(
+        self, sample_brand_input: BrandInput, tmp_output: Path
+    ) -> None:
+        selector = TypographySelector()
+        palette = PaletteGenerator(api_key="").generate("technology", "modern", "Acme", use_ai=False)
+        typography = selector.select("technology", "modern", "Acme")
+        save_snapshot(
+            PackageSnapshot(input=sample_brand_input, palette=palette, typography=typography),
+            tmp_output,
+        )
+
+        loaded = load_snapshot(tmp_output)
+        assert loaded is not None
+        assert loaded.palette is palette
+        assert loaded.typography is typography
@@ -0,0 +1,166 @@
+"""Tests for the Prometheus metrics registry and pipeline instrumentation."""
+
+from __future__ import annotations
+
+import stat
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from thenine.core.brand import BrandInput
+from thenine.core.metrics import (
+    AI_REQUESTS,
+    CACHE_HITS,
+    CACHE_MISSES,
+    REGISTRY,
+    STAGE_CACHE,
+    STAGE_SECONDS,
+    Registry,
+    track_cache,
+)
+from thenine.core.palette import PaletteGenerator
+from thenine.core.pipeline import Pipeline, Stage, StageCheck, StageContext
+from thenine.core.workers import WorkerPool
+
+
+def _ok(ctx: StageContext, deps: dict[str, Any]) -> str:
+    return "ok"
+
+
+def _fail(ctx: StageContext, deps: dict[str, Any]) -> None:
+    raise RuntimeError("boom")
+
+
+def _record_hit() -> None:
+    STAGE_CACHE.inc("metrics_test_job", "hit")
+
+
+@lru_cache(maxsize=4)
+def _square(x: int) -> int:
+    return x * x
+
+
+@lru_cache(maxsize=4)
+def _cube(x: int) -> int:
+    return x * x * x
+
+
+track_cache("test_cube", _cube)
+
+
+def _cube_twice() -> None:
+    _cube(2)
+    _cube(2)
+
+
+def test_render_counter_and_histogram() -> None:
+    registry = Registry()
+    requests = registry.counter("test_requests_total", "Requests.", ("route",))
+    latency = registry.histogram("test_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    requests.inc("/a")
+    requests.inc("/a", amount=2)
+    latency.observe(0.05, "/a")
+    latency.observe(0.5, "/a")
+    latency.observe(5.0, "/a")
+
+    lines = registry.render().splitlines()
+    assert lines[:3] == [
+        "# HELP test_requests_total Requests.",
+        "# TYPE test_requests_total counter",
+        'test_requests_total{route="/a"} 3',
+    ]
+    assert "# TYPE test_seconds histogram" in lines
+    assert 'test_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'test_seconds_bucket{route="/a",le="1"} 2' in lines
+    assert 'test_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+    assert 'test_seconds_sum{route="/a"} 5.55' in lines
+    assert 'test_seconds_count{route="/a"} 3' in lines
+
+    with pytest.raises(ValueError, match="already registered"):
+        registry.counter("test_requests_total", "Again.")
+
+
+def test_drain_and_merge() -> None:
+    worker, parent = Registry(), Registry()
+    totals = [r.counter("test_total", "Total.", ("kind",)) for r in (worker, parent)]
+    latency = [r.histogram("test_seconds", "Latency.", buckets=(1.0,)) for r in (worker, parent)]
+    totals[0].inc("a")
+    latency[0].observe(0.5)
+
+    parent.merge(worker.drain())
+    parent.merge(worker.drain())
+    assert totals[1].value("a") == 1
+    assert latency[1].count() == 1
+    assert worker.drain() == {}
+
+
+def test_tracked_cache_and_textfile(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    # node_exporter reads the textfile as another user
+    monkeypatch.setattr("thenine.core.manifest._UMASK", 0o022)
+    track_cache("test_square", _square)
+    _square(3)
+    _square(3)
+    path = REGISTRY.write_textfile(tmp_path / "metrics" / "thenine.prom")
+    text = path.read_text(encoding="utf-8")
+    assert 'thenine_cache_hits_total{cache="test_square"} 1' in text
+    assert 'thenine_cache_misses_total{cache="test_square"} 1' in text
+    assert 'thenine_cache_hits_total{cache="oklch_to_hex"}' in text
+    assert [p.name for p in path.parent.iterdir()] == ["thenine.prom"]
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+def test_pipeline_records_stage_latency_and_cache(
+    sample_brand_input: BrandInput, tmp_output: Path
+) -> None:
+    ctx = StageContext(input=sample_brand_input, output_dir=tmp_output)
+    stages = [Stage("m_ok", _ok), Stage("m_bad", _fail), Stage("m_cached", _ok)]
+    before = (
+        STAGE_SECONDS.count("m_ok", "done"),
+        STAGE_SECONDS.count("m_bad", "failed"),
+        STAGE_CACHE.value("m_cached", "hit"),
+        STAGE_CACHE.value("m_ok", "miss"),
+    )
+
+    def check(stage: Stage, deps: dict[str, Any]) -> StageCheck:
+        return StageCheck(stage.name == "m_cached", "test", "ok")
+
+    Pipeline(stages, max_processes=0).run(ctx, check=check)
+    after = (
+        STAGE_SECONDS.count("m_ok", "done"),
+        STAGE_SECONDS.count("m_bad", "failed"),
+        STAGE_CACHE.value("m_cached", "hit"),
+        STAGE_CACHE.value("m_ok", "miss"),
+    )
+    assert [a - b for a, b in zip(after, before, strict=True)] == [1, 1, 1, 1]
+
+
+def test_worker_metrics_are_merged_into_parent() -> None:
+    before = STAGE_CACHE.value("metrics_test_job", "hit")
+    with WorkerPool(1, max_jobs=0, max_rss_mb=0) as pool:
+        for _ in range(2):
+            pool.submit(_record_hit).result()
+    assert STAGE_CACHE.value("metrics_test_job", "hit") == before + 2
+
+
+def test_worker_cache_lookups_are_merged_into_parent() -> None:
+    before = CACHE_HITS.value("test_cube"), CACHE_MISSES.value("test_cube")
+    with WorkerPool(1, max_jobs=0, max_rss_mb=0) as pool:
+        for _ in range(2):
+            pool.submit(_cube_twice).result()
+    # the worker's cache stays warm between jobs: 1 miss, then 3 hits
+    after = CACHE_HITS.value("test_cube"), CACHE_MISSES.value("test_cube")
+    assert after == (before[0] + 3, before[1] + 1)
+
+
+def test_palette_ai_fallback_is_counted(monkeypatch: pytest.MonkeyPatch) -> None:
+    generator = PaletteGenerator(api_key="test-key")
+
+    def unavailable(*args: Any) -> None:
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(generator, "_generate_with_ai", unavailable)
+    before = AI_REQUESTS.value("palette", "fallback")
+    generator.generate("technology", "modern", "Acme")
+    assert AI_REQUESTS.value("palette", "fallback") == before + 1
@@ -0,0 +1,98 @@
+"""Tests for the multi-brand token pack."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from thenine.core.brand import BrandTokens
+from thenine.core.pack import (
+    collect_declarations,
+    export_pack,
+    load_pack_brand,
+    split_shared,
+)
+from thenine.core.palette import PaletteGenerator
+from thenine.core.tokens import create_tokens, render_css
+from thenine.core.typography import TypographySelector
+
+
+@pytest.fixture
+def brands() -> dict[str, BrandTokens]:
+    result = {}
+    for name, industry in [("Acme", "technology"), ("Bolt", "finance"), ("Crumb", "food")]:
+        palette = PaletteGenerator().generate(industry, "modern", name, use_ai=False)
+        typography = TypographySelector().select(industry, "modern", name)
+        result[name.lower()] = create_tokens(palette, typography)
+    return result
+
+
+class TestSplitShared:
+    def test_defaults_are_shared(self, brands: dict[str, BrandTokens]) -> None:
+        shared, overrides = split_shared(collect_declarations(brands))
+        assert shared["--spacing-md"] == "1rem"
+        assert shared["--radius-full"] == "9999px"
+        for properties in overrides.values():
+            assert "--spacing-md" not in properties
+            assert "--color-primary" in properties or shared.get("--color-primary")
+
+    def test_most_common_value_wins(self) -> None:
+        declared = {
+            "a": {"--x": "1", "--y": "a"},
+            "b": {"--x": "1", "--y": "b"},
+            "c": {"--x": "2"},
+        }
+        shared, overrides = split_shared(declared)
+        assert shared == {"--x": "1"}
+        assert overrides == {"a": {"--y": "a"}, "b": {"--y": "b"}, "c": {"--x": "2"}}
+
+    def test_duplicate_slug_rejected(self, brands: dict[str, BrandTokens]) -> None:
+        with pytest.raises(ValueError, match="Duplicate"):
+            collect_declarations([("a", brands["acme"]), ("a", brands["bolt"])])
+
+
+class TestExportPack:
+    def test_writes_css_and_index(self, brands: dict[str, BrandTokens], tmp_output: Path) -> None:
+        paths = export_pack(brands, tmp_output)
+        css = paths["css"].read_text()
+        assert css.startswith(":root {")
+        assert '[data-brand="acme"] {' in css
+        assert css.count("--spacing-md:") == 1
+
+    def test_index_reconstructs_every_brand(
+        self, brands: dict[str, BrandTokens], tmp_output: Path
+    ) -> None:
+        index = json.loads(export_pack(brands, tmp_output)["json"].read_text())
+        assert len(index["values"]) == len(set(index["values"]))
+
+        for slug, tokens in brands.items():
+            expected = {
+                line.strip().split(": ", 1)[0]: line.strip().split(": ", 1)[1].rstrip(";")
+                for line in render_css(tokens).splitlines()
+                if line.strip().startswith("--")
+            }
+            assert load_pack_brand(index, slug) == expected
+
+    def test_pack_is_smaller_than_separate_files(
+        self, brands: dict[str, BrandTokens], tmp_output: Path
+    ) -> None:
+        many = {f"{slug}-{i}": tokens for i in range(20) for slug, tokens in brands.items()}
+        css = export_pack(many, tmp_output)["css"]
+        separate = sum(len(render_css(tokens).encode()) for tokens in many.values())
+        assert css.stat().st_size < separate / 2
+
+    def test_selector_is_escaped(self, tmp_output: Path) -> None:
+        brands = {
+            'we"ird': BrandTokens(colors={"primary": "#000000"}, fonts={}),
+            "plain": BrandTokens(colors={"primary": "#ffffff"}, fonts={}),
+            "other": BrandTokens(colors={"primary": "#ffffff"}, fonts={}),
+        }
+        css = export_pack(brands, tmp_output)["css"].read_text()
+        assert '[data-brand="we\\"ird"] {' in css
+
+    def test_unknown_brand(self, brands: dict[str, BrandTokens], tmp_output: Path) -> None:
+        index = json.loads(export_pack(brands, tmp_output)["json"].read_text())
+        with pytest.raises(KeyError):
+            load_pack_brand(index, "nope")
@@ -15,6 +15,7 @@ from thenine.core.palette import (
     _create_color,
     _ensure_accessible,
     _hex_to_oklch,
+    _oklch_to_hex,
     check_contrast,
 )
 
@@ -38,6 +39,16 @@ class TestCreateColor:
         color = _create_color("Test", lightness=0.5, chroma=0.1, hue=400.0, purpose="test")
         assert 0 <= color.oklch_h <= 360
 
+    def test_conversion_is_cached(self) -> None:
+        _oklch_to_hex.cache_clear()
+        first = _create_color("A", lightness=0.5, chroma=0.1, hue=120.0, purpose="primary")
+        second = _create_color("B", lightness=0.5, chroma=0.1, hue=120.0, purpose="accent")
+        assert first.hex == second.hex
+        assert _oklch_to_hex.cache_info().hits == 1
+        assert first.hex == Color("oklch", [0.5, 0.1, 120.0]).convert("srgb").fit("srgb").to_string(
+            hex=True
+        )
+
 
 class TestHexToOklch:
     def test_white(self) -> None:
@@ -0,0 +1,229 @@
+"""Tests for the DAG pipeline executor."""
+
+from __future__ import annotations
+
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from thenine.core.brand import BrandInput
+from thenine.core.pipeline import (
+    Pipeline,
+    PipelineError,
+    PipelineOptions,
+    Stage,
+    StageCheck,
+    StageContext,
+    StageEvent,
+    check_graph,
+    generate_stages,
+    run_brand,
+)
+
+
+def _pid(ctx: StageContext, deps: dict[str, Any]) -> int:
+    return os.getpid()
+
+
+def _value(value: Any) -> Any:
+    return lambda ctx, deps: value
+
+
+def _fail(ctx: StageContext, deps: dict[str, Any]) -> None:
+    raise RuntimeError("boom")
+
+
+@pytest.fixture
+def ctx(sample_brand_input: BrandInput, tmp_output: Path) -> StageContext:
+    return StageContext(input=sample_brand_input, output_dir=tmp_output)
+
+
+class TestCheckGraph:
+    def test_orders_dependencies_first(self) -> None:
+        stages = [
+            Stage("c", _value(3), ("a", "b")),
+            Stage("b", _value(2), ("a",)),
+            Stage("a", _value(1)),
+        ]
+        assert check_graph(stages) == ["a", "b", "c"]
+
+    def test_unknown_dependency(self) -> None:
+        with pytest.raises(PipelineError, match="unknown stage"):
+            check_graph([Stage("a", _value(1), ("missing",))])
+
+    def test_cycle(self) -> None:
+        with pytest.raises(PipelineError, match="cycle"):
+            check_graph([Stage("a", _value(1), ("b",)), Stage("b", _value(1), ("a",))])
+
+
+class TestPipeline:
+    def test_passes_dependency_results(self, ctx: StageContext) -> None:
+        stages = [
+            Stage("a", _value(2)),
+            Stage("b", _value(3)),
+            Stage("sum", lambda ctx, deps: deps["a"] + deps["b"], ("a", "b")),
+        ]
+        result = Pipeline(stages, max_processes=0).run(ctx)
+        assert result.ok
+        assert result.results["sum"] == 5
+        assert set(result.timings) == {"a", "b", "sum"}
+
+    def test_independent_stages_overlap(self, ctx: StageContext) -> None:
+        barrier = threading.Barrier(2, timeout=5)
+
+        def meet(ctx: StageContext, deps: dict[str, Any]) -> bool:
+            barrier.wait()  # only returns if both stages run at the same time
+            return True
+
+        result = Pipeline([Stage("a", meet), Stage("b", meet)], max_processes=0).run(ctx)
+        assert result.results == {"a": True, "b": True}
+
+    def test_failure_skips_dependents_only(self, ctx: StageContext) -> None:
+        stages = [
+            Stage("bad", _fail),
+            Stage("after_bad", _value(1), ("bad",)),
+            Stage("after_after", _value(1), ("after_bad",)),
+            Stage("independent", _value(1)),
+        ]
+        result = Pipeline(stages, max_processes=0).run(ctx)
+        assert not result.ok
+        assert isinstance(result.errors["bad"], RuntimeError)
+        assert result.skipped == ["after_bad", "after_after"]
+        assert result.results == {"independent": 1}
+
+    def test_done_stages_are_not_rerun(self, ctx: StageContext) -> None:
+        stages = [Stage("a", _fail), Stage("b", lambda ctx, deps: deps["a"] * 2, ("a",))]
+        result = Pipeline(stages, max_processes=0).run(ctx, done={"a": 21})
+        assert result.results == {"a": 21, "b": 42}
+
+    def test_events_in_order(self, ctx: StageContext) -> None:
+        events: list[StageEvent] = []
+        stages = [Stage("a", _value(1)), Stage("b", _fail, ("a",)), Stage("c", _value(1), ("b",))]
+        Pipeline(stages, max_processes=0).run(ctx, listener=events.append)
+        assert [(e.stage, e.status) for e in events] == [
+            ("a", "started"),
+            ("a", "done"),
+            ("b", "started"),
+            ("b", "failed"),
+            ("c", "skipped"),
+        ]
+
+    def test_fresh_check_reuses_result(self, ctx: StageContext) -> None:
+        events: list[StageEvent] = []
+        stages = [Stage("a", _fail), Stage("b", lambda ctx, deps: deps["a"] + 1, ("a",))]
+
+        def check(stage: Stage, deps: dict[str, Any]) -> StageCheck:
+            if stage.name == "a":
+                return StageCheck(True, "inputs unchanged", 41)
+            return StageCheck(False, "changed: a")
+
+        result = Pipeline(stages, max_processes=0).run(ctx, listener=events.append, check=check)
+        assert result.results == {"a": 41, "b": 42}
+        assert [(e.stage, e.status, e.reason) for e in events[:2]] == [
+            ("a", "unchanged", "inputs unchanged"),
+            ("b", "started", "changed: a"),
+        ]
+
+    def test_listener_runs_on_calling_thread(self, ctx: StageContext) -> None:
+        threads = set()
+        stages = [Stage("a", _value(1)), Stage("b", _value(2))]
+        Pipeline(stages, max_processes=0).run(
+            ctx, listener=lambda e: threads.add(threading.get_ident())
+        )
+        assert threads == {threading.get_ident()}
+
+    def test_process_stage_runs_in_worker(self, ctx: StageContext) -> None:
+        stages = [Stage("pid", _pid, kind="process")]
+        assert Pipeline(stages, max_processes=1).run(ctx).results["pid"] != os.getpid()
+
+    def test_process_stage_falls_back_to_threads(self, ctx: StageContext) -> None:
+        stages = [Stage("pid", _pid, kind="process")]
+        assert Pipeline(stages, max_processes=0).run(ctx).results["pid"] == os.getpid()
+
+
+class TestGenerateStages:
+    def test_graph(self) -> None:
+        stages = {s.name: s for s in generate_stages(PipelineOptions())}
+        assert stages["typography"].deps == ()
+        assert stages["card_3d"].deps == ()
+        assert stages["card_pdf"].kind == stages["card_3d"].kind == "process"
+        assert set(stages["website"].deps) == {"palette", "typography", "tokens"}
+
+    def test_skips(self) -> None:
+        names = {s.name for s in generate_stages(PipelineOptions(skip_3d=True, skip_website=True))}
+        assert names == {"palette", "typography", "tokens", "card_pdf"}
+
+    def test_tokens_stage_exports(self, ctx: StageContext) -> None:
+        options = PipelineOptions(use_ai=False, skip_3d=True, skip_website=True, formats=("css",))
+        stages = [s for s in generate_stages(options) if s.name != "card_pdf"]
+        ctx = ctx.model_copy(update={"options": options})
+        result = Pipeline(stages, max_processes=0).run(ctx)
+        tokens, paths = result.results["tokens"]
+        assert tokens.colors["primary"] == result.results["palette"].primary.hex
+        assert paths["css"].exists()
+
+    def test_tokens_stage_tonal_scales(self, ctx: StageContext) -> None:
+        options = PipelineOptions(
+            use_ai=False,
+            skip_pdf=True,
+            skip_3d=True,
+            skip_website=True,
+            formats=("css",),
+            tonal_scales=True,
+        )
+        ctx = ctx.model_copy(update={"options": options})
+        result = Pipeline(generate_stages(options), max_processes=0).run(ctx)
+        tokens, paths = result.results["tokens"]
+        assert "accent-950" in tokens.colors
+        assert "--color-primary-500:" in paths["css"].read_text(encoding="utf-8")
+
+
+class TestRunBrand:
+    OPTIONS = PipelineOptions(use_ai=False, skip_pdf=True, skip_3d=True, formats=("css",))
+
+    @pytest.fixture
+    def website_calls(self, monkeypatch: pytest.MonkeyPatch) -> list[str]:
+        calls: list[str] = []
+
+        def fake_website(ctx: StageContext, deps: dict[str, Any]) -> Path:
+            calls.append(ctx.input.tagline)
+            page = ctx.output_dir / "website" / "index.html"
+            page.parent.mkdir(parents=True, exist_ok=True)
+            page.write_text(ctx.input.tagline)
+            return page.parent
+
+        monkeypatch.setattr("thenine.core.pipeline._run_website", fake_website)
+        return calls
+
+    def _run(self, ctx: StageContext, **kwargs: Any) -> dict[str, str]:
+        events: list[StageEvent] = []
+        ctx = ctx.model_copy(update={"options": self.OPTIONS})
+        run = run_brand(ctx, listener=events.append, **kwargs)
+        assert run.ok
+        return {e.stage: e.status for e in events if e.status != "started"}
+
+    def test_rebuilds_only_changed_stages(
+        self, ctx: StageContext, website_calls: list[str]
+    ) -> None:
+        from thenine.core.snapshot import load_snapshot
+
+        self._run(ctx)
+        assert self._run(ctx, snapshot=load_snapshot(ctx.output_dir)) == {
+            "palette": "unchanged",
+            "typography": "unchanged",
+            "tokens": "done",
+            "website": "unchanged",
+        }
+
+        edited = ctx.model_copy(update={"input": ctx.input.model_copy(update={"tagline": "New"})})
+        statuses = self._run(edited, snapshot=load_snapshot(ctx.output_dir))
+        assert statuses["palette"] == "unchanged"
+        assert statuses["website"] == "done"
+        assert website_calls == [ctx.input.tagline, "New"]
+
+        statuses = self._run(edited, snapshot=load_snapshot(ctx.output_dir), force=True)
+        assert set(statuses.values()) == {"done"}
+
@@ -0,0 +1,119 @@
+"""Tests for stage profiling and Chrome trace output."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from thenine.core.brand import BrandInput
+from thenine.core.pipeline import Pipeline, Stage, StageContext
+from thenine.core.profiling import Profiler, rss_mb, run_profiled, span
+
+
+def _steps(ctx: StageContext, deps: dict[str, Any]) -> int:
+    with span("outer"), span("inner"):
+        pass
+    return os.getpid()
+
+
+def _allocate(ctx: StageContext, deps: dict[str, Any]) -> list[bytes]:
+    return [bytes(1024) for _ in range(20_000)]
+
+
+def _fail(ctx: StageContext, deps: dict[str, Any]) -> None:
+    with span("before_failure"):
+        raise RuntimeError("boom")
+
+
+@pytest.fixture
+def ctx(sample_brand_input: BrandInput, tmp_output: Path) -> StageContext:
+    return StageContext(input=sample_brand_input, output_dir=tmp_output)
+
+
+def test_span_is_shared_noop_outside_profiled_stage() -> None:
+    assert span("a") is span("b")
+
+
+def test_run_profiled_records_nested_spans(ctx: StageContext) -> None:
+    profiled = run_profiled(_steps, "stage", None, None, ctx, {})
+    assert profiled.result == os.getpid()
+    assert [(s.name, s.depth) for s in profiled.spans] == [("inner", 2), ("outer", 1), ("stage", 0)]
+    assert all(s.stage == "stage" and s.wall >= 0 for s in profiled.spans)
+    # Recording stops with the stage
+    assert span("after") is span("again")
+
+
+def test_run_profiled_keeps_spans_of_failed_stage(ctx: StageContext) -> None:
+    profiled = run_profiled(_fail, "stage", None, None, ctx, {})
+    assert isinstance(profiled.error, RuntimeError)
+    assert [s.name for s in profiled.spans] == ["before_failure", "stage"]
+
+
+def test_pipeline_collects_spans_from_threads_and_processes(
+    ctx: StageContext, tmp_path: Path
+) -> None:
+    profiler = Profiler(cprofile_dir=tmp_path / "prof")
+    stages = [Stage("threaded", _steps), Stage("forked", _steps, kind="process")]
+    result = Pipeline(stages, max_processes=1).run(ctx, profiler=profiler)
+
+    assert result.results["forked"] != os.getpid()
+    pids = {s.stage: s.pid for s in profiler.spans if s.depth == 0}
+    assert pids == {"threaded": os.getpid(), "forked": result.results["forked"]}
+    summary = [(s.stage, s.name) for s in profiler.summary()]
+    assert summary.index(("forked", "forked")) + 1 == summary.index(("forked", "outer"))
+    assert {p.name for p in (tmp_path / "prof").iterdir()} == {"threaded.prof", "forked.prof"}
+
+
+def test_pipeline_reports_failed_stage_with_profiler(ctx: StageContext) -> None:
+    profiler = Profiler()
+    result = Pipeline([Stage("bad", _fail)], max_processes=0).run(ctx, profiler=profiler)
+    assert isinstance(result.errors["bad"], RuntimeError)
+    assert {s.name for s in profiler.spans} == {"bad", "before_failure"}
+
+
+def test_write_trace(ctx: StageContext, tmp_path: Path) -> None:
+    profiler = Profiler()
+    profiler.add("stage", run_profiled(_steps, "stage", None, None, ctx, {}))
+    trace = json.loads(profiler.write_trace(tmp_path / "trace.json").read_text(encoding="utf-8"))
+    events = {e["name"]: e for e in trace["traceEvents"]}
+    assert set(events) == {"stage", "outer", "inner"}
+    assert events["stage"]["ph"] == "X"
+    assert events["stage"]["cat"] == "stage"
+    assert events["stage"]["ts"] <= events["outer"]["ts"]
+    assert events["stage"]["dur"] >= events["outer"]["dur"]
+
+
+def test_memory_reports_rss_and_allocation_sites(ctx: StageContext) -> None:
+    profiled = run_profiled(_allocate, "stage", None, 3, ctx, {})
+    memory = profiled.memory
+    assert memory is not None
+    assert memory.rss_peak_mb >= memory.rss_before_mb > 0
+    assert memory.python_peak_mb > 15
+    site = memory.top[0]
+    assert site.site.endswith(f"test_profiling.py:{_allocate.__code__.co_firstlineno + 1}")
+    assert site.size_kib > 15_000
+    assert len(memory.top) <= 3
+    assert memory.to_dict()["top"][0]["blocks"] >= 20_000
+
+
+def test_memory_rss_only(ctx: StageContext) -> None:
+    memory = run_profiled(_steps, "stage", None, 0, ctx, {}).memory
+    assert memory is not None
+    assert memory.top == []
+    assert memory.python_peak_mb == 0.0
+
+
+def test_pipeline_collects_memory_per_stage(ctx: StageContext) -> None:
+    profiler = Profiler(memory_top=2)
+    stages = [Stage("a", _allocate), Stage("b", _steps, ("a",))]
+    Pipeline(stages, max_threads=1, max_processes=0).run(ctx, profiler=profiler)
+    assert set(profiler.memory) == {"a", "b"}
+    assert profiler.memory["a"].top
+
+
+def test_rss_mb() -> None:
+    assert rss_mb() > 1
@@ -0,0 +1,155 @@
+"""Tests for the HTTP/JSON API server."""
+
+from __future__ import annotations
+
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import httpx
+import pytest
+
+from thenine.server import ThenineServer
+
+BRAND = {"name": "Acme", "industry": "technology", "mood": "modern"}
+TOKENS_ONLY = {"use_ai": False, "skip_pdf": True, "skip_3d": True, "skip_website": True}
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Iterator[ThenineServer]:
+    with ThenineServer(port=0, output_root=tmp_path, processes=0, queue_limit=1) as srv:
+        assert srv.ready.wait(30)
+        yield srv
+
+
+@pytest.fixture
+def client(server: ThenineServer) -> Iterator[httpx.Client]:
+    with httpx.Client(base_url=server.url, timeout=30) as c:
+        yield c
+
+
+def test_health_and_ready(client: httpx.Client) -> None:
+    health = client.get("/healthz").json()
+    assert health["status"] == "ok"
+    assert (health["queued"], health["running"], health["queue_limit"]) == (0, 0, 1)
+    assert client.get("/readyz").json() == {"ready": True}
+
+
+def test_palette(client: httpx.Client) -> None:
+    response = client.post("/palette", json={**BRAND, "use_ai": False})
+    assert response.status_code == 200
+    assert response.json()["primary"]["hex"].startswith("#")
+
+
+def test_tokens_with_formats(client: httpx.Client) -> None:
+    response = client.post("/tokens", json={**BRAND, "use_ai": False, "formats": ["json", "css"]})
+    assert response.status_code == 200
+    body = response.json()
+    assert "colors" in body["tokens"]
+    assert set(body["files"]) == {"tokens.json", "tokens.css"}
+    assert "primary-500" not in body["tokens"]["colors"]
+
+    response = client.post("/tokens", json={**BRAND, "use_ai": False, "tonal_scales": True})
+    assert "primary-500" in response.json()["tokens"]["colors"]
+
+    response = client.post("/tokens", json={**BRAND, "use_ai": False, "formats": ["nope"]})
+    assert response.status_code == 422
+
+
+def test_package_builds_incrementally(client: httpx.Client, tmp_path: Path) -> None:
+    request = {"input": BRAND, "options": TOKENS_ONLY}
+    first = client.post("/package", json=request).json()
+    assert first["status"] == "ok"
+    assert (tmp_path / "acme" / "tokens.json").exists()
+
+    second = client.post("/package", json=request).json()
+    assert second["stages"]["palette"] == "unchanged"
+
+
+def test_invalid_requests(client: httpx.Client) -> None:
+    response = client.post("/package", json={"input": {"name": ""}})
+    assert response.status_code == 422
+    assert response.json()["details"][0]["loc"][:2] == ["input", "name"]
+
+    assert client.post("/palette", content=b"{not json").status_code == 400
+    assert client.post("/nowhere", json={}).status_code == 404
+    assert client.get("/nowhere").status_code == 404
+
+
+def test_full_queue_is_rejected(
+    server: ThenineServer, client: httpx.Client, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    release = threading.Event()
+
+    def slow(*args: Any) -> dict[str, Any]:
+        release.wait(10)
+        return {"status": "ok"}
+
+    monkeypatch.setattr("thenine.server.generate_brand", slow)
+    request = {"input": BRAND, "options": TOKENS_ONLY}
+    first = threading.Thread(target=client.post, args=("/package",), kwargs={"json": request})
+    first.start()
+    try:
+        for _ in range(100):
+            if server.stats()["running"]:
+                break
+            threading.Event().wait(0.05)
+        response = client.post("/package", json=request)
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
+    finally:
+        release.set()
+        first.join()
+    assert server.stats()["rejected"] == 1
+    assert client.post("/package", json=request).json() == {"status": "ok"}
+
+
+def test_timed_out_job_keeps_its_slot(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    release = threading.Event()
+
+    def slow(*args: Any) -> dict[str, Any]:
+        release.wait(10)
+        return {"status": "ok"}
+
+    monkeypatch.setattr("thenine.server.generate_brand", slow)
+    request = {"input": BRAND, "options": TOKENS_ONLY}
+    with (
+        ThenineServer(
+            port=0, output_root=tmp_path, processes=0, queue_limit=1, job_timeout=0.2
+        ) as server,
+        httpx.Client(base_url=server.url, timeout=30) as client,
+    ):
+        try:
+            assert client.post("/package", json=request).status_code == 504
+            assert server.stats()["running"] == 1
+            assert client.post("/package", json=request).status_code == 503
+        finally:
+            release.set()
+        for _ in range(100):
+            if not server.stats()["running"]:
+                break
+            threading.Event().wait(0.05)
+        assert client.post("/package", json=request).json() == {"status": "ok"}
+
+
+def test_job_failure_is_500(client: httpx.Client, monkeypatch: pytest.MonkeyPatch) -> None:
+    def broken(*args: Any) -> bytes:
+        raise RuntimeError("renderer broke")
+
+    monkeypatch.setattr("thenine.server.render_card_pdf", broken)
+    response = client.post("/card/pdf", json={"input": BRAND})
+    assert response.status_code == 500
+    assert response.json() == {"error": "RuntimeError: renderer broke"}
+
+
+def test_metrics(client: httpx.Client) -> None:
+    assert client.post("/package", json={"input": BRAND, "options": TOKENS_ONLY}).status_code == 200
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert 'thenine_stage_duration_seconds_count{stage="tokens",status="done"}' in text
+    assert "thenine_jobs_served_total 1" in text
+    assert "thenine_jobs_queue_limit 1" in text
+    assert "thenine_ready 1" in text
@@ -0,0 +1,111 @@
+"""Tests for BrandPackage snapshots."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from thenine.core.brand import BrandInput, BrandPalette, BrandTypography
+from thenine.core.snapshot import (
+    SNAPSHOT_NAME,
+    PackageSnapshot,
+    StageRecord,
+    load_snapshot,
+    save_snapshot,
+)
+from thenine.core.tokens import create_tokens
+
+
+@pytest.fixture
+def complete(
+    sample_brand_input: BrandInput,
+    sample_palette: BrandPalette,
+    sample_typography: BrandTypography,
+) -> PackageSnapshot:
+    return PackageSnapshot(
+        input=sample_brand_input,
+        palette=sample_palette,
+        typography=sample_typography,
+        tokens=create_tokens(sample_palette, sample_typography),
+    )
+
+
+class TestPackageSnapshot:
+    def test_round_trip(self, complete: PackageSnapshot, tmp_output: Path) -> None:
+        path = save_snapshot(complete, tmp_output)
+        assert path == tmp_output / SNAPSHOT_NAME
+        assert load_snapshot(tmp_output) == complete
+
+    def test_partial_snapshot(self, sample_brand_input: BrandInput, tmp_output: Path) -> None:
+        save_snapshot(PackageSnapshot(input=sample_brand_input), tmp_output)
+        loaded = load_snapshot(tmp_output)
+        assert loaded is not None
+        assert loaded.palette is None
+        with pytest.raises(ValueError, match="incomplete"):
+            loaded.to_package()
+
+    def test_to_package(self, complete: PackageSnapshot, tmp_output: Path) -> None:
+        package = complete.to_package(tmp_output)
+        assert package.palette == complete.palette
+        assert package.output_path == tmp_output
+
+    def test_missing_or_corrupt(self, tmp_output: Path) -> None:
+        assert load_snapshot(tmp_output) is None
+        (tmp_output / SNAPSHOT_NAME).write_text("{not json")
+        assert load_snapshot(tmp_output) is None
+
+    def test_other_version_ignored(self, complete: PackageSnapshot, tmp_output: Path) -> None:
+        save_snapshot(complete.model_copy(update={"version": 0}), tmp_output)
+        assert load_snapshot(tmp_output) is None
+
+
+class TestArtifacts:
+    def test_paths_stored_relative(self, complete: PackageSnapshot, tmp_output: Path) -> None:
+        outside = tmp_output.parent / "elsewhere.pdf"
+        snapshot = complete.with_artifacts(
+            "card_pdf", [tmp_output / "business-card.pdf", outside], tmp_output
+        )
+        assert snapshot.artifacts["card_pdf"] == ["business-card.pdf", str(outside)]
+
+    def test_has_artifacts_requires_files(
+        self, complete: PackageSnapshot, tmp_output: Path
+    ) -> None:
+        pdf = tmp_output / "business-card.pdf"
+        snapshot = complete.with_artifacts("card_pdf", [pdf], tmp_output)
+        assert not snapshot.has_artifacts("card_pdf", tmp_output)
+        pdf.write_bytes(b"%PDF")
+        assert snapshot.has_artifacts("card_pdf", tmp_output)
+        assert not snapshot.has_artifacts("website", tmp_output)
+
+    def test_stored_result(self, complete: PackageSnapshot, tmp_output: Path) -> None:
+        stl, mf = tmp_output / "business-card.stl", tmp_output / "business-card.3mf"
+        snapshot = complete.with_artifacts("card_3d", [stl, mf], tmp_output)
+        assert snapshot.stored_result("palette", tmp_output) == (True, complete.palette)
+        assert snapshot.stored_result("card_3d", tmp_output) == (False, None)
+        stl.write_bytes(b"solid")
+        mf.write_bytes(b"PK")
+        assert snapshot.stored_result("card_3d", tmp_output) == (True, {"stl": stl, "3mf": mf})
+
+
+class TestStageRecord:
+    def test_changes(self) -> None:
+        record = StageRecord(version=1, inputs={"name": "a", "mood": "b"})
+        assert record.changes(None) == "no previous build"
+        assert record.changes(record) is None
+        assert record.changes(StageRecord(version=1, inputs={"name": "a", "mood": "x"})) == (
+            "changed: mood"
+        )
+        assert record.changes(StageRecord(version=0, inputs=record.inputs)) == (
+            "generator version changed (0 -> 1)"
+        )
+
+    def test_records_survive_round_trip(
+        self, complete: PackageSnapshot, tmp_output: Path
+    ) -> None:
+        record = StageRecord(version=1, inputs={"name": "a"})
+        save_snapshot(complete.with_record("palette", record), tmp_output)
+        loaded = load_snapshot(tmp_output)
+        assert loaded is not None and loaded.stages == {"palette": record}
+        assert loaded.with_record("palette", None).stages == {}
+
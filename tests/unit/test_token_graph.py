@@ -0,0 +1,141 @@
+"""Tests for the token reference graph."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from thenine.core.brand import BrandPalette, BrandTokens, BrandTypography
+from thenine.core.exporters import export_formats, iter_tokens
+from thenine.core.token_graph import (
+    TokenCycleError,
+    TokenGraph,
+    TokenReferenceError,
+    parse_reference,
+    reference,
+    resolve_tokens,
+)
+from thenine.core.tokens import create_tokens
+
+SEMANTIC = {
+    "colors.button-bg": "colors.primary",
+    "colors.button-hover": "colors.button-bg",
+    "colors.link": "colors.accent",
+    "radii.button": "radii.md",
+}
+
+
+class TestReferences:
+    def test_round_trip(self) -> None:
+        assert reference("colors.primary") == "{colors.primary}"
+        assert parse_reference("{colors.primary}") == "colors.primary"
+
+    def test_plain_values_are_not_references(self) -> None:
+        assert parse_reference("#1a56db") is None
+        assert parse_reference("oklch(0.5 0.1 200)") is None
+        assert parse_reference("{colors.primary} extra") is None
+
+
+class TestTokenGraph:
+    def test_resolves_chain(self) -> None:
+        graph = TokenGraph({"a.base": "#000000", "a.mid": "{a.base}", "a.top": "{a.mid}"})
+        assert graph.resolve("a.top") == "#000000"
+        assert graph.resolve_all() == {"a.base": "#000000", "a.mid": "#000000", "a.top": "#000000"}
+
+    def test_topological_order(self) -> None:
+        graph = TokenGraph({"a.top": "{a.mid}", "a.mid": "{a.base}", "a.base": "1rem"})
+        order = graph.order()
+        assert order.index("a.base") < order.index("a.mid") < order.index("a.top")
+
+    def test_cycle_detected(self) -> None:
+        graph = TokenGraph({"a.x": "{a.y}", "a.y": "{a.z}", "a.z": "{a.x}", "a.w": "{a.x}"})
+        with pytest.raises(TokenCycleError) as exc:
+            graph.resolve_all()
+        assert exc.value.cycle[0] == exc.value.cycle[-1]
+        assert set(exc.value.cycle) == {"a.x", "a.y", "a.z"}
+        with pytest.raises(TokenCycleError):
+            graph.resolve("a.w")
+
+    def test_self_reference_is_cycle(self) -> None:
+        with pytest.raises(TokenCycleError):
+            TokenGraph({"a.x": "{a.x}"}).resolve("a.x")
+
+    def test_unknown_reference(self) -> None:
+        graph = TokenGraph({"a.x": "{a.missing}"})
+        with pytest.raises(TokenReferenceError, match=r"a\.missing"):
+            graph.resolve_all()
+        with pytest.raises(TokenReferenceError, match=r"a\.missing"):
+            graph.resolve("a.x")
+
+    def test_incremental_update_invalidates_dependents_only(self) -> None:
+        graph = TokenGraph(
+            {"c.primary": "#111111", "c.btn": "{c.primary}", "c.hover": "{c.btn}", "c.other": "#222222"}
+        )
+        graph.resolve_all()
+
+        invalidated = graph.set("c.primary", "#333333")
+        assert invalidated == {"c.primary", "c.btn", "c.hover"}
+        assert graph.resolve("c.hover") == "#333333"
+        assert graph.resolve("c.other") == "#222222"
+
+    def test_repointing_alias(self) -> None:
+        graph = TokenGraph({"c.a": "#111111", "c.b": "#222222", "c.x": "{c.a}"})
+        assert graph.resolve("c.x") == "#111111"
+        graph.set("c.x", "{c.b}")
+        assert graph.resolve("c.x") == "#222222"
+        # c.x no longer depends on c.a
+        assert graph.set("c.a", "#999999") == {"c.a"}
+        assert graph.resolve("c.x") == "#222222"
+
+    def test_long_chain_does_not_recurse(self) -> None:
+        values = {"a.t0": "1rem"} | {f"a.t{i}": f"{{a.t{i - 1}}}" for i in range(1, 5000)}
+        graph = TokenGraph(values)
+        assert graph.resolve("a.t4999") == "1rem"
+        assert len(graph.resolve_all()) == 5000
+
+
+class TestBrandTokenAliases:
+    def test_create_tokens_with_aliases(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography
+    ) -> None:
+        tokens = create_tokens(sample_palette, sample_typography, aliases=SEMANTIC)
+        assert tokens.colors["button-bg"] == "{colors.primary}"
+
+        resolved = resolve_tokens(tokens)
+        assert resolved.colors["button-hover"] == sample_palette.primary.hex
+        assert resolved.radii["button"] == tokens.radii["md"]
+
+    def test_create_tokens_rejects_cycles(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography
+    ) -> None:
+        with pytest.raises(TokenCycleError):
+            create_tokens(
+                sample_palette,
+                sample_typography,
+                aliases={"colors.a": "colors.b", "colors.b": "colors.a"},
+            )
+
+    def test_resolve_without_aliases_is_identity(self) -> None:
+        tokens = BrandTokens(colors={"primary": "#000000"}, fonts={})
+        assert resolve_tokens(tokens) is tokens
+
+    def test_iter_tokens_reports_refs(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography
+    ) -> None:
+        tokens = create_tokens(sample_palette, sample_typography, aliases=SEMANTIC)
+        entries = {(e.group, e.key): e for e in iter_tokens(tokens)}
+        assert entries[("colors", "button-hover")].value == sample_palette.primary.hex
+        assert entries[("colors", "button-hover")].ref == "colors.button-bg"
+        assert entries[("colors", "primary")].ref is None
+
+    def test_exporters_emit_resolved_values(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography, tmp_output: Path
+    ) -> None:
+        tokens = create_tokens(sample_palette, sample_typography, aliases=SEMANTIC)
+        paths = export_formats(tokens, tmp_output, ["css", "tailwind", "scss", "android"])
+        for path in paths.values():
+            assert "{colors." not in path.read_text()
+        css = paths["css"].read_text()
+        assert f"--color-button-bg: {sample_palette.primary.hex};" in css
+        assert f"--color-link: {sample_palette.accent.hex};" in css
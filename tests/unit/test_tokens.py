@@ -3,10 +3,20 @@
 from __future__ import annotations
 
 import json
+import stat
+import sys
 from pathlib import Path
 
+import pytest
+
 from thenine.core.brand import BrandPalette, BrandTypography
+from thenine.core.bundle import TokenBundle
+from thenine.core.manifest import MANIFEST_NAME
+from thenine.core.palette import check_contrast
 from thenine.core.tokens import (
+    BUNDLE_FORMAT,
+    TONAL_STEPS,
+    build_tonal_scale,
     create_tokens,
     export_all,
     export_css,
@@ -119,3 +129,119 @@ class TestExportAll:
         assert "tailwind" in paths
         for p in paths.values():
             assert p.exists()
+
+
+class TestIncrementalExport:
+    def test_second_export_skips_unchanged(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography, tmp_output: Path
+    ) -> None:
+        tokens = create_tokens(sample_palette, sample_typography)
+        first = export_all(tokens, tmp_output)
+        assert first.skipped == []
+
+        mtimes = {fmt: p.stat().st_mtime_ns for fmt, p in first.items()}
+        second = export_all(tokens, tmp_output)
+        assert sorted(second.skipped) == ["css", "json", "tailwind"]
+        assert {fmt: p.stat().st_mtime_ns for fmt, p in second.items()} == mtimes
+
+    def test_changed_token_rewrites_affected_files(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography, tmp_output: Path
+    ) -> None:
+        tokens = create_tokens(sample_palette, sample_typography)
+        export_all(tokens, tmp_output)
+
+        changed = tokens.model_copy(update={"spacing": {**tokens.spacing, "md": "1.25rem"}})
+        result = export_all(changed, tmp_output)
+        # Tailwind theme carries no spacing, so it stays untouched
+        assert result.skipped == ["tailwind"]
+        assert "1.25rem" in result["css"].read_text()
+
+    def test_deleted_file_is_restored(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography, tmp_output: Path
+    ) -> None:
+        tokens = create_tokens(sample_palette, sample_typography)
+        paths = export_all(tokens, tmp_output)
+        paths["css"].unlink()
+
+        result = export_all(tokens, tmp_output)
+        assert "css" not in result.skipped
+        assert result["css"].exists()
+
+    def test_hand_edited_file_is_overwritten(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography, tmp_output: Path
+    ) -> None:
+        tokens = create_tokens(sample_palette, sample_typography)
+        paths = export_all(tokens, tmp_output)
+        original = paths["json"].read_text()
+        paths["json"].write_text("{}")
+
+        result = export_all(tokens, tmp_output)
+        assert "json" not in result.skipped
+        assert paths["json"].read_text() == original
+
+    def test_manifest_written(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography, tmp_output: Path
+    ) -> None:
+        tokens = create_tokens(sample_palette, sample_typography)
+        export_all(tokens, tmp_output)
+        manifest = json.loads((tmp_output / MANIFEST_NAME).read_text())
+        assert set(manifest["files"]) == {"tokens.json", "tokens.css", "tailwind-theme.css"}
+        assert not list(tmp_output.glob("*.tmp"))
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permission bits")
+    def test_exports_get_default_permissions(
+        self,
+        sample_palette: BrandPalette,
+        sample_typography: BrandTypography,
+        tmp_output: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr("thenine.core.manifest._UMASK", 0o022)
+        tokens = create_tokens(sample_palette, sample_typography)
+        paths = export_all(tokens, tmp_output)
+        assert {stat.S_IMODE(p.stat().st_mode) for p in paths.values()} == {0o644}
+
+        paths["css"].chmod(0o640)
+        changed = tokens.model_copy(update={"spacing": {**tokens.spacing, "md": "1.25rem"}})
+        export_all(changed, tmp_output)
+        assert stat.S_IMODE(paths["css"].stat().st_mode) == 0o640
+
+
+    def test_bundle_format(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography, tmp_output: Path
+    ) -> None:
+        tokens = create_tokens(sample_palette, sample_typography)
+        formats = ["css", BUNDLE_FORMAT]
+        with pytest.raises(ValueError, match="slug"):
+            export_all(tokens, tmp_output, formats)
+
+        first = export_all(tokens, tmp_output, formats, slug="acme")
+        assert first.skipped == []
+        with TokenBundle(first[BUNDLE_FORMAT]) as bundle:
+            assert bundle.get("acme", "colors.primary") == tokens.colors["primary"]
+
+        second = export_all(tokens, tmp_output, formats, slug="acme")
+        assert sorted(second.skipped) == [BUNDLE_FORMAT, "css"]
+        manifest = json.loads((tmp_output / MANIFEST_NAME).read_text())
+        assert set(manifest["files"]) == {"tokens.css", "tokens.bundle"}
+
+
+class TestTonalScales:
+    def test_disabled_by_default(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography
+    ) -> None:
+        tokens = create_tokens(sample_palette, sample_typography)
+        assert "primary-500" not in tokens.colors
+
+    def test_scale_steps(
+        self, sample_palette: BrandPalette, sample_typography: BrandTypography
+    ) -> None:
+        tokens = create_tokens(sample_palette, sample_typography, tonal_scales=True)
+        for role in ["primary", "secondary", "accent"]:
+            for step in TONAL_STEPS:
+                assert f"{role}-{step}" in tokens.colors
+
+    def test_scale_gets_darker(self, sample_palette: BrandPalette) -> None:
+        scale = build_tonal_scale("primary", sample_palette.primary)
+        lightness = [check_contrast(scale[f"primary-{s}"], "#000000") for s in TONAL_STEPS]
+        assert lightness == sorted(lightness, reverse=True)
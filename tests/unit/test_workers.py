@@ -0,0 +1,111 @@
+"""Tests for the recycling worker process pool."""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Iterator
+
+import pytest
+
+from thenine.core.workers import WorkerCrashedError, WorkerPool, env_int
+
+_warmed = False
+
+
+def _warm() -> None:
+    global _warmed
+    _warmed = True
+
+
+def _is_warm() -> bool:
+    return _warmed
+
+
+def _fail(message: str) -> None:
+    raise ValueError(message)
+
+
+_held = threading.Lock()
+
+
+def _take_held_lock() -> None:
+    if not _held.acquire(timeout=5):
+        raise RuntimeError("Worker inherited a held lock")
+
+
+def _hang() -> None:
+    time.sleep(30)
+
+
+@pytest.fixture
+def pool() -> Iterator[WorkerPool]:
+    with WorkerPool(1, initializer=_warm, max_jobs=0, max_rss_mb=0) as p:
+        yield p
+
+
+def test_runs_jobs_in_warm_workers(pool: WorkerPool) -> None:
+    assert pool.wait_warm(30)
+    assert pool.submit(_is_warm).result() is True
+    assert pool.submit(os.getpid).result() != os.getpid()
+    assert pool.submit(divmod, 7, 2).result() == (3, 1)
+
+
+def test_job_errors_are_raised_and_worker_survives(pool: WorkerPool) -> None:
+    pid = pool.submit(os.getpid).result()
+    with pytest.raises(ValueError, match="broken"):
+        pool.submit(_fail, "broken").result()
+    with pytest.raises(Exception, match="pickle"):
+        pool.submit(lambda: 1).result()
+    assert pool.submit(os.getpid).result() == pid
+
+
+def test_crashed_worker_is_replaced(pool: WorkerPool) -> None:
+    with pytest.raises(WorkerCrashedError, match="code 3"):
+        pool.submit(os._exit, 3).result()
+    assert pool.submit(_is_warm).result() is True
+    assert pool.stats()["crashed"] == 1
+
+
+def test_workers_do_not_inherit_held_locks() -> None:
+    # A forked worker would get a copy of _held that nobody will ever release
+    with _held, WorkerPool(1, initializer=_take_held_lock, max_jobs=0, max_rss_mb=0) as pool:
+        assert pool.submit(os.getpid).result(timeout=30) != os.getpid()
+
+
+def test_worker_that_never_starts_counts_as_crashed() -> None:
+    with WorkerPool(1, initializer=_hang, start_timeout=0.5) as pool:
+        with pytest.raises(WorkerCrashedError, match="did not start"):
+            pool.submit(os.getpid).result(timeout=30)
+        assert pool.stats()["crashed"] >= 1
+
+
+def test_recycles_after_max_jobs() -> None:
+    with WorkerPool(1, max_jobs=2, max_rss_mb=0) as pool:
+        pids = [pool.submit(os.getpid).result() for _ in range(4)]
+        assert pids[0] == pids[1] != pids[2] == pids[3]
+    assert pool.stats()["recycled"] == 2
+
+
+def test_recycles_over_rss_limit() -> None:
+    with WorkerPool(1, max_jobs=0, max_rss_mb=1) as pool:
+        pids = {pool.submit(os.getpid).result() for _ in range(3)}
+    assert len(pids) == 3
+
+
+def test_shutdown(pool: WorkerPool) -> None:
+    pool.shutdown()
+    with pytest.raises(RuntimeError, match="shutdown"):
+        pool.submit(os.getpid)
+
+
+def test_env_int_falls_back_on_bad_values(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("THENINE_TEST_INT", "3")
+    assert env_int("THENINE_TEST_INT", 2) == 3
+    monkeypatch.setenv("THENINE_TEST_INT", " ")
+    assert env_int("THENINE_TEST_INT", 2) == 2
+    for bad in ("two", "-1"):
+        monkeypatch.setenv("THENINE_TEST_INT", bad)
+        with pytest.warns(RuntimeWarning, match="THENINE_TEST_INT"):
+            assert env_int("THENINE_TEST_INT", 2) == 2